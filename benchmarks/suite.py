@@ -0,0 +1,264 @@
+"""
+Seeded micro and macro benchmarks of the hot paths, compared against a stored baseline.
+
+    PYTHONPATH=src python benchmarks/suite.py [--deck PATH] [--output results.json]
+                                              [--baseline benchmarks/baseline.json] [--tolerance 0.25]
+                                              [--update-baseline] [--only NAME ...]
+
+Results are printed as a table and written as JSON. With a baseline, every
+benchmark that got worse by more than `tolerance` is listed and the exit
+status is 1. Timings take the best of several repeats to damp noise, but
+are only comparable between runs on the same machine.
+"""
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import sys
+import time
+import timeit
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from ygogym.core.database import CardDatabase
+from ygogym.core.entities.card import Card
+from ygogym.core.entities.deck import Deck
+from ygogym.core.game import Game
+from ygogym.env import YGOEnv
+from ygogym.observation import ObservationEncoder, card_feature_table
+
+DECK_PATH = "data/test_deck.txt"
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED = 0
+REPEATS = 5
+
+BENCHMARKS: Dict[str, Callable[[str], dict]] = {}
+
+
+def benchmark(func: Callable[[str], dict]) -> Callable[[str], dict]:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def per_call(func: Callable[[], object], number: int) -> dict:
+    """Best-of-REPEATS time of one call, in microseconds; lower is better."""
+    seconds = min(timeit.repeat(func, number=number, repeat=REPEATS)) / number
+    return {"value": seconds * 1e6, "unit": "us", "higher_is_better": False}
+
+
+def mid_game_states(deck_path: str, count: int, steps: int = 60) -> list:
+    """Games reached by seeded random legal play, with the env's listeners detached."""
+    rng = np.random.default_rng(SEED)
+    games = []
+    seed = SEED
+    while len(games) < count:
+        env = YGOEnv(deck_path, deck_path)
+        env.reset(seed=seed)
+        seed += 1
+        for _ in range(steps):
+            _, _, terminated, truncated, _ = env.step(int(rng.choice(np.flatnonzero(env.action_mask()))))
+            if terminated or truncated:
+                break
+        else:
+            env.encoder.attach(None)
+            env.action_generator.attach(None)
+            games.append(env.game)
+    return games
+
+
+@benchmark
+def database_load(deck_path: str) -> dict:
+    def load():
+        # The feature table cache keeps every database it was built for alive; drop it too so each load starts cold.
+        card_feature_table.cache_clear()
+        CardDatabase.clear()
+        CardDatabase.get()
+    result = per_call(load, 1)
+    CardDatabase.get()
+    return result
+
+
+@benchmark
+def card_from_id(deck_path: str) -> dict:
+    card_id = Deck.from_deck_list(deck_path).cards[0].id
+    return per_call(lambda: Card.from_id(card_id), 10000)
+
+
+@benchmark
+def deck_from_deck_list(deck_path: str) -> dict:
+    return per_call(lambda: Deck.from_deck_list(deck_path), 200)
+
+
+@benchmark
+def start_game(deck_path: str) -> dict:
+    # One deck per player, as YGOEnv builds them; a shared Deck would deal both hands from one pile.
+    agent_deck, opponent_deck = Deck.from_deck_list(deck_path), Deck.from_deck_list(deck_path)
+    def start():
+        # Every start deals from the top, so refill both decks first or they run out after a few calls.
+        agent_deck.reset()
+        opponent_deck.reset()
+        Game(agent_deck, opponent_deck, rng=np.random.default_rng(SEED)).start_game()
+    return per_call(start, 200)
+
+
+@benchmark
+def env_reset(deck_path: str) -> dict:
+    env = YGOEnv(deck_path, deck_path)
+    env.reset(seed=SEED)
+    return per_call(lambda: env.reset(), 500)
+
+
+@benchmark
+def random_play_steps(deck_path: str, steps: int = 20000) -> dict:
+    env = YGOEnv(deck_path, deck_path)
+    best = 0.0
+    for repeat in range(REPEATS):
+        rng = np.random.default_rng(SEED + repeat)
+        env.reset(seed=SEED + repeat)
+        started = time.perf_counter()
+        for _ in range(steps):
+            _, _, terminated, truncated, _ = env.step(int(rng.choice(np.flatnonzero(env.action_mask()))))
+            if terminated or truncated:
+                env.reset()
+        best = max(best, steps / (time.perf_counter() - started))
+    return {"value": best, "unit": "steps/s", "higher_is_better": True}
+
+
+@benchmark
+def encode_full(deck_path: str) -> dict:
+    games = mid_game_states(deck_path, 20)
+    # An encoder not attached to the games encodes every observation from scratch.
+    encoder = ObservationEncoder()
+    return _per_game(lambda: [encoder.encode(game) for game in games], len(games), 50)
+
+
+@benchmark
+def clone(deck_path: str) -> dict:
+    games = mid_game_states(deck_path, 20)
+    return _per_game(lambda: [game.clone() for game in games], len(games), 50)
+
+
+@benchmark
+def snapshot_restore(deck_path: str) -> dict:
+    games = mid_game_states(deck_path, 20)
+    pairs = [(game, game.snapshot()) for game in games]
+    return _per_game(lambda: [game.restore(snapshot) for game, snapshot in pairs], len(games), 50)
+
+
+@benchmark
+def to_bytes(deck_path: str) -> dict:
+    games = mid_game_states(deck_path, 20)
+    return _per_game(lambda: [game.to_bytes() for game in games], len(games), 50)
+
+
+@benchmark
+def rss_per_game(deck_path: str, games: int = 200) -> dict:
+    # Measured in a fresh process so earlier benchmarks do not inflate the peak.
+    with mp.get_context("spawn").Pool(1) as pool:
+        kib = pool.apply(_rss_per_game, (deck_path, games))
+    return {"value": kib, "unit": "KiB", "higher_is_better": False}
+
+
+def _per_game(func: Callable[[], object], games: int, number: int) -> dict:
+    result = per_call(func, number)
+    result["value"] /= games
+    return result
+
+
+def _rss_kib() -> float:
+    # Current RSS where /proc is available; elsewhere the peak, which loading the card database may dominate.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and KiB elsewhere.
+        return peak / 1024 if sys.platform == "darwin" else peak
+
+
+def _rss_per_game(deck_path: str, games: int) -> float:
+    envs = [YGOEnv(deck_path, deck_path)]
+    envs[0].reset(seed=SEED)
+    gc.collect()
+    before = _rss_kib()
+    for i in range(games):
+        env = YGOEnv(deck_path, deck_path)
+        env.reset(seed=SEED + i)
+        envs.append(env)
+    gc.collect()
+    return (_rss_kib() - before) / games
+
+
+def run(deck_path: str = DECK_PATH, only: Optional[Sequence[str]] = None) -> Dict[str, dict]:
+    CardDatabase.get()
+    results = {}
+    for name, func in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        results[name] = func(deck_path)
+        result = results[name]
+        print(f"{name:<22} {result['value']:12.2f} {result['unit']}", flush=True)
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> list:
+    """Names of benchmarks more than `tolerance` (a fraction) worse than the baseline."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["value"], result["value"]
+        change = (new - old) / old if old else 0.0
+        worse = -change if result["higher_is_better"] else change
+        marker = "REGRESSION" if worse > tolerance else ""
+        print(f"{name:<22} {old:12.2f} -> {new:12.2f} {result['unit']:<8} {change:+7.1%} {marker}")
+        if worse > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--deck", default=DECK_PATH)
+    parser.add_argument("--output", default=None, help="write the results as JSON to this path")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--only", nargs="*", default=None, choices=sorted(BENCHMARKS))
+    args = parser.parse_args(argv)
+
+    results = run(args.deck, args.only)
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "deck": args.deck,
+        "seed": SEED,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    print()
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
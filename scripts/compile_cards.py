@@ -0,0 +1,11 @@
+import sys
+
+from ygogym.core.card_store import CARD_STORE_PATH
+from ygogym.core.database import CARD_DATABASE_PATH, compile_card_store
+
+def compile_cards(source_path: str = CARD_DATABASE_PATH, store_path: str = CARD_STORE_PATH):
+    card_count = compile_card_store(source_path, store_path)
+    print(f"Compiled {card_count} cards from {source_path} into {store_path}")
+
+if __name__ == "__main__":
+    compile_cards(*sys.argv[1:3])
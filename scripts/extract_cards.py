@@ -0,0 +1,15 @@
+import sys
+
+from ygogym.core.card_source import CARD_INFOS_PATH
+from ygogym.core.card_store import CARD_STORE_PATH
+from ygogym.core.database import extract_card_tables
+
+def extract_cards(source_path: str = CARD_INFOS_PATH, locales: str = "en", store_path: str = CARD_STORE_PATH):
+    counts, skipped = extract_card_tables(source_path, locales.split(","), store_path)
+    for locale, count in counts.items():
+        print(f"Extracted {count} {locale} cards from {source_path}")
+        if skipped[locale]:
+            print(f"Skipped {len(skipped[locale])} {locale} cards that do not normalize: {', '.join(skipped[locale])}")
+
+if __name__ == "__main__":
+    extract_cards(*sys.argv[1:4])
@@ -1,68 +1,259 @@
+import argparse
 import json
-import requests
+import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 
+import requests
 from tqdm import tqdm
 
 YGORESOURCES_API_URL = "https://db.ygoresources.com/data/"
+CARD_IDS_PATH = "data/card_ids.txt"
+CARD_INFOS_PATH = "data/card_infos.json"
+CACHE_DIR = "data/cache/cards"
+
+# Statuses worth retrying: rate limited or a server-side failure.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, in bursts of up to `capacity`, across threads."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CardCache:
+    """
+    One JSON file per card id holding the card and the ETag and Last-Modified it was served with.
+
+    Files are replaced atomically, so the cache doubles as the checkpoint of
+    an interrupted scrape.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, card_id: str) -> str:
+        return os.path.join(self.directory, f"{card_id}.json")
+
+    def get(self, card_id: str) -> Optional[dict]:
+        try:
+            with open(self._path(card_id)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, card_id: str, data, etag: Optional[str], last_modified: Optional[str]) -> dict:
+        entry = {"etag": etag, "last_modified": last_modified, "fetched_at": time.time(), "data": data}
+        path = self._path(card_id)
+        partial = f"{path}.{threading.get_ident()}.partial"
+        with open(partial, "w") as f:
+            json.dump(entry, f)
+        os.replace(partial, path)
+        return entry
+
+
+class CardFetcher:
+    """Fetches cards by id with conditional requests, a shared rate limit and retries with exponential backoff."""
+
+    def __init__(
+        self,
+        base_url: str = YGORESOURCES_API_URL,
+        cache: Optional[CardCache] = None,
+        rate: float = 5.0,
+        retries: int = 5,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+    ):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.cache = cache if cache is not None else CardCache()
+        self.bucket = TokenBucket(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        # requests.Session is not thread-safe, so each worker thread keeps its own.
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def fetch(self, card_id: str, revalidate: bool = False) -> dict:
+        """
+        The cache entry of `card_id`, fetching the card if it is not cached.
+
+        With `revalidate`, a cached card is requested again with its ETag and
+        Last-Modified date, and only downloaded if it changed.
+        """
+        cached = self.cache.get(card_id)
+        if cached is not None and not revalidate:
+            return cached
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        url = f"{self.base_url}card/{card_id}"
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self._session().get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self._delay(attempt))
+                continue
+            if response.status_code == 304 and cached is not None:
+                return cached
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                time.sleep(self._delay(attempt, response.headers.get("Retry-After")))
+                continue
+            response.raise_for_status()
+            return self.cache.put(card_id, response.json(), response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        # Exponential backoff with jitter, so threads that failed together do not retry together.
+        return self.backoff * 2 ** attempt * (0.5 + random.random())
+
 
-def scrape_card_ids():
-    url = f"{YGORESOURCES_API_URL}idx/card/name/en"
+def read_card_ids(path: str = CARD_IDS_PATH) -> List[str]:
+    with open(path, "r") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def write_card_infos(card_ids: List[str], cache: CardCache, output_path: str = CARD_INFOS_PATH) -> int:
+    """Write every cached card among `card_ids`, in their order, replacing `output_path` atomically."""
+    card_infos = []
+    for card_id in card_ids:
+        entry = cache.get(card_id)
+        if entry is not None:
+            card_infos.append(entry["data"])
+    partial = f"{output_path}.partial"
+    with open(partial, "w") as f:
+        json.dump(card_infos, f, indent=2)
+    os.replace(partial, output_path)
+    return len(card_infos)
+
+
+def scrape_card_ids(base_url: str = YGORESOURCES_API_URL, names_path: str = "data/card_names.txt", ids_path: str = CARD_IDS_PATH):
+    url = f"{base_url.rstrip('/')}/idx/card/name/en"
     try:
-        response = requests.get(url)
+        response = requests.get(url, timeout=30)
         response.raise_for_status()
         card_name_to_id = response.json()
-        
+
         try:
-            with open("data/card_names.txt", "r") as f:
+            with open(names_path, "r") as f:
                 card_names = [line.strip() for line in f if line.strip()]
         except FileNotFoundError:
-            print("Error: data/card_names.txt not found")
+            print(f"Error: {names_path} not found")
             return
-        
+
         results = []
         for name in card_names:
             if name in card_name_to_id:
                 card_id = card_name_to_id[name]
                 results.append(card_id[0])
-        
-        with open("data/card_ids.txt", "w") as f:
+
+        with open(ids_path, "w") as f:
             for card_id in results:
                 f.write(f"{card_id}\n")
-        
+
         print(f"Found {len(results)} card IDs out of {len(card_names)} card names")
-        
+
     except requests.RequestException as e:
         print(f"Error fetching data from API: {e}")
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON response: {e}")
 
-def scrape_card_infos():
+def scrape_card_infos(
+    base_url: str = YGORESOURCES_API_URL,
+    ids_path: str = CARD_IDS_PATH,
+    output_path: str = CARD_INFOS_PATH,
+    cache_dir: str = CACHE_DIR,
+    workers: int = 8,
+    rate: float = 5.0,
+    revalidate: bool = False,
+    checkpoint_every: int = 500,
+) -> Dict[str, str]:
+    """
+    Fetch every card in `ids_path` into `output_path`, `workers` at a time and at most `rate` requests per second.
+
+    Cards already in the cache are not requested again unless `revalidate`
+    is set, in which case only changed cards are downloaded. The output is
+    rewritten from the cache every `checkpoint_every` cards and at the end,
+    so an interrupted run loses nothing and a re-run resumes where it
+    stopped. Returns the error of every card that could not be fetched.
+    """
     try:
-        with open("data/card_ids.txt", "r") as f:
-            card_ids = [line.strip() for line in f if line.strip()]
+        card_ids = read_card_ids(ids_path)
     except FileNotFoundError:
-        print("Error: data/card_ids.txt not found")
-        return
-    
-    card_infos = []
-    total_cards = len(card_ids)
-    
-    for card_id in tqdm(card_ids, total=total_cards):
-        url = f"{YGORESOURCES_API_URL}card/{card_id}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            card_info = response.json()
-            card_infos.append(card_info)
-        except requests.RequestException as e:
-            print(f"Error fetching data for card ID {card_id}: {e}")
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON for card ID {card_id}: {e}")
-        
-        time.sleep(1)
-    
-    with open("data/card_infos.json", "w") as f:
-        json.dump(card_infos, f, indent=2)
-    
-    print(f"Successfully fetched {len(card_infos)} out of {total_cards} cards")
\ No newline at end of file
+        print(f"Error: {ids_path} not found")
+        return {}
+
+    cache = CardCache(cache_dir)
+    fetcher = CardFetcher(base_url, cache, rate=rate)
+    errors = {}
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetcher.fetch, card_id, revalidate): card_id for card_id in card_ids}
+        for future in tqdm(as_completed(futures), total=len(futures)):
+            card_id = futures[future]
+            try:
+                future.result()
+            except (requests.RequestException, json.JSONDecodeError) as e:
+                errors[card_id] = str(e)
+                print(f"Error fetching data for card ID {card_id}: {e}")
+            done += 1
+            if done % checkpoint_every == 0:
+                write_card_infos(card_ids, cache, output_path)
+
+    fetched = write_card_infos(card_ids, cache, output_path)
+    print(f"Successfully fetched {fetched} out of {len(card_ids)} cards")
+    return errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch card data from the YGOResources database.")
+    parser.add_argument("command", choices=["ids", "infos"], nargs="?", default="infos")
+    parser.add_argument("--base-url", default=os.environ.get("YGORESOURCES_API_URL", YGORESOURCES_API_URL))
+    parser.add_argument("--ids", default=CARD_IDS_PATH)
+    parser.add_argument("--output", default=CARD_INFOS_PATH)
+    parser.add_argument("--cache", default=CACHE_DIR)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=5.0, help="requests per second")
+    parser.add_argument("--revalidate", action="store_true", help="re-request cached cards and download the ones that changed")
+    args = parser.parse_args()
+    if args.command == "ids":
+        scrape_card_ids(args.base_url, ids_path=args.ids)
+    else:
+        scrape_card_infos(args.base_url, args.ids, args.output, args.cache, args.workers, args.rate, args.revalidate)
@@ -0,0 +1,231 @@
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+from gym import spaces
+
+from ygogym.env import YGOEnv
+from ygogym.vector_env import YGOVectorEnv
+
+# Batch arrays that live in shared memory; workers write all but "actions", which the learner writes.
+SHARED_ARRAYS = ["observations", "action_masks", "rewards", "terminated", "truncated", "actions"]
+
+
+def _attach(name: str, shape: tuple, dtype) -> Tuple[SharedMemory, np.ndarray]:
+    # Workers share the parent's resource tracker, and only the parent unlinks the block.
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker(
+    conn, agent_deck_path: str, opponent_deck_path: str, start: int, stop: int, layout: Dict[str, tuple], fast_forward: bool
+) -> None:
+    blocks = []
+    try:
+        arrays = {}
+        for key, (name, shape, dtype) in layout.items():
+            shm, array = _attach(name, shape, dtype)
+            blocks.append(shm)
+            arrays[key] = array[start:stop]
+
+        vector_env = YGOVectorEnv(agent_deck_path, opponent_deck_path, stop - start, fast_forward)
+        vector_env.bind_buffers(
+            arrays["observations"], arrays["action_masks"], arrays["rewards"], arrays["terminated"], arrays["truncated"]
+        )
+        conn.send(("ready", None))
+
+        while True:
+            command, data = conn.recv()
+            if command == "reset":
+                _, infos = vector_env.reset(seed=None if data is None else data + start)
+                conn.send(("ok", infos))
+            elif command == "step":
+                *_, infos = vector_env.step(arrays["actions"])
+                conn.send(("ok", infos))
+            elif command == "close":
+                vector_env.close()
+                conn.send(("ok", None))
+                break
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        arrays = None
+        for shm in blocks:
+            shm.close()
+        conn.close()
+
+
+class YGOAsyncVectorEnv:
+    """
+    Runs `num_envs` games sharded across `num_workers` subprocesses.
+
+    Each worker steps its shard with a `YGOVectorEnv` whose output arrays are
+    views of `multiprocessing.shared_memory` blocks, so only short commands
+    and per-env info dicts cross the pipes. `step_async` returns immediately,
+    letting the caller run inference while the workers simulate, and
+    `step_wait` blocks until every shard has finished.
+
+    As with `YGOVectorEnv`, returned arrays are reused between calls.
+    """
+
+    def __init__(
+        self,
+        agent_deck_path: str,
+        opponent_deck_path: str,
+        num_envs: int,
+        num_workers: Optional[int] = None,
+        context: Optional[str] = None,
+        fast_forward: bool = False,
+    ):
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+
+        probe = YGOEnv(agent_deck_path, opponent_deck_path)
+        self.single_observation_space = probe.observation_space
+        self.single_action_space = probe.action_space
+        self.observation_space = spaces.Box(
+            low=self.single_observation_space.low[None].repeat(num_envs, axis=0),
+            high=self.single_observation_space.high[None].repeat(num_envs, axis=0),
+            dtype=self.single_observation_space.dtype,
+        )
+        self.action_space = spaces.MultiDiscrete([self.single_action_space.n] * num_envs)
+
+        specs = {
+            "observations": (self.observation_space.shape, self.observation_space.dtype),
+            "action_masks": ((num_envs, self.single_action_space.n), np.dtype(bool)),
+            "rewards": ((num_envs,), np.dtype(np.float32)),
+            "terminated": ((num_envs,), np.dtype(bool)),
+            "truncated": ((num_envs,), np.dtype(bool)),
+            "actions": ((num_envs,), np.dtype(np.int64)),
+        }
+        self._blocks: List[SharedMemory] = []
+        layout = {}
+        for key in SHARED_ARRAYS:
+            shape, dtype = specs[key]
+            shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+            self._blocks.append(shm)
+            setattr(self, key, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+            layout[key] = (shm.name, shape, dtype)
+
+        ctx = mp.get_context(context)
+        self._connections = []
+        self._processes = []
+        self._shards = []
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(child_conn, agent_deck_path, opponent_deck_path, int(start), int(stop), layout, fast_forward),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+            self._shards.append((int(start), int(stop)))
+
+        self._waiting = None
+        self.closed = False
+        self._receive_all()
+
+    def _receive_all(self) -> List[Any]:
+        results = []
+        errors = []
+        for conn in self._connections:
+            status, payload = conn.recv()
+            if status == "error":
+                errors.append(payload)
+            results.append(payload)
+        if errors:
+            self.close(terminate=True)
+            raise RuntimeError("YGOAsyncVectorEnv worker failed:\n" + "\n".join(errors))
+        return results
+
+    def _check_ready(self, command: str) -> None:
+        if self.closed:
+            raise RuntimeError("YGOAsyncVectorEnv is closed")
+        if self._waiting is not None:
+            raise RuntimeError(f"Cannot {command} while a {self._waiting} call is pending")
+
+    def _send_all(self, command: str, data: Any = None) -> None:
+        self._check_ready(command)
+        for conn in self._connections:
+            conn.send((command, data))
+        self._waiting = command
+
+    def reset_async(self, seed: Optional[int] = None) -> None:
+        """With a `seed`, env `i` is seeded with `seed + i`, as in `YGOVectorEnv.reset`."""
+        self._send_all("reset", seed)
+
+    def reset_wait(self) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        if self._waiting != "reset":
+            raise RuntimeError("reset_wait called without a pending reset_async")
+        infos = []
+        for shard_infos in self._receive_all():
+            infos.extend(shard_infos)
+        self._waiting = None
+        return self.observations, infos
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        self.reset_async(seed)
+        return self.reset_wait()
+
+    def step_async(self, actions) -> None:
+        # Checked before the shared actions are touched, since workers may still be reading a pending step's.
+        self._check_ready("step")
+        # Written before the command is sent, so workers always see this step's actions.
+        self.actions[:] = actions
+        self._send_all("step")
+
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        if self._waiting != "step":
+            raise RuntimeError("step_wait called without a pending step_async")
+        infos = []
+        for shard_infos in self._receive_all():
+            infos.extend(shard_infos)
+        self._waiting = None
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self, terminate: bool = False) -> None:
+        if self.closed:
+            return
+        self.closed = True
+
+        if not terminate:
+            try:
+                if self._waiting is not None:
+                    for conn in self._connections:
+                        conn.recv()
+                for conn in self._connections:
+                    conn.send(("close", None))
+                for conn in self._connections:
+                    conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                terminate = True
+
+        for process in self._processes:
+            if terminate and process.is_alive():
+                process.terminate()
+            process.join()
+        for conn in self._connections:
+            conn.close()
+
+        for key in SHARED_ARRAYS:
+            setattr(self, key, None)
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close(terminate=True)
@@ -0,0 +1,325 @@
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ygogym.core.battle import attack_outcomes
+from ygogym.core.constants import (
+    Action, Phase, CardType, MonsterType, MonsterPosition, SpellTrapPosition, SpellType,
+    StateRegion, FIELD_SIZE, HAND_SLOTS
+)
+
+SUMMON_POSITIONS = [MonsterPosition.FACE_UP_ATTACK, MonsterPosition.FACE_DOWN_DEFENSE]
+TRIBUTE_COMBOS = [combo for count in (1, 2) for combo in combinations(range(FIELD_SIZE), count)]
+# Attack target index for a direct attack.
+DIRECT_ATTACK = FIELD_SIZE
+MAIN_PHASES = (Phase.MAIN_PHASE_1, Phase.MAIN_PHASE_2)
+
+
+def tributes_required(card) -> int:
+    level = card.level or 0
+    if level <= 4:
+        return 0
+    if level <= 6:
+        return 1
+    return 2
+
+
+def can_be_normal_summoned(card) -> bool:
+    return card.is_monster() and card.monster_type != MonsterType.FUSION
+
+
+def can_attack_with(card) -> bool:
+    return card is not None and card.position == MonsterPosition.FACE_UP_ATTACK and card.can_attack
+
+
+def can_change_position(card) -> bool:
+    return (
+        card is not None
+        and card.position != MonsterPosition.FACE_DOWN_DEFENSE
+        and not card.summoned_this_turn
+        and not card.position_changed_this_turn
+    )
+
+
+def can_flip_summon(card) -> bool:
+    return (
+        card is not None
+        and card.position == MonsterPosition.FACE_DOWN_DEFENSE
+        and not card.summoned_this_turn
+        and not card.position_changed_this_turn
+    )
+
+
+def can_activate_set_trap(card) -> bool:
+    return card is not None and card.is_trap() and card.position == SpellTrapPosition.FACE_DOWN and not card.set_this_turn
+
+
+def can_enter_battle_phase(game) -> bool:
+    return game.turn_count > 1 and game.current_player.can_conduct_battle_phase
+
+
+def _build_action_table() -> Tuple[List[Tuple[Action, Dict[str, Any]]], Dict[str, int]]:
+    """
+    Lay out the flat action space.
+
+    Actions are grouped by the part of the state that decides their legality
+    (hand, monster zones, spell/trap zones, battle, phase) so each group is a
+    contiguous range of the mask that can be recomputed on its own.
+    """
+    table = []
+    offsets = {}
+
+    offsets["hand"] = len(table)
+    offsets["normal_summon"] = len(table)
+    for hand_index in range(HAND_SLOTS):
+        for position in SUMMON_POSITIONS:
+            table.append((Action.NORMAL_SUMMON, {"hand_index": hand_index, "position": position}))
+    offsets["tribute_summon"] = len(table)
+    for hand_index in range(HAND_SLOTS):
+        for tributes in TRIBUTE_COMBOS:
+            for position in SUMMON_POSITIONS:
+                table.append((Action.TRIBUTE_SUMMON, {"hand_index": hand_index, "tributes": tributes, "position": position}))
+    offsets["activate_spell_from_hand"] = len(table)
+    for hand_index in range(HAND_SLOTS):
+        table.append((Action.ACTIVATE_SPELL, {"hand_index": hand_index}))
+    offsets["set_spell"] = len(table)
+    for hand_index in range(HAND_SLOTS):
+        table.append((Action.SET_SPELL, {"hand_index": hand_index}))
+    offsets["set_trap"] = len(table)
+    for hand_index in range(HAND_SLOTS):
+        table.append((Action.SET_TRAP, {"hand_index": hand_index}))
+
+    offsets["monsters"] = len(table)
+    offsets["flip_summon"] = len(table)
+    for zone_index in range(FIELD_SIZE):
+        table.append((Action.FLIP_SUMMON, {"zone_index": zone_index}))
+    offsets["change_position"] = len(table)
+    for zone_index in range(FIELD_SIZE):
+        table.append((Action.CHANGE_MONSTER_POSITION, {"zone_index": zone_index}))
+
+    offsets["spell_traps"] = len(table)
+    offsets["activate_set_spell"] = len(table)
+    for zone_index in range(FIELD_SIZE):
+        table.append((Action.ACTIVATE_SPELL, {"zone_index": zone_index}))
+    offsets["activate_field_spell"] = len(table)
+    table.append((Action.ACTIVATE_SPELL, {"field_spell": True}))
+    offsets["activate_trap"] = len(table)
+    for zone_index in range(FIELD_SIZE):
+        table.append((Action.ACTIVATE_TRAP, {"zone_index": zone_index}))
+
+    offsets["battle"] = len(table)
+    offsets["attack"] = len(table)
+    for zone_index in range(FIELD_SIZE):
+        for target_index in range(FIELD_SIZE + 1):
+            target = None if target_index == DIRECT_ATTACK else target_index
+            table.append((Action.ATTACK, {"zone_index": zone_index, "target_index": target}))
+
+    offsets["phase"] = len(table)
+    offsets["next_phase"] = len(table)
+    table.append((Action.NEXT_PHASE, {}))
+    offsets["end_turn"] = len(table)
+    table.append((Action.END_TURN, {}))
+
+    offsets["end"] = len(table)
+    return table, offsets
+
+
+ACTION_TABLE, ACTION_OFFSETS = _build_action_table()
+NUM_ACTIONS = len(ACTION_TABLE)
+
+# Mask sections, in table order, and the state regions whose changes invalidate them.
+SECTIONS = ["hand", "monsters", "spell_traps", "battle", "phase"]
+SECTION_RANGES = {
+    name: slice(ACTION_OFFSETS[name], ACTION_OFFSETS[SECTIONS[i + 1]] if i + 1 < len(SECTIONS) else ACTION_OFFSETS["end"])
+    for i, name in enumerate(SECTIONS)
+}
+REGION_SECTIONS = {
+    StateRegion.HAND: ("hand",),
+    StateRegion.MONSTER_ZONE: ("hand", "monsters", "battle"),
+    StateRegion.SPELL_TRAP_ZONE: ("hand", "spell_traps"),
+    StateRegion.FIELD_SPELL_ZONE: ("hand", "spell_traps"),
+}
+
+_ACTION_INDEX = {
+    (action, tuple(sorted(params.items(), key=lambda item: item[0]))): index
+    for index, (action, params) in enumerate(ACTION_TABLE)
+}
+
+
+def decode_action(index: int) -> Tuple[Action, Dict[str, Any]]:
+    """Map a flat action index to `(Action, params)`. The params dict is shared and must not be modified."""
+    return ACTION_TABLE[index]
+
+
+def encode_action(action: Action, params: Optional[Dict[str, Any]] = None) -> int:
+    key = (action, tuple(sorted((params or {}).items(), key=lambda item: item[0])))
+    if key not in _ACTION_INDEX:
+        raise ValueError(f"{action} with {params} is not in the action space")
+    return _ACTION_INDEX[key]
+
+
+class LegalActionGenerator:
+    """
+    Builds the legal-action mask for the player to act.
+
+    While attached to a game it listens for state changes and only recomputes
+    the mask sections that depend on the changed regions; a phase or turn
+    change recomputes everything. With `verify` set, every incremental mask is
+    checked against a full recomputation.
+    """
+
+    def __init__(self, out: Optional[np.ndarray] = None, verify: bool = False):
+        self.out = out if out is not None else np.zeros(NUM_ACTIONS, dtype=bool)
+        self.verify = verify
+        self._game = None
+        self._dirty = set(SECTIONS)
+
+    def bind(self, out: np.ndarray) -> None:
+        self.out = out
+        self._dirty = set(SECTIONS)
+
+    def attach(self, game) -> None:
+        if self._game is not None:
+            self._game.remove_state_listener(self._on_state_change)
+        self._game = game
+        if game is not None:
+            game.add_state_listener(self._on_state_change)
+        self._dirty = set(SECTIONS)
+
+    def _on_state_change(self, player, region, index, card, entered) -> None:
+        if region is None or region == StateRegion.PHASE:
+            self._dirty.update(SECTIONS)
+        else:
+            self._dirty.update(REGION_SECTIONS.get(region, ()))
+
+    def mask(self, game=None) -> np.ndarray:
+        if game is None:
+            game = self._game
+        if game is not self._game:
+            self._compute(game, self.out, SECTIONS)
+            return self.out
+
+        if self._dirty:
+            self._compute(game, self.out, self._dirty)
+            self._dirty.clear()
+        if self.verify:
+            expected = np.zeros(NUM_ACTIONS, dtype=bool)
+            self._compute(game, expected, SECTIONS)
+            mismatched = np.flatnonzero(expected != self.out)
+            if len(mismatched):
+                raise AssertionError(f"Incremental action mask differs from a full recompute at {[ACTION_TABLE[i] for i in mismatched]}")
+            if game.current_phase == Phase.BATTLE_PHASE and not game.game_over:
+                attacks = self.out[SECTION_RANGES["battle"]]
+                if not np.array_equal(attack_outcomes([game]).legal.reshape(-1), attacks):
+                    raise AssertionError("Attack mask differs from the batched battle outcomes")
+        return self.out
+
+    def legal_actions(self, game=None) -> np.ndarray:
+        return np.flatnonzero(self.mask(game))
+
+    def has_actions(self, game=None) -> bool:
+        """Whether the player can do anything besides moving to another phase or ending the turn."""
+        return bool(self.mask(game)[:ACTION_OFFSETS["phase"]].any())
+
+    def _compute(self, game, mask: np.ndarray, sections) -> None:
+        for name in sections:
+            mask[SECTION_RANGES[name]] = False
+        if game.game_over or game.current_phase is None:
+            return
+
+        phase = game.current_phase
+        player = game.current_player
+        in_main_phase = phase in MAIN_PHASES
+
+        if in_main_phase:
+            if "hand" in sections:
+                self._compute_hand(player, mask)
+            if "monsters" in sections:
+                self._compute_monsters(player, mask)
+            if "spell_traps" in sections:
+                self._compute_spell_traps(player, mask)
+        elif phase == Phase.BATTLE_PHASE:
+            if "spell_traps" in sections:
+                self._compute_spell_traps(player, mask, traps_only=True)
+            if "battle" in sections:
+                self._compute_attacks(player, game.opponent, mask)
+
+        if "phase" in sections:
+            if phase == Phase.MAIN_PHASE_1 and not game.phases.skips(game, Phase.BATTLE_PHASE):
+                mask[ACTION_OFFSETS["next_phase"]] = True
+            elif phase == Phase.BATTLE_PHASE:
+                mask[ACTION_OFFSETS["next_phase"]] = True
+            if in_main_phase or phase == Phase.BATTLE_PHASE:
+                mask[ACTION_OFFSETS["end_turn"]] = True
+
+    @staticmethod
+    def _compute_hand(player, mask: np.ndarray) -> None:
+        field = player.field
+        monster_count = sum(card is not None for card in field.monster_zones)
+        has_monster_zone = monster_count < FIELD_SIZE
+        has_spell_trap_zone = any(card is None for card in field.spell_trap_zones)
+        occupied = [card is not None for card in field.monster_zones]
+
+        for hand_index, card in enumerate(player.hand[:HAND_SLOTS]):
+            card_type = card.card_type
+            if card_type == CardType.MONSTER:
+                if player.normal_summon_used or not can_be_normal_summoned(card):
+                    continue
+                required = tributes_required(card)
+                if required == 0:
+                    if has_monster_zone:
+                        base = ACTION_OFFSETS["normal_summon"] + hand_index * len(SUMMON_POSITIONS)
+                        mask[base:base + len(SUMMON_POSITIONS)] = True
+                elif monster_count >= required:
+                    base = ACTION_OFFSETS["tribute_summon"] + hand_index * len(TRIBUTE_COMBOS) * len(SUMMON_POSITIONS)
+                    for combo_index, combo in enumerate(TRIBUTE_COMBOS):
+                        if len(combo) == required and all(occupied[zone] for zone in combo):
+                            index = base + combo_index * len(SUMMON_POSITIONS)
+                            mask[index:index + len(SUMMON_POSITIONS)] = True
+            elif card_type == CardType.SPELL:
+                if card.spell_type == SpellType.FIELD:
+                    mask[ACTION_OFFSETS["activate_spell_from_hand"] + hand_index] = True
+                    mask[ACTION_OFFSETS["set_spell"] + hand_index] = True
+                elif has_spell_trap_zone:
+                    mask[ACTION_OFFSETS["activate_spell_from_hand"] + hand_index] = True
+                    mask[ACTION_OFFSETS["set_spell"] + hand_index] = True
+            elif card_type == CardType.TRAP:
+                if has_spell_trap_zone:
+                    mask[ACTION_OFFSETS["set_trap"] + hand_index] = True
+
+    @staticmethod
+    def _compute_monsters(player, mask: np.ndarray) -> None:
+        for zone_index, card in enumerate(player.field.monster_zones):
+            if can_flip_summon(card):
+                mask[ACTION_OFFSETS["flip_summon"] + zone_index] = True
+            elif can_change_position(card):
+                mask[ACTION_OFFSETS["change_position"] + zone_index] = True
+
+    @staticmethod
+    def _compute_spell_traps(player, mask: np.ndarray, traps_only: bool = False) -> None:
+        field = player.field
+        for zone_index, card in enumerate(field.spell_trap_zones):
+            if card is None or card.position != SpellTrapPosition.FACE_DOWN:
+                continue
+            if card.is_spell() and not traps_only:
+                mask[ACTION_OFFSETS["activate_set_spell"] + zone_index] = True
+            elif can_activate_set_trap(card):
+                mask[ACTION_OFFSETS["activate_trap"] + zone_index] = True
+        card = field.field_spell
+        if not traps_only and card is not None and card.position == SpellTrapPosition.FACE_DOWN:
+            mask[ACTION_OFFSETS["activate_field_spell"]] = True
+
+    @staticmethod
+    def _compute_attacks(player, opponent, mask: np.ndarray) -> None:
+        targets = [card is not None for card in opponent.field.monster_zones]
+        direct = not any(targets)
+        for zone_index, card in enumerate(player.field.monster_zones):
+            if not can_attack_with(card):
+                continue
+            base = ACTION_OFFSETS["attack"] + zone_index * (FIELD_SIZE + 1)
+            if direct:
+                mask[base + DIRECT_ATTACK] = True
+            else:
+                for target_index in range(FIELD_SIZE):
+                    mask[base + target_index] = targets[target_index]
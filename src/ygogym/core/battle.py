@@ -0,0 +1,175 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from ygogym.core.constants import CardLocation, FIELD_SIZE, GameEvent, MonsterPosition
+from ygogym.core.events import Event
+
+# Target column of a direct attack in the attacker x target arrays, matching `actions.DIRECT_ATTACK`.
+DIRECT_COLUMN = FIELD_SIZE
+EMPTY_ZONE = (0, 0, False, False, False)
+
+
+# Resolving a single attack
+
+def attack(game, player, attacker, target=None) -> None:
+    """
+    Run one attack of `attacker`, controlled by `player`, on `target` or directly if None.
+
+    The attack is declared and cards may respond to it. If the attacker
+    leaves the field in response the attack ends; if the number of monsters
+    the opponent controls changes, the attack is replayed: it is not carried
+    out and the attacker may declare an attack again. Otherwise damage is
+    calculated, monsters are destroyed and FLIP effects of a flipped target
+    resolve.
+    """
+    opponent = game.players[1] if player is game.players[0] else game.players[0]
+    defenders = _monster_count(opponent)
+    attacker.can_attack = False
+    player.notify_card(attacker)
+    game.events.emit(Event(GameEvent.ATTACK_DECLARED, attacker, player))
+    game.events.process()
+
+    if attacker.location != CardLocation.FIELD or attacker.position != MonsterPosition.FACE_UP_ATTACK:
+        return
+    if _monster_count(opponent) != defenders or (target is not None and target.location != CardLocation.FIELD):
+        _replay(player, attacker)
+        return
+
+    if target is None:
+        opponent.life_points -= attacker.current_attack or 0
+        return
+    damage_step(game, player, opponent, attacker, target)
+
+
+def damage_step(game, player, opponent, attacker, target) -> None:
+    """Flip a face-down target, calculate damage and destroy the losing monsters."""
+    flipped = target.position == MonsterPosition.FACE_DOWN_DEFENSE
+    if flipped:
+        target.set_position(MonsterPosition.FACE_UP_DEFENSE)
+        opponent.notify_card(target)
+
+    attack_points = attacker.current_attack or 0
+    if target.position == MonsterPosition.FACE_UP_ATTACK:
+        target_attack = target.current_attack or 0
+        if attack_points > target_attack:
+            game.destroy(target)
+            opponent.life_points -= attack_points - target_attack
+        elif attack_points < target_attack:
+            game.destroy(attacker)
+            player.life_points -= target_attack - attack_points
+        elif attack_points > 0:
+            game.destroy(target)
+            game.destroy(attacker)
+    else:
+        defense = target.current_defense or 0
+        if attack_points > defense:
+            game.destroy(target)
+        elif attack_points < defense:
+            player.life_points -= defense - attack_points
+
+    # FLIP effects resolve after damage calculation, even if the monster was destroyed.
+    if flipped:
+        game.trigger_effects(target, GameEvent.FLIP)
+
+
+def _monster_count(player) -> int:
+    return sum(card is not None for card in player.field.monster_zones)
+
+
+def _replay(player, attacker) -> None:
+    attacker.can_attack = True
+    player.notify_card(attacker)
+
+
+# Batched outcomes of every possible attack
+
+class BattleOutcomes:
+    """
+    Results of every attacker x target pair, as arrays of shape (..., FIELD_SIZE, FIELD_SIZE + 1).
+
+    Rows are the attacking player's monster zones, columns the opponent's,
+    with the last column for a direct attack. Flattening the last two axes
+    gives the order of the attack section of the action space, and `legal`
+    is that section of the mask during the Battle Phase. Outcomes
+    assume no card responds to the attack, and use the true DEF of face-down
+    monsters.
+    """
+
+    __slots__ = ("legal", "opponent_damage", "player_damage", "attacker_destroyed", "target_destroyed")
+
+    def __init__(self, legal, opponent_damage, player_damage, attacker_destroyed, target_destroyed):
+        self.legal = legal
+        # Battle damage dealt to the defending player and to the attacking player
+        self.opponent_damage = opponent_damage
+        self.player_damage = player_damage
+        self.attacker_destroyed = attacker_destroyed
+        self.target_destroyed = target_destroyed
+
+    def __getitem__(self, index) -> "BattleOutcomes":
+        return BattleOutcomes(*(getattr(self, name)[index] for name in self.__slots__))
+
+
+def monster_arrays(players: Sequence) -> Tuple[np.ndarray, ...]:
+    """ATK, DEF, occupied, in-Attack-Position and ready-to-attack arrays of shape (len(players), FIELD_SIZE)."""
+    rows = []
+    for player in players:
+        for card in player.field.monster_zones:
+            if card is None:
+                rows.append(EMPTY_ZONE)
+            else:
+                in_attack = card.position == MonsterPosition.FACE_UP_ATTACK
+                rows.append((card.current_attack or 0, card.current_defense or 0, True, in_attack, in_attack and card.can_attack))
+    # Built in one go from Python tuples, which is much faster than filling the arrays element by element.
+    table = np.array(rows, dtype=np.int32).reshape(len(players), FIELD_SIZE, 5)
+    return table[..., 0], table[..., 1], table[..., 2].astype(bool), table[..., 3].astype(bool), table[..., 4].astype(bool)
+
+
+def battle_outcomes(attack_points, ready, target_attack, target_defense, target_occupied, target_in_attack) -> BattleOutcomes:
+    """
+    Outcomes of every attack from arrays of shape (..., FIELD_SIZE), without a Python loop over pairs.
+
+    `attack_points` and `ready` describe the attacker's monsters, the `target_`
+    arrays the defender's. Leading axes are broadcast, so a whole batch of
+    game states is evaluated in one call.
+    """
+    attack_points = np.asarray(attack_points, dtype=np.int32)
+    ready = np.asarray(ready, dtype=bool)
+    target_occupied = np.asarray(target_occupied, dtype=bool)
+    target_in_attack = np.asarray(target_in_attack, dtype=bool)
+    shape = np.broadcast_shapes(attack_points.shape, target_occupied.shape)[:-1] + (FIELD_SIZE, FIELD_SIZE + 1)
+
+    attacker = attack_points[..., :, None]
+    in_attack = target_in_attack[..., None, :]
+    versus_attack = attacker - np.asarray(target_attack, dtype=np.int32)[..., None, :]
+    versus_defense = attacker - np.asarray(target_defense, dtype=np.int32)[..., None, :]
+    # Monsters with equal ATK destroy each other unless both have 0 ATK.
+    tie = (versus_attack == 0) & (attacker > 0)
+    legal_target = ready[..., :, None] & target_occupied[..., None, :]
+
+    legal = np.zeros(shape, dtype=bool)
+    opponent_damage = np.zeros(shape, dtype=np.int32)
+    player_damage = np.zeros(shape, dtype=np.int32)
+    attacker_destroyed = np.zeros(shape, dtype=bool)
+    target_destroyed = np.zeros(shape, dtype=bool)
+
+    legal[..., :FIELD_SIZE] = legal_target
+    opponent_damage[..., :FIELD_SIZE] = np.where(legal_target & in_attack, np.maximum(versus_attack, 0), 0)
+    player_damage[..., :FIELD_SIZE] = np.where(
+        legal_target, np.maximum(-np.where(in_attack, versus_attack, versus_defense), 0), 0
+    )
+    attacker_destroyed[..., :FIELD_SIZE] = legal_target & in_attack & ((versus_attack < 0) | tie)
+    target_destroyed[..., :FIELD_SIZE] = legal_target & np.where(in_attack, (versus_attack > 0) | tie, versus_defense > 0)
+
+    # Direct attacks are only possible while the opponent controls no monsters.
+    direct = ready & ~target_occupied.any(axis=-1, keepdims=True)
+    legal[..., DIRECT_COLUMN] = direct
+    opponent_damage[..., DIRECT_COLUMN] = np.where(direct, attack_points, 0)
+    return BattleOutcomes(legal, opponent_damage, player_damage, attacker_destroyed, target_destroyed)
+
+
+def attack_outcomes(games: Sequence) -> BattleOutcomes:
+    """Outcomes of every attack the player to act could declare, for each game, with a leading axis over `games`."""
+    attack_points, _, _, _, ready = monster_arrays([game.current_player for game in games])
+    target_attack, target_defense, target_occupied, target_in_attack, _ = monster_arrays([game.opponent for game in games])
+    return battle_outcomes(attack_points, ready, target_attack, target_defense, target_occupied, target_in_attack)
@@ -0,0 +1,82 @@
+from typing import Dict, Tuple
+
+from ygogym.core.constants import CardType, GameEvent, MonsterPosition, Phase
+from ygogym.core.effects import (
+    Effect, at_least, banish, change_position, damage, destroy, discard_hand_and_redraw, draw, first,
+    gain_life_points, graveyard, monsters, on_activate, on_event, on_flip, on_response, per_card, return_to_hand,
+    spell_traps, strongest, this_card, trigger_card, weakest,
+)
+
+
+def _face_up_defense(card) -> bool:
+    return card.position == MonsterPosition.FACE_UP_DEFENSE
+
+
+_two_own_monsters = at_least(monsters("own"), 2)
+_an_opposing_monster = at_least(monsters("opponent"))
+
+
+def _two_own_and_one_opposing_monster(game, player, card, trigger=None) -> bool:
+    return _two_own_monsters(game, player, card) and _an_opposing_monster(game, player, card)
+
+
+def _face_up(card) -> bool:
+    return card.position not in (None, MonsterPosition.FACE_DOWN_DEFENSE)
+
+
+def _another_monster_summoned(game, player, card, trigger) -> bool:
+    return _face_up(card) and trigger.card is not card
+
+
+def _own_end_phase(game, player, card, trigger) -> bool:
+    return _face_up(card) and game.current_phase == Phase.END_PHASE and game.current_player is player
+
+
+def _opponent_summoned_1000_attack(game, player, card, trigger) -> bool:
+    return trigger.player is not player and (trigger.card.current_attack or 0) >= 1000
+
+
+# Effects of the cards in the card pool, keyed by card ID. Each entry is declared once here and
+# compiled into the shared card templates when the card database loads. Cards without an entry have
+# no effect in the engine yet; continuous modifiers (Equip and Field Spells) are not modelled.
+CARD_EFFECTS: Dict[str, Tuple[Effect, ...]] = {
+    # Burn
+    "4349": (on_activate(damage(200)),),  # Sparks
+    "4350": (on_activate(damage(500)),),  # Hinotama
+    "4351": (on_activate(damage(600)),),  # Final Flame
+    "4352": (on_activate(damage(800)),),  # Ookazi
+    "4865": (on_activate(damage(per_card(monsters("opponent"), 500))),),  # Just Desserts
+    # Recovery
+    "4345": (on_activate(gain_life_points(500)),),  # Red Medicine
+    "4346": (on_activate(gain_life_points(600)),),  # Goblin's Secret Remedy
+    "4348": (on_activate(gain_life_points(1000)),),  # Dian Keto the Cure Master
+    # Draw
+    "4844": (on_activate(draw(2)),),  # Pot of Greed
+    "4821": (on_activate(discard_hand_and_redraw),),  # Card Destruction
+    # Removal
+    "4342": (on_activate(destroy(monsters("both"))),),  # Dark Hole
+    "4343": (on_activate(destroy(monsters("opponent"))),),  # Raigeki
+    "4835": (on_activate(destroy(weakest(monsters("opponent", face_up=True)))),),  # Fissure
+    "4838": (on_activate(destroy(first(spell_traps("opponent", CardType.TRAP, face_up=True)))),),  # Remove Trap
+    "4843": (on_activate(destroy(first(spell_traps("opponent", CardType.SPELL)))),),  # De-Spell
+    "4845": (on_activate(banish(first(graveyard("opponent", CardType.MONSTER), 2))),),  # Gravedigger Ghoul
+    "4326": (on_activate(change_position(first(monsters("opponent", where=_face_up_defense)), MonsterPosition.FACE_UP_ATTACK)),),  # Stop Defense
+    "4839": (  # Two-Pronged Attack
+        on_activate(
+            destroy(weakest(monsters("own"), 2)),
+            destroy(strongest(monsters("opponent"))),
+            condition=_two_own_and_one_opposing_monster,
+        ),
+    ),
+    # Responses to summons
+    "4836": (on_response(GameEvent.SUMMON, destroy(trigger_card), condition=_opponent_summoned_1000_attack),),  # Trap Hole
+    # Trigger effects
+    "4172": (on_event(GameEvent.SUMMON, gain_life_points(500), condition=_another_monster_summoned),),  # Mysterious Puppeteer
+    "4029": (on_event(GameEvent.PHASE_CHANGE, return_to_hand(this_card), condition=_own_end_phase),),  # The Wicked Worm Beast
+    # FLIP effects
+    "4507": (on_flip(destroy(strongest(monsters("opponent")))),),  # Man-Eater Bug
+    "4475": (on_flip(destroy(first(spell_traps("opponent", CardType.SPELL)))),),  # Armed Ninja
+    "4090": (on_flip(destroy(first(spell_traps("opponent", CardType.TRAP)))),),  # Reaper of the Cards
+    "4230": (on_flip(destroy(first(spell_traps("opponent", CardType.TRAP)))),),  # Trap Master
+    "4547": (on_flip(return_to_hand(strongest(monsters("opponent")))),),  # Hane-Hane
+}
@@ -0,0 +1,146 @@
+import json
+import os
+import zlib
+from typing import Any, Iterator, Optional, Tuple
+
+CARD_INFOS_PATH = "data/card_infos.json"
+LOCALE_TABLE_PATH = "data/{locale}_cards.json"
+LOCALE_TABLE_NAMES = {"en": "english"}
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_items(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[Any, Any]]:
+    """
+    Yield (index, value) for each element of the top-level JSON array in
+    `path`, or (key, value) for each member of a top-level object.
+
+    The file is read `chunk_size` characters at a time and only one element
+    is decoded at once, so memory use is bounded by the largest element
+    rather than the whole file.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+        pos = 0
+
+        def fill() -> bool:
+            # Drop what has been consumed and read the next chunk; False at the end of the file.
+            nonlocal buffer, pos, eof
+            if eof:
+                return False
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return not eof
+
+        def skip_whitespace() -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        def expect(characters: str) -> str:
+            nonlocal pos
+            skip_whitespace()
+            if pos >= len(buffer) or buffer[pos] not in characters:
+                found = buffer[pos] if pos < len(buffer) else "end of file"
+                raise ValueError(f"Expected one of {characters!r} in {path}, found {found!r}")
+            pos += 1
+            return buffer[pos - 1]
+
+        def decode() -> Any:
+            nonlocal pos
+            skip_whitespace()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if not fill():
+                        raise
+                    continue
+                # A value that runs to the end of the buffer may be cut short, like a number.
+                if end == len(buffer) and fill():
+                    continue
+                pos = end
+                return value
+
+        closing = "]" if expect("[{") == "[" else "}"
+        skip_whitespace()
+        if pos < len(buffer) and buffer[pos] == closing:
+            return
+        index = 0
+        while True:
+            if closing == "}":
+                key = decode()
+                expect(":")
+            else:
+                key = index
+            yield key, decode()
+            index += 1
+            if expect("," + closing) == closing:
+                return
+
+
+def locale_table_path(locale: str) -> str:
+    return LOCALE_TABLE_PATH.format(locale=LOCALE_TABLE_NAMES.get(locale, locale))
+
+
+class CardTableWriter:
+    """
+    Writes a card table, cards keyed by ID, as `json.dump(cards, indent=2)`
+    would, one card at a time.
+
+    The table is written next to `path` and renamed into place on close.
+    `fingerprint` is the (size, mtime, crc32) of the finished file, as computed by
+    `card_store.source_fingerprint`, so a store compiled alongside can be
+    marked current without reading the table back.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.fingerprint: Optional[Tuple[int, int, int]] = None
+        self._size = 0
+        self._crc = 0
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._file = open(self._tmp_path, "wb")
+
+    def _write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._file.write(data)
+        self._size += len(data)
+        self._crc = zlib.crc32(data, self._crc)
+
+    def write(self, card_id, card_data: dict) -> None:
+        # Dumping a one-card table and dropping its braces gives the entry at table depth.
+        self._write(("{\n" if self.count == 0 else ",\n") + json.dumps({str(card_id): card_data}, indent=2)[2:-2])
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._write("\n}" if self.count else "{}")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        self.fingerprint = (self._size, os.stat(self.path).st_mtime_ns, self._crc)
+
+    def discard(self) -> None:
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self) -> "CardTableWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
@@ -0,0 +1,215 @@
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ygogym.core.constants import (
+    CardType, MonsterType, MonsterAbility, MonsterAttribute,
+    MonsterRace, SpellType, TrapType
+)
+
+CARD_STORE_PATH = "data/english_cards.bin"
+
+STORE_MAGIC = b"YGCS"
+STORE_VERSION = 2
+
+# magic, version, card count, source size, source mtime in ns, source crc32, strings size
+HEADER_FORMAT = "<4sHxxIQqIxxxxQ"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MTIME_OFFSET = struct.calcsize("<4sHxxIQ")
+
+# Missing numeric values (e.g. a spell's attack) are stored as -1.
+NUMERIC_COLUMNS = [
+    ("id", "<u4"),
+    ("attack", "<i4"),
+    ("defense", "<i4"),
+    ("level", "<i2"),
+]
+
+# Enum values are stored as 1 + their index in the enum, with 0 meaning None.
+ENUM_COLUMNS = [
+    ("card_type", CardType),
+    ("monster_type", MonsterType),
+    ("monster_ability", MonsterAbility),
+    ("attribute", MonsterAttribute),
+    ("race", MonsterRace),
+    ("spell_type", SpellType),
+    ("trap_type", TrapType),
+]
+
+ENUM_MEMBERS = {name: [None] + list(enum) for name, enum in ENUM_COLUMNS}
+ENUM_CODES = {name: {member: code for code, member in enumerate(members)} for name, members in ENUM_MEMBERS.items()}
+
+# Each card has two strings in the blob, its name followed by its description.
+STRING_FIELDS = ["name", "description"]
+
+
+def _column_layout(count: int) -> List[tuple]:
+    """Offsets of each column, laid out back to back and 8-byte aligned after the header."""
+    layout = []
+    offset = HEADER_SIZE
+    columns = NUMERIC_COLUMNS + [(name, "u1") for name, _ in ENUM_COLUMNS]
+    columns.append(("string_offsets", "<u4"))
+    for name, dtype in columns:
+        length = count * len(STRING_FIELDS) + 1 if name == "string_offsets" else count
+        offset = (offset + 7) & ~7
+        layout.append((name, np.dtype(dtype), offset, length))
+        offset += np.dtype(dtype).itemsize * length
+    layout.append(("strings", np.dtype("u1"), (offset + 7) & ~7, None))
+    return layout
+
+
+def source_stat(source_path: str) -> tuple:
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def source_crc(source_path: str) -> int:
+    crc = 0
+    with open(source_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def source_fingerprint(source_path: str) -> tuple:
+    """(size, mtime in ns, crc32) of a card data file."""
+    return (*source_stat(source_path), source_crc(source_path))
+
+
+def write_card_store(records: List[Dict[str, Any]], store_path: str, fingerprint: tuple = (0, 0, 0)) -> None:
+    """
+    Write parsed card records to a fixed-layout binary store.
+
+    The file is written next to `store_path` and renamed into place so that
+    processes mapping the old store never see a partially written file.
+    """
+    count = len(records)
+    columns = {name: np.full(count, -1, dtype=dtype) for name, dtype in NUMERIC_COLUMNS[1:]}
+    columns["id"] = np.zeros(count, dtype=NUMERIC_COLUMNS[0][1])
+    columns.update({name: np.zeros(count, dtype="u1") for name, _ in ENUM_COLUMNS})
+
+    blob = bytearray()
+    string_offsets = np.zeros(count * len(STRING_FIELDS) + 1, dtype="<u4")
+    for row, record in enumerate(records):
+        for name, _ in NUMERIC_COLUMNS:
+            value = record.get(name)
+            if isinstance(value, int):
+                columns[name][row] = value
+        for name, _ in ENUM_COLUMNS:
+            columns[name][row] = ENUM_CODES[name][record.get(name)]
+        for i, field in enumerate(STRING_FIELDS):
+            blob += (record.get(field) or "").encode("utf-8")
+            string_offsets[row * len(STRING_FIELDS) + i + 1] = len(blob)
+    columns["string_offsets"] = string_offsets
+
+    source_size, source_mtime, crc = fingerprint
+    tmp_path = f"{store_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, STORE_MAGIC, STORE_VERSION, count, source_size, source_mtime, crc, len(blob)))
+        for name, dtype, offset, _ in _column_layout(count):
+            f.write(b"\0" * (offset - f.tell()))
+            if name == "strings":
+                f.write(blob)
+            else:
+                f.write(columns[name].astype(dtype, copy=False).tobytes())
+    os.replace(tmp_path, store_path)
+
+
+class CardStore:
+    """
+    Read-only view over a compiled card store.
+
+    The file is memory-mapped and every column is a NumPy view into the
+    mapping, so opening a store costs a header read and worker processes
+    share the same physical pages.
+    """
+
+    def __init__(self, store_path: str):
+        self.path = store_path
+        with open(store_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER_SIZE:
+            raise ValueError(f"Card store {store_path} is truncated")
+        magic, version, count, source_size, source_mtime, crc, strings_size = struct.unpack_from(HEADER_FORMAT, self._mmap)
+        if magic != STORE_MAGIC:
+            raise ValueError(f"{store_path} is not a card store")
+
+        self.version = version
+        self.count = count
+        self.fingerprint = (source_size, source_mtime, crc)
+        if version != STORE_VERSION:
+            return
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, dtype, offset, length in _column_layout(count):
+            if name == "strings":
+                self._strings_offset = offset
+                continue
+            self.columns[name] = np.frombuffer(self._mmap, dtype=dtype, count=length, offset=offset)
+        self._string_offsets = self.columns["string_offsets"]
+
+    def is_current(self, source_path: Optional[str]) -> bool:
+        """
+        Whether the store was compiled from the current contents of `source_path`; None means it was.
+
+        Size and modification time are compared first, so the usual check is
+        one `stat`. The source is only hashed when its time changed but its
+        size did not, e.g. after a checkout; if the contents are the same,
+        the new time is recorded so the next check is cheap again.
+        """
+        if self.version != STORE_VERSION:
+            return False
+        if source_path is None:
+            return True
+        size, mtime = source_stat(source_path)
+        stored_size, stored_mtime, stored_crc = self.fingerprint
+        if size != stored_size:
+            return False
+        if mtime == stored_mtime:
+            return True
+        if source_crc(source_path) != stored_crc:
+            return False
+        self._restamp(mtime)
+        return True
+
+    def _restamp(self, mtime: int) -> None:
+        try:
+            with open(self.path, 'r+b') as f:
+                f.seek(MTIME_OFFSET)
+                f.write(struct.pack("<q", mtime))
+        except OSError:
+            # A read-only store still works; it is just hashed again next time.
+            return
+        self.fingerprint = (self.fingerprint[0], mtime, self.fingerprint[2])
+
+    def string(self, row: int, field: str) -> str:
+        i = row * len(STRING_FIELDS) + STRING_FIELDS.index(field)
+        start = self._strings_offset + int(self._string_offsets[i])
+        end = self._strings_offset + int(self._string_offsets[i + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Materialize one row as `Card` constructor arguments."""
+        columns = self.columns
+        record = {
+            "id": int(columns["id"][row]),
+            "name": self.string(row, "name"),
+            "description": self.string(row, "description"),
+        }
+        for name, _ in NUMERIC_COLUMNS[1:]:
+            value = int(columns[name][row])
+            record[name] = None if value == -1 else value
+        for name, _ in ENUM_COLUMNS:
+            record[name] = ENUM_MEMBERS[name][columns[name][row]]
+        return record
+
+    def ids(self) -> List[int]:
+        return self.columns["id"].tolist()
+
+    def __len__(self) -> int:
+        return self.count
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntFlag
 
 # Game constants
 MAX_PLAYERS = 2
@@ -8,6 +8,8 @@ FIELD_SIZE = 5
 MIN_DECK_SIZE = 40
 MAX_DECK_SIZE = 60
 MAX_EXTRA_DECK_SIZE = 15
+# Hand positions that observations and actions can address
+HAND_SLOTS = 10
 
 # Game Enums
 class Phase(Enum):
@@ -68,6 +70,7 @@ class MonsterRace(Enum):
     WARRIOR = "warrior"
     WINGED_BEAST = "winged_beast"
     WYRM = "wyrm"
+    ZOMBIE = "zombie"
     
 class SpellType(Enum):
     NORMAL = "normal"
@@ -97,6 +100,28 @@ class CardLocation(Enum):
     BANISHED = "banished"
     EXTRA_DECK = "extra_deck"
 
+# Parts of the game state reported to state listeners when they change
+class StateRegion(Enum):
+    HAND = "hand"
+    MONSTER_ZONE = "monster_zone"
+    SPELL_TRAP_ZONE = "spell_trap_zone"
+    FIELD_SPELL_ZONE = "field_spell_zone"
+    GRAVEYARD = "graveyard"
+    BANISHED = "banished"
+    DECK = "deck"
+    LIFE_POINTS = "life_points"
+    PHASE = "phase"
+
+# Game events that card effects trigger on; flags so a card's triggers fit in one mask
+class GameEvent(IntFlag):
+    ACTIVATE = 1
+    FLIP = 2
+    SUMMON = 4
+    DESTROY = 8
+    SENT_TO_GRAVEYARD = 16
+    ATTACK_DECLARED = 32
+    PHASE_CHANGE = 64
+
 # Actions
 class Action(Enum):
     DRAW = "draw"
@@ -117,4 +142,7 @@ class Action(Enum):
     CHANGE_MONSTER_POSITION = "change_monster_position"
     DISCARD = "discard"
 
+    ATTACK = "attack"
+
+    NEXT_PHASE = "next_phase"
     END_TURN = "end_turn"
@@ -0,0 +1,270 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ygogym.core.card_effects import CARD_EFFECTS
+from ygogym.core.card_source import CARD_INFOS_PATH, CardTableWriter, iter_json_items, locale_table_path
+from ygogym.core.card_store import CARD_STORE_PATH, CardStore, source_fingerprint, write_card_store
+from ygogym.core.effects import Effect, trigger_mask
+from ygogym.core.entities.card_template import CardTemplate
+from ygogym.core.constants import (
+    CardType, GameEvent, MonsterType, MonsterAbility, MonsterAttribute,
+    MonsterRace, SpellType, TrapType
+)
+
+CARD_DATABASE_PATH = "data/english_cards.json"
+
+# ygoresources encodes monster types, abilities and races as numeric "properties".
+PROPERTY_MONSTER_TYPES = {
+    4: MonsterType.EFFECT,
+    6: MonsterType.NORMAL,
+    11: MonsterType.FUSION,
+}
+
+PROPERTY_MONSTER_ABILITIES = {
+    7: MonsterAbility.FLIP,
+}
+
+PROPERTY_MONSTER_RACES = {
+    3: MonsterRace.BEAST,
+    5: MonsterRace.FISH,
+    8: MonsterRace.SPELLCASTER,
+    9: MonsterRace.MACHINE,
+    12: MonsterRace.WARRIOR,
+    13: MonsterRace.BEAST_WARRIOR,
+    14: MonsterRace.FIEND,
+    15: MonsterRace.FAIRY,
+    17: MonsterRace.SEA_SERPENT,
+    21: MonsterRace.DRAGON,
+    24: MonsterRace.ROCK,
+    25: MonsterRace.PLANT,
+    29: MonsterRace.REPTILE,
+    31: MonsterRace.AQUA,
+    32: MonsterRace.ZOMBIE,
+    34: MonsterRace.INSECT,
+    35: MonsterRace.WINGED_BEAST,
+    36: MonsterRace.DINOSAUR,
+    37: MonsterRace.PYRO,
+    38: MonsterRace.THUNDER,
+}
+
+
+def parse_card_record(card_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a raw ygoresources card entry into `Card` constructor arguments."""
+    card_type = CardType(card_info["cardType"])
+    record = {
+        "id": card_info.get("id"),
+        "name": card_info.get("name"),
+        "description": card_info.get("effectText", ""),
+        "card_type": card_type,
+    }
+
+    if card_type == CardType.MONSTER:
+        attribute = card_info.get("attribute")
+        record.update({
+            "level": card_info.get("level"),
+            "attack": card_info.get("atk"),
+            "defense": card_info.get("def"),
+            "attribute": MonsterAttribute(attribute) if attribute else None,
+            "monster_ability": MonsterAbility.NONE,
+        })
+
+        for prop in card_info.get("properties", []):
+            if prop in PROPERTY_MONSTER_RACES:
+                record["race"] = PROPERTY_MONSTER_RACES[prop]
+            elif prop in PROPERTY_MONSTER_ABILITIES:
+                record["monster_ability"] = PROPERTY_MONSTER_ABILITIES[prop]
+            elif prop in PROPERTY_MONSTER_TYPES:
+                # Effect is listed alongside Flip, Fusion etc. so keep the most specific type.
+                if record.get("monster_type") in (None, MonsterType.EFFECT):
+                    record["monster_type"] = PROPERTY_MONSTER_TYPES[prop]
+
+    elif card_type == CardType.SPELL:
+        record["spell_type"] = SpellType(card_info.get("property", "normal"))
+    elif card_type == CardType.TRAP:
+        record["trap_type"] = TrapType(card_info.get("property", "normal"))
+
+    return record
+
+
+def _enum_value(enum, value) -> str:
+    # Tolerate the spellings the source uses across locales and dumps, e.g. "Light" or "sea-serpent".
+    return enum(str(value).strip().lower().replace("-", "_").replace(" ", "_")).value
+
+
+def normalize_card_data(card_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A copy of a raw card entry with `cardType`, `attribute`, `property` and
+    `properties` rewritten to the values of the enums they map to.
+
+    Raises ValueError for a value no enum covers, such as a card type or
+    spell type the game does not implement.
+    """
+    card_info = dict(card_info)
+    card_type = CardType(_enum_value(CardType, card_info["cardType"]))
+    card_info["cardType"] = card_type.value
+    if card_type == CardType.MONSTER:
+        if card_info.get("attribute"):
+            card_info["attribute"] = _enum_value(MonsterAttribute, card_info["attribute"])
+        card_info["properties"] = [int(prop) for prop in card_info.get("properties", [])]
+    elif card_info.get("property"):
+        property_enum = SpellType if card_type == CardType.SPELL else TrapType
+        card_info["property"] = _enum_value(property_enum, card_info["property"])
+    return card_info
+
+
+def compile_card_store(source_path: str = CARD_DATABASE_PATH, store_path: str = CARD_STORE_PATH) -> int:
+    """
+    Compile a card data file into the binary store read at runtime.
+
+    `source_path` may be either `english_cards.json` (cards keyed by ID) or the
+    multi-locale `card_infos.json` list, in which case the English data is used.
+    """
+    records = []
+    for key, card_info in iter_json_items(source_path):
+        # Elements of the card_infos.json list come with an index, cards keyed by ID with their ID.
+        if isinstance(key, int):
+            card_info = card_info.get("cardData", {}).get("en")
+            if card_info is None:
+                continue
+        records.append(parse_card_record(card_info))
+    write_card_store(records, store_path, source_fingerprint(source_path))
+    return len(records)
+
+
+def extract_card_tables(
+    source_path: str = CARD_INFOS_PATH,
+    locales: Sequence[str] = ("en",),
+    store_path: Optional[str] = CARD_STORE_PATH,
+) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+    """
+    Stream the multi-locale `card_infos.json` into a card table per locale.
+
+    Cards are read one at a time, so memory does not grow with the size of
+    the source. Each requested locale's data is normalized and written to
+    `locale_table_path(locale)`, English to `CARD_DATABASE_PATH`. Unless
+    `store_path` is None, the English records are compiled into the binary
+    store as they are written, and the store is marked current for the new
+    table. Returns the number of cards written per locale and the IDs left
+    out because their data does not normalize.
+    """
+    writers = {locale: CardTableWriter(locale_table_path(locale)) for locale in locales}
+    skipped: Dict[str, List[str]] = {locale: [] for locale in locales}
+    records = []
+    try:
+        for _, card_info in iter_json_items(source_path):
+            card_data = card_info.get("cardData", {})
+            for locale, writer in writers.items():
+                if locale not in card_data:
+                    continue
+                try:
+                    normalized = normalize_card_data(card_data[locale])
+                    record = parse_card_record(normalized)
+                except (KeyError, ValueError):
+                    skipped[locale].append(str(card_data[locale].get("id", card_info.get("cardId"))))
+                    continue
+                writer.write(normalized["id"], normalized)
+                if locale == "en" and store_path is not None:
+                    records.append(record)
+    except BaseException:
+        for writer in writers.values():
+            writer.discard()
+        raise
+
+    for writer in writers.values():
+        writer.close()
+    if "en" in writers and store_path is not None:
+        write_card_store(records, store_path, writers["en"].fingerprint)
+    return {locale: writer.count for locale, writer in writers.items()}, skipped
+
+
+def open_card_store(source_path: str = CARD_DATABASE_PATH, store_path: str = CARD_STORE_PATH) -> CardStore:
+    """Open the compiled store, rebuilding it first if it is missing or older than its source."""
+    source = source_path if os.path.exists(source_path) else None
+    try:
+        store = CardStore(store_path)
+    except (OSError, ValueError):
+        store = None
+
+    if store is None or not store.is_current(source):
+        compile_card_store(source_path, store_path)
+        store = CardStore(store_path)
+    return store
+
+
+class CardDatabase:
+    """
+    Process-wide index of card templates, keyed by card ID.
+
+    The database is loaded lazily on first use and shared by every `Card`,
+    `Deck` and `Player` in the process. Card data is read from the compiled
+    binary store, which is rebuilt from the JSON source whenever the source
+    changes, and a single immutable `CardTemplate` is built per card that is
+    used and shared by all of its copies.
+    """
+
+    _instance: Optional["CardDatabase"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path: str = CARD_DATABASE_PATH, store_path: str = CARD_STORE_PATH):
+        self.path = path
+        self.store = open_card_store(path, store_path)
+        self.rows: Dict[str, int] = {str(card_id): row for row, card_id in enumerate(self.store.ids())}
+        self._templates: Dict[int, CardTemplate] = {}
+
+        # Effects are compiled once per row, with a mask of the events each row reacts to.
+        self.effects: Dict[int, Tuple[Effect, ...]] = {
+            self.rows[card_id]: effects for card_id, effects in CARD_EFFECTS.items() if card_id in self.rows
+        }
+        self.trigger_masks = np.zeros(len(self.rows), dtype=np.uint32)
+        for row, effects in self.effects.items():
+            self.trigger_masks[row] = trigger_mask(effects)
+
+    @classmethod
+    def get(cls) -> "CardDatabase":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._instance_lock:
+            cls._instance = None
+
+    def row(self, id: str) -> int:
+        row = self.rows.get(str(id))
+        if row is None:
+            raise ValueError(f"Card with ID {id} not found in database")
+        return row
+
+    def template(self, id: str) -> CardTemplate:
+        return self.template_at(self.row(id))
+
+    def template_at(self, row: int) -> CardTemplate:
+        template = self._templates.get(row)
+        if template is None:
+            template = CardTemplate(**self.store.record(row), effects=self.effects.get(row, ()), index=row)
+            # setdefault keeps the first template if two threads build the same row.
+            template = self._templates.setdefault(row, template)
+        return template
+
+    def templates_for(self, ids: List[str]) -> List[CardTemplate]:
+        return [self.template(card_id) for card_id in ids]
+
+    def rows_reacting_to(self, event: GameEvent) -> np.ndarray:
+        """Rows of every card with an effect that triggers on `event`."""
+        return np.flatnonzero(self.trigger_masks & event)
+
+    def is_extra_deck_card(self, id: str) -> bool:
+        return self.template(id).monster_type == MonsterType.FUSION
+
+    def __contains__(self, id: str) -> bool:
+        return str(id) in self.rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
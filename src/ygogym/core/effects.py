@@ -0,0 +1,253 @@
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from ygogym.core.constants import CardLocation, CardType, GameEvent, MonsterPosition, SpellTrapPosition
+
+# Called as operation(game, player, card, trigger) where `player` controls `card` and
+# `trigger` describes the event that set the effect off, if any.
+Operation = Callable[..., None]
+Condition = Callable[..., bool]
+# Called as selector(game, player, card, trigger) and returns the cards an operation applies to.
+Selector = Callable[..., List]
+Amount = Union[int, Callable[..., int]]
+
+
+class Effect:
+    """
+    One compiled card effect: what sets it off and what it does.
+
+    Effects are built once from the declarations in `ygogym.core.card_effects`
+    and shared by every copy of the card, like the `CardTemplate` holding them.
+    """
+
+    __slots__ = ("event", "operation", "condition", "locations", "activates_card")
+
+    def __init__(
+        self,
+        event: GameEvent,
+        operation: Operation,
+        condition: Optional[Condition] = None,
+        locations: Tuple[CardLocation, ...] = (CardLocation.FIELD,),
+        activates_card: bool = False,
+    ):
+        self.event = event
+        self.operation = operation
+        self.condition = condition
+        # Where the card must be for the effect to trigger
+        self.locations = locations
+        # Whether triggering means activating the Set card itself, which its controller may decline
+        self.activates_card = activates_card
+
+    def applies(self, game, player, card, trigger=None) -> bool:
+        return self.condition is None or self.condition(game, player, card, trigger)
+
+    def __repr__(self) -> str:
+        return f"Effect({self.event!r})"
+
+
+def trigger_mask(effects: Iterable[Effect]) -> int:
+    mask = 0
+    for effect in effects:
+        mask |= effect.event
+    return mask
+
+
+# Effect declarations
+
+def on_activate(*operations: Operation, condition: Optional[Condition] = None) -> Effect:
+    """Resolves when the Spell or Trap Card itself is activated."""
+    return Effect(GameEvent.ACTIVATE, sequence(*operations), condition)
+
+
+def on_flip(*operations: Operation, condition: Optional[Condition] = None) -> Effect:
+    """FLIP: resolves when the monster is flipped face-up."""
+    return Effect(GameEvent.FLIP, sequence(*operations), condition)
+
+
+def on_event(
+    event: GameEvent,
+    *operations: Operation,
+    condition: Optional[Condition] = None,
+    locations: Tuple[CardLocation, ...] = (CardLocation.FIELD,),
+) -> Effect:
+    """Resolves when `event` happens while the card is in one of `locations`."""
+    return Effect(event, sequence(*operations), condition, locations)
+
+
+def on_response(event: GameEvent, *operations: Operation, condition: Optional[Condition] = None) -> Effect:
+    """A Set Trap Card that can be activated in response to `event`."""
+    return Effect(event, sequence(*operations), condition, activates_card=True)
+
+
+# Selectors. Choices that are up to the player in the real game are made by a
+# fixed heuristic (e.g. the strongest opposing monster) until actions can carry targets.
+
+def _players(game, player, side: str) -> list:
+    if side == "own":
+        return [player]
+    opponent = game.players[1] if player is game.players[0] else game.players[0]
+    if side == "opponent":
+        return [opponent]
+    return [player, opponent]
+
+
+def monsters(side: str = "both", face_up: Optional[bool] = None, where: Optional[Callable] = None) -> Selector:
+    def select(game, player, card, trigger=None) -> list:
+        cards = []
+        for owner in _players(game, player, side):
+            for monster in owner.field.monster_zones:
+                if monster is None:
+                    continue
+                if face_up is not None and (monster.position != MonsterPosition.FACE_DOWN_DEFENSE) != face_up:
+                    continue
+                if where is None or where(monster):
+                    cards.append(monster)
+        return cards
+    return select
+
+
+def spell_traps(side: str = "both", card_type: Optional[CardType] = None, face_up: Optional[bool] = None) -> Selector:
+    def select(game, player, card, trigger=None) -> list:
+        cards = []
+        for owner in _players(game, player, side):
+            for zone_card in owner.field.spell_trap_zones + [owner.field.field_spell]:
+                if zone_card is None or zone_card is card:
+                    continue
+                if card_type is not None and zone_card.card_type != card_type:
+                    continue
+                if face_up is not None and (zone_card.position == SpellTrapPosition.FACE_UP) != face_up:
+                    continue
+                cards.append(zone_card)
+        return cards
+    return select
+
+
+def graveyard(side: str = "both", card_type: Optional[CardType] = None) -> Selector:
+    def select(game, player, card, trigger=None) -> list:
+        return [
+            grave_card
+            for owner in _players(game, player, side)
+            for grave_card in owner.graveyard
+            if card_type is None or grave_card.card_type == card_type
+        ]
+    return select
+
+
+def _attack_or_zero(card) -> int:
+    return card.current_attack or 0
+
+
+def strongest(selector: Selector, count: int = 1) -> Selector:
+    def select(game, player, card, trigger=None) -> list:
+        return sorted(selector(game, player, card, trigger), key=_attack_or_zero, reverse=True)[:count]
+    return select
+
+
+def weakest(selector: Selector, count: int = 1) -> Selector:
+    def select(game, player, card, trigger=None) -> list:
+        return sorted(selector(game, player, card, trigger), key=_attack_or_zero)[:count]
+    return select
+
+
+def first(selector: Selector, count: int = 1) -> Selector:
+    def select(game, player, card, trigger=None) -> list:
+        return selector(game, player, card, trigger)[:count]
+    return select
+
+
+def this_card(game, player, card, trigger=None) -> list:
+    return [card]
+
+
+def trigger_card(game, player, card, trigger=None) -> list:
+    """The card the triggering event happened to, e.g. the summoned monster."""
+    return [trigger.card] if trigger is not None and trigger.card is not None else []
+
+
+# Operations
+
+def _amount(amount: Amount, game, player, card) -> int:
+    return amount(game, player, card) if callable(amount) else amount
+
+
+def sequence(*operations: Operation) -> Operation:
+    if len(operations) == 1:
+        return operations[0]
+    def run(game, player, card, trigger=None) -> None:
+        for operation in operations:
+            operation(game, player, card, trigger)
+    return run
+
+
+def damage(amount: Amount, side: str = "opponent") -> Operation:
+    def run(game, player, card, trigger=None) -> None:
+        value = _amount(amount, game, player, card)
+        for target in _players(game, player, side):
+            target.life_points -= value
+    return run
+
+
+def gain_life_points(amount: Amount) -> Operation:
+    def run(game, player, card, trigger=None) -> None:
+        player.life_points += _amount(amount, game, player, card)
+    return run
+
+
+def draw(count: int) -> Operation:
+    def run(game, player, card, trigger=None) -> None:
+        player.draw(count)
+    return run
+
+
+def destroy(selector: Selector) -> Operation:
+    def run(game, player, card, trigger=None) -> None:
+        for target in selector(game, player, card, trigger):
+            if target.location == CardLocation.FIELD:
+                game.destroy(target)
+    return run
+
+
+def banish(selector: Selector) -> Operation:
+    def run(game, player, card, trigger=None) -> None:
+        for target in selector(game, player, card, trigger):
+            target.owner.banish_card(target)
+    return run
+
+
+def return_to_hand(selector: Selector) -> Operation:
+    def run(game, player, card, trigger=None) -> None:
+        for target in selector(game, player, card, trigger):
+            target.owner.return_to_hand(target)
+    return run
+
+
+def change_position(selector: Selector, position: MonsterPosition) -> Operation:
+    def run(game, player, card, trigger=None) -> None:
+        for target in selector(game, player, card, trigger):
+            target.set_position(position)
+            target.owner.notify_card(target)
+    return run
+
+
+def discard_hand_and_redraw(game, player, card, trigger=None) -> None:
+    """Both players discard their hands, then draw the same number of cards."""
+    counts = []
+    for owner in _players(game, player, "both"):
+        counts.append(len(owner.hand))
+        for hand_card in list(owner.hand):
+            owner.send_to_graveyard(hand_card)
+    for owner, count in zip(_players(game, player, "both"), counts):
+        owner.draw(count)
+
+
+# Amounts and conditions
+
+def per_card(selector: Selector, amount: int) -> Callable[..., int]:
+    def count(game, player, card) -> int:
+        return amount * len(selector(game, player, card))
+    return count
+
+
+def at_least(selector: Selector, count: int = 1) -> Condition:
+    def check(game, player, card, trigger=None) -> bool:
+        return len(selector(game, player, card, trigger)) >= count
+    return check
@@ -1,63 +1,63 @@
-import json
-import os
+from operator import attrgetter
+from typing import Optional, List, Dict, Any, Tuple
+from ygogym.core.constants import CardType, GameEvent, MonsterType, MonsterPosition, SpellTrapPosition
+from ygogym.core.database import CardDatabase
+from ygogym.core.effects import Effect
+from ygogym.core.entities.card_template import CardTemplate
 
-from typing import Optional, List, Dict, Any, Callable
-from src.ygogym.core.constants import (
-    CardType, MonsterType, MonsterAbility, MonsterAttribute, 
-    MonsterRace, SpellType, TrapType, MonsterPosition, SpellTrapPosition
-)
+def _template_field(name: str) -> property:
+    return property(attrgetter(f"template.{name}"))
 
 class Card:
-    def __init__(
-        self,
-        id: str,
-        name: str,
-        card_type: CardType,
-        description: str,
-        # Monster-specific attributes
-        level: Optional[int] = None,
-        attack: Optional[int] = None,
-        defense: Optional[int] = None,
-        monster_type: Optional[MonsterType] = None,
-        monster_ability: Optional[MonsterAbility] = None,
-        attribute: Optional[MonsterAttribute] = None,
-        race: Optional[MonsterRace] = None,
-        # Spell-specific attributes
-        spell_type: Optional[SpellType] = None,
-        # Trap-specific attributes
-        trap_type: Optional[TrapType] = None,
-        # Effects and conditions
-        effects: Optional[Dict[str, Callable]] = None,
-        conditions: Optional[Dict[str, Callable]] = None,
-    ):
-        self.id = id
-        self.name = name
-        self.card_type = card_type
-        self.description = description
-        
-        self.position = None
+    """
+    One physical copy of a card in a game.
+
+    Static card data is read through the shared `CardTemplate`; only the
+    per-game state below is stored on the instance.
+    """
+
+    __slots__ = (
+        "template",
+        "position", "owner", "location", "_counters",
+        "attack_modifier", "defense_modifier", "level_modifier",
+        "can_attack", "can_change_position", "can_activate_effect",
+        "summoned_this_turn", "position_changed_this_turn", "effect_activated_this_turn", "set_this_turn",
+    )
+
+    id = _template_field("id")
+    name = _template_field("name")
+    card_type = _template_field("card_type")
+    description = _template_field("description")
+    
+    # Monster attributes
+    level = _template_field("level")
+    attack = _template_field("attack")
+    defense = _template_field("defense")
+    monster_type = _template_field("monster_type")
+    monster_ability = _template_field("monster_ability")
+    attribute = _template_field("attribute")
+    race = _template_field("race")
+    
+    # Spell attributes
+    spell_type = _template_field("spell_type")
+    
+    # Trap attributes
+    trap_type = _template_field("trap_type")
+    
+    # Effects
+    effects = _template_field("effects")
+    trigger_mask = _template_field("trigger_mask")
+
+    def __init__(self, template: CardTemplate):
+        self.template = template
         self.owner = None
+        self.reset()
+    
+    def reset(self) -> None:
+        """Return the card to the state of a freshly built card, keeping its owner."""
+        self.position = None
         self.location = None
-        self.counters = {}
-        
-        # Monster attributes
-        self.level = level
-        self.attack = attack
-        self.defense = defense
-        self.monster_type = monster_type
-        self.monster_ability = monster_ability
-        self.attribute = attribute
-        self.race = race
-        
-        # Spell attributes
-        self.spell_type = spell_type
-        
-        # Trap attributes
-        self.trap_type = trap_type
-        
-        # Effects and conditions
-        self.effects = effects or {}
-        self.conditions = conditions or {}
+        self._counters = None
         
         self.attack_modifier = 0
         self.defense_modifier = 0
@@ -69,6 +69,40 @@ class Card:
         self.summoned_this_turn = False
         self.position_changed_this_turn = False
         self.effect_activated_this_turn = False
+        self.set_this_turn = False
+    
+    def get_state(self) -> tuple:
+        """Per-game state of the card, excluding its template and owner."""
+        return (
+            self.position, self.location, dict(self._counters) if self._counters else None,
+            self.attack_modifier, self.defense_modifier, self.level_modifier,
+            self.can_attack, self.can_change_position, self.can_activate_effect,
+            self.summoned_this_turn, self.position_changed_this_turn, self.effect_activated_this_turn, self.set_this_turn,
+        )
+    
+    def set_state(self, state: tuple) -> None:
+        (
+            self.position, self.location, counters,
+            self.attack_modifier, self.defense_modifier, self.level_modifier,
+            self.can_attack, self.can_change_position, self.can_activate_effect,
+            self.summoned_this_turn, self.position_changed_this_turn, self.effect_activated_this_turn, self.set_this_turn,
+        ) = state
+        self._counters = dict(counters) if counters else None
+    
+    def copy(self) -> "Card":
+        """Copy the card's per-game state, sharing its template. The copy has no owner."""
+        card = Card.__new__(Card)
+        card.template = self.template
+        card.owner = None
+        card.set_state(self.get_state())
+        return card
+    
+    @property
+    def counters(self) -> Dict[str, int]:
+        # Most cards never hold counters, so the dict is only created on first use.
+        if self._counters is None:
+            self._counters = {}
+        return self._counters
     
     @property
     def current_attack(self) -> Optional[int]:
@@ -97,6 +131,9 @@ class Card:
     def is_trap(self) -> bool:
         return self.card_type == CardType.TRAP
     
+    def is_extra_deck_card(self) -> bool:
+        return self.monster_type == MonsterType.FUSION
+    
     def set_position(self, position):
         if self.is_monster():
             if not isinstance(position, MonsterPosition):
@@ -129,16 +166,12 @@ class Card:
         self.summoned_this_turn = False
         self.position_changed_this_turn = False
         self.effect_activated_this_turn = False
+        self.set_this_turn = False
     
-    def apply_effect(self, effect_name, *args, **kwargs):
-        if effect_name in self.effects:
-            return self.effects[effect_name](*args, **kwargs)
-        return False
-    
-    def check_condition(self, condition_name, *args, **kwargs) -> bool:
-        if condition_name in self.conditions:
-            return self.conditions[condition_name](*args, **kwargs)
-        return False
+    def effects_for(self, event: GameEvent) -> Tuple[Effect, ...]:
+        if not self.template.trigger_mask & event:
+            return ()
+        return tuple(effect for effect in self.template.effects if effect.event & event)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert card to dictionary for serialization"""
@@ -174,39 +207,11 @@ class Card:
     
     @staticmethod
     def from_id(id: str) -> "Card":
-        with open("data/english_cards.json", 'r') as f:
-            card_data = json.load(f)
-        card_info = card_data.get(id)
-        if not card_info:
-            raise ValueError(f"Card with ID {id} not found in database")
-        
-        card_args = {
-            "id": card_info.get("id"),
-            "name": card_info.get("name"),
-            "description": card_info.get("effectText", ""),
-            "card_type": card_info.get("cardType", "")
-        }
-        
-        if card_info.get("cardType") == "monster":
-            card_args.update({
-                "monster_type": card_info.get("type"),
-                "level": card_info.get("level"),
-                "attack": card_info.get("atk"),
-                "defense": card_info.get("def"),
-                "attribute": card_info.get("attribute")
-            })
-            
-            if "properties" in card_info:
-                pass
-        
-        elif card_info.get("cardType") == "spell":
-            if "property" in card_info:
-                card_args["spell_type"] = card_info.get("property")
-        elif card_info.get("cardType") == "trap":
-            if "property" in card_info:
-                card_args["trap_type"] = card_info.get("property")
-                
-        return Card(**card_args)
+        return Card(CardDatabase.get().template(id))
+    
+    @staticmethod
+    def from_ids(ids: List[str]) -> List["Card"]:
+        return [Card(template) for template in CardDatabase.get().templates_for(ids)]
 
 if __name__ == "__main__":
     card = Card.from_id("4439")
@@ -0,0 +1,76 @@
+from typing import Optional, Tuple, Any
+from ygogym.core.constants import (
+    CardType, MonsterType, MonsterAbility, MonsterAttribute,
+    MonsterRace, SpellType, TrapType
+)
+from ygogym.core.effects import Effect, trigger_mask
+
+class CardTemplate:
+    """
+    Immutable static data for one card ID.
+
+    A single template is shared by every copy of the card in every deck and
+    game; per-game state lives on `Card`.
+    """
+
+    __slots__ = (
+        "index", "id", "name", "card_type", "description",
+        "level", "attack", "defense", "monster_type", "monster_ability", "attribute", "race",
+        "spell_type", "trap_type",
+        "effects", "trigger_mask",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        card_type: CardType,
+        description: str,
+        # Monster-specific attributes
+        level: Optional[int] = None,
+        attack: Optional[int] = None,
+        defense: Optional[int] = None,
+        monster_type: Optional[MonsterType] = None,
+        monster_ability: Optional[MonsterAbility] = None,
+        attribute: Optional[MonsterAttribute] = None,
+        race: Optional[MonsterRace] = None,
+        # Spell-specific attributes
+        spell_type: Optional[SpellType] = None,
+        # Trap-specific attributes
+        trap_type: Optional[TrapType] = None,
+        # Compiled effects, see ygogym.core.card_effects
+        effects: Tuple[Effect, ...] = (),
+        # Row of this card in the card database, -1 for cards built by hand
+        index: int = -1,
+    ):
+        values = dict(locals())
+        values["effects"] = tuple(effects)
+        # Every GameEvent one of the effects triggers on, to skip cards without a matching effect cheaply
+        values["trigger_mask"] = trigger_mask(effects)
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Card templates are immutable, cannot set {name}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Card templates are immutable, cannot delete {name}")
+
+    def __copy__(self) -> "CardTemplate":
+        return self
+
+    def __deepcopy__(self, memo) -> "CardTemplate":
+        return self
+
+    def __reduce__(self):
+        return (_rebuild_template, (tuple(getattr(self, name) for name in self.__slots__),))
+
+    def __repr__(self) -> str:
+        return f"CardTemplate(id={self.id!r}, name={self.name!r})"
+
+
+def _rebuild_template(values: tuple) -> CardTemplate:
+    template = CardTemplate.__new__(CardTemplate)
+    for name, value in zip(CardTemplate.__slots__, values):
+        object.__setattr__(template, name, value)
+    return template
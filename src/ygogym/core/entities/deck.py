@@ -1,10 +1,19 @@
-import random
 from typing import List, Optional, Dict, Any
 
-from src.ygogym.core.entities.card import Card
-from src.ygogym.core.constants import MAX_DECK_SIZE, MIN_DECK_SIZE, MAX_EXTRA_DECK_SIZE, CardLocation
+import numpy as np
+
+from ygogym.core.entities.card import Card
+from ygogym.core.constants import MAX_DECK_SIZE, MIN_DECK_SIZE, MAX_EXTRA_DECK_SIZE, CardLocation
 
 class Deck:
+    """
+    A main deck stored as a permutation of indices into its cards.
+
+    `cards` never changes during a game; `order[top:]` lists the cards still
+    in the deck from top to bottom, so drawing advances `top` and shuffling
+    permutes small ints instead of `Card` objects.
+    """
+
     def __init__(self, main_deck_ids: List[str], extra_deck_ids: Optional[List[str]] = None):
         if len(main_deck_ids) < MIN_DECK_SIZE or len(main_deck_ids) > MAX_DECK_SIZE:
             raise ValueError(f"Main deck must contain between {MIN_DECK_SIZE} and {MAX_DECK_SIZE} cards")
@@ -13,33 +22,82 @@ class Deck:
         if len(extra_deck_ids) > MAX_EXTRA_DECK_SIZE:
             raise ValueError(f"Extra deck cannot contain more than {MAX_EXTRA_DECK_SIZE} cards")
         
-        self.main_deck = [Card.from_id(card_id) for card_id in main_deck_ids]
-        self.extra_deck = [Card.from_id(card_id) for card_id in extra_deck_ids]
+        self.cards = Card.from_ids(main_deck_ids)
+        self.extra_deck = Card.from_ids(extra_deck_ids)
+        self.order = np.arange(len(self.cards), dtype=np.intp)
+        self.top = 0
+    
+    @classmethod
+    def from_cards(cls, main_deck: List[Card], extra_deck: Optional[List[Card]] = None) -> "Deck":
+        """Wrap existing cards without deck size checks, e.g. when rebuilding a game mid-play."""
+        deck = cls.__new__(cls)
+        deck.cards = list(main_deck)
+        deck.extra_deck = list(extra_deck or [])
+        deck.order = np.arange(len(deck.cards), dtype=np.intp)
+        deck.top = 0
+        return deck
+    
+    @property
+    def main_deck(self) -> List[Card]:
+        """Cards left in the deck, from top to bottom."""
+        cards = self.cards
+        return [cards[i] for i in self.order[self.top:].tolist()]
     
-    def shuffle(self) -> None:
-        random.shuffle(self.main_deck)
+    def reset(self) -> None:
+        """Put every card back in the deck in its original order; card state is reset by `Player.reset`."""
+        self.order = np.arange(len(self.cards), dtype=np.intp)
+        self.top = 0
+    
+    def shuffle(self, rng: np.random.Generator) -> None:
+        """Shuffle the remaining cards with `rng`, which callers pass in (normally `Game.rng`) so games stay reproducible."""
+        if rng is None:
+            raise ValueError("Deck.shuffle needs a generator; pass the game's rng")
+        rng.shuffle(self.order[self.top:])
     
     def draw(self, count: int = 1) -> List[Card]:
-        cards = []
-        for _ in range(count):
-            card = self.main_deck.pop(0)
-            if card:
-                cards.append(card)
-            else:
-                break
-        return cards
+        """Take up to `count` cards from the top; fewer are returned if the deck runs out."""
+        drawn = self.order[self.top:self.top + count].tolist()
+        self.top += len(drawn)
+        cards = self.cards
+        return [cards[i] for i in drawn]
     
     def return_to_deck(self, card: Card, position: int = -1) -> None:
-        if position == 0:
-            self.main_deck.insert(0, card)
-        elif position == -1:
-            self.main_deck.append(card)
-        else:
-            self.main_deck.insert(position, card)
+        # Rare compared to draws, so the permutation is simply rebuilt.
+        try:
+            index = self.cards.index(card)
+        except ValueError:
+            self.cards.append(card)
+            index = len(self.cards) - 1
+        if index in self.order[self.top:]:
+            raise ValueError(f"Card {card.id} is already in the deck")
+        
+        drawn = self.order[:self.top]
+        drawn = drawn[drawn != index]
+        remaining = self.order[self.top:]
+        if position == -1:
+            position = len(remaining)
+        self.order = np.concatenate((drawn, np.insert(remaining, position, index)))
+        self.top = len(drawn)
         card.location = CardLocation.DECK
     
     def remaining_cards(self) -> int:
-        return len(self.main_deck)
+        return len(self.order) - self.top
+    
+    def get_state(self) -> tuple:
+        return self.order.copy(), self.top, tuple(self.extra_deck)
+    
+    def set_state(self, state: tuple) -> None:
+        order, self.top, extra_deck = state
+        self.order = order.copy()
+        self.extra_deck = list(extra_deck)
+    
+    def clone(self, card_map: Dict[Card, Card]) -> "Deck":
+        deck = Deck.__new__(Deck)
+        deck.cards = [card_map[card] for card in self.cards]
+        deck.extra_deck = [card_map[card] for card in self.extra_deck]
+        deck.order = self.order.copy()
+        deck.top = self.top
+        return deck
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -1,6 +1,6 @@
-from typing import List, Dict, Optional, Any
-from src.ygogym.core.entities.card import Card
-from src.ygogym.core.constants import FIELD_SIZE, CardType, MonsterPosition, SpellTrapPosition, CardLocation
+from typing import List, Dict, Optional, Any, Tuple
+from ygogym.core.entities.card import Card
+from ygogym.core.constants import FIELD_SIZE, CardType, MonsterPosition, SpellTrapPosition, CardLocation, StateRegion
 
 class Field:
     def __init__(self, owner=None):
@@ -8,6 +8,10 @@ class Field:
         self.monster_zones: List[Optional[Card]] = [None] * FIELD_SIZE
         self.spell_trap_zones: List[Optional[Card]] = [None] * FIELD_SIZE
         self.field_spell: Optional[Card] = None
+    
+    def _notify(self, region: StateRegion, index: Optional[int], card: Card, entered: Optional[bool]) -> None:
+        if self.owner is not None and self.owner.state_listeners:
+            self.owner.notify(region, index, card, entered)
         
     def place_monster(self, card: Card, position: MonsterPosition, zone_index: Optional[int] = None) -> int:
         if zone_index is not None:
@@ -16,6 +20,7 @@ class Field:
             self.monster_zones[zone_index] = card
             card.set_position(position)
             card.location = CardLocation.FIELD
+            self._notify(StateRegion.MONSTER_ZONE, zone_index, card, True)
             return zone_index
             
         for i in range(FIELD_SIZE):
@@ -23,6 +28,7 @@ class Field:
                 self.monster_zones[i] = card
                 card.set_position(position)
                 card.location = CardLocation.FIELD
+                self._notify(StateRegion.MONSTER_ZONE, i, card, True)
                 return i
                 
         return -1
@@ -34,6 +40,7 @@ class Field:
             self.spell_trap_zones[zone_index] = card
             card.set_position(position)
             card.location = CardLocation.FIELD
+            self._notify(StateRegion.SPELL_TRAP_ZONE, zone_index, card, True)
             return zone_index
             
         for i in range(FIELD_SIZE):
@@ -41,6 +48,7 @@ class Field:
                 self.spell_trap_zones[i] = card
                 card.set_position(position)
                 card.location = CardLocation.FIELD
+                self._notify(StateRegion.SPELL_TRAP_ZONE, i, card, True)
                 return i
                 
         return -1
@@ -52,21 +60,25 @@ class Field:
         self.field_spell = card
         card.set_position(position)
         card.location = CardLocation.FIELD
+        self._notify(StateRegion.FIELD_SPELL_ZONE, 0, card, True)
         return True
     
     def remove_card(self, card: Card) -> bool:
         if card in self.monster_zones:
             index = self.monster_zones.index(card)
             self.monster_zones[index] = None
+            self._notify(StateRegion.MONSTER_ZONE, index, card, False)
             return True
             
         if card in self.spell_trap_zones:
             index = self.spell_trap_zones.index(card)
             self.spell_trap_zones[index] = None
+            self._notify(StateRegion.SPELL_TRAP_ZONE, index, card, False)
             return True
             
         if self.field_spell == card:
             self.field_spell = None
+            self._notify(StateRegion.FIELD_SPELL_ZONE, 0, card, False)
             return True
             
         return False
@@ -81,14 +93,49 @@ class Field:
             return None
         return self.spell_trap_zones[zone_index]
     
+    def zone_of(self, card: Card) -> Tuple[Optional[StateRegion], Optional[int]]:
+        for i in range(FIELD_SIZE):
+            if self.monster_zones[i] is card:
+                return StateRegion.MONSTER_ZONE, i
+            if self.spell_trap_zones[i] is card:
+                return StateRegion.SPELL_TRAP_ZONE, i
+        if self.field_spell is card:
+            return StateRegion.FIELD_SPELL_ZONE, 0
+        return None, None
+    
+    def reset(self) -> None:
+        """Empty every zone in place."""
+        self.monster_zones[:] = [None] * FIELD_SIZE
+        self.spell_trap_zones[:] = [None] * FIELD_SIZE
+        self.field_spell = None
+    
     def reset_turn_state(self) -> None:
         for zone in range(FIELD_SIZE):
             if self.monster_zones[zone]:
                 self.monster_zones[zone].reset_turn_flags()
+                self._notify(StateRegion.MONSTER_ZONE, zone, self.monster_zones[zone], None)
             if self.spell_trap_zones[zone]:
                 self.spell_trap_zones[zone].reset_turn_flags()
+                self._notify(StateRegion.SPELL_TRAP_ZONE, zone, self.spell_trap_zones[zone], None)
         if self.field_spell:
             self.field_spell.reset_turn_flags()
+            self._notify(StateRegion.FIELD_SPELL_ZONE, 0, self.field_spell, None)
+    
+    def get_state(self) -> tuple:
+        return tuple(self.monster_zones), tuple(self.spell_trap_zones), self.field_spell
+    
+    def set_state(self, state: tuple) -> None:
+        monster_zones, spell_trap_zones, self.field_spell = state
+        self.monster_zones = list(monster_zones)
+        self.spell_trap_zones = list(spell_trap_zones)
+    
+    def clone(self, owner, card_map: Dict[Card, Card]) -> "Field":
+        field = Field.__new__(Field)
+        field.owner = owner
+        field.monster_zones = [card_map[card] if card is not None else None for card in self.monster_zones]
+        field.spell_trap_zones = [card_map[card] if card is not None else None for card in self.spell_trap_zones]
+        field.field_spell = card_map[self.field_spell] if self.field_spell is not None else None
+        return field
     
     def to_dict(self) -> Dict[str, Any]:
         return {
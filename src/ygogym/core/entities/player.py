@@ -1,14 +1,20 @@
-from typing import List, Dict, Optional, Set
-from src.ygogym.core.entities.card import Card
-from src.ygogym.core.entities.deck import Deck
-from src.ygogym.core.entities.field import Field
-from src.ygogym.core.constants import STARTING_LP, FIELD_SIZE, CardType, MonsterPosition, SpellTrapPosition, CardLocation
+from typing import List, Dict, Optional, Set, Callable
+from ygogym.core.entities.card import Card
+from ygogym.core.entities.deck import Deck
+from ygogym.core.entities.field import Field
+from ygogym.core.constants import STARTING_LP, FIELD_SIZE, CardType, MonsterPosition, SpellTrapPosition, CardLocation, StateRegion
+
+# Called as listener(player, region, index, card, entered) after a change to the player's state.
+# `entered` is True when `card` entered the region, False when it left and None for in-place changes.
+# A call with no player and no region means the whole game state was replaced, e.g. by Game.restore.
+StateListener = Callable[["Player", StateRegion, Optional[int], Optional[Card], Optional[bool]], None]
 
 class Player:
     def __init__(self, deck: Deck, name: str = "Player"):
         self.name = name
         self.deck = deck
-        self.life_points = STARTING_LP
+        self.state_listeners: List[StateListener] = []
+        self._life_points = STARTING_LP
         
         self.hand: List[Card] = []
         self.field = Field(owner=self)
@@ -22,10 +28,59 @@ class Player:
 
         self.has_lost = False
         
-        for card in self.deck.main_deck + self.deck.extra_deck:
+        # Every card this player owns, wherever it currently is.
+        self.cards: List[Card] = self.deck.cards + self.deck.extra_deck
+        
+        for card in self.cards:
             card.owner = self
-            if card.card_type == CardType.MONSTER and card.monster_type and card.monster_type.name in ["FUSION", "SYNCHRO", "XYZ", "LINK"]:
+            if card.is_extra_deck_card():
+                self.extra_deck.append(card)
+    
+    def reset(self) -> None:
+        """Return the player, their deck and all their cards to the state of a freshly built player."""
+        self._life_points = STARTING_LP
+        self.deck.reset()
+        self.field.reset()
+        self.hand.clear()
+        self.graveyard.clear()
+        self.banished.clear()
+        self.extra_deck.clear()
+        for card in self.cards:
+            card.reset()
+            if card.is_extra_deck_card():
                 self.extra_deck.append(card)
+        
+        self.normal_summon_used = False
+        self.can_conduct_battle_phase = True
+        self.available_actions.clear()
+        self.has_lost = False
+    
+    @property
+    def life_points(self) -> int:
+        return self._life_points
+    
+    @life_points.setter
+    def life_points(self, value: int) -> None:
+        self._life_points = value
+        if value <= 0:
+            self.has_lost = True
+        if self.state_listeners:
+            self.notify(StateRegion.LIFE_POINTS)
+    
+    def notify(self, region: StateRegion, index: Optional[int] = None, card: Optional[Card] = None, entered: Optional[bool] = None) -> None:
+        for listener in self.state_listeners:
+            listener(self, region, index, card, entered)
+    
+    def notify_card(self, card: Card) -> None:
+        """Report an in-place change to one of this player's cards, e.g. a new position or modifier."""
+        if not self.state_listeners:
+            return
+        if card.location == CardLocation.HAND:
+            self.notify(StateRegion.HAND, None, card, None)
+        elif card.location == CardLocation.FIELD:
+            region, index = self.field.zone_of(card)
+            if region is not None:
+                self.notify(region, index, card, None)
     
     def draw(self, count: int = 1) -> List[Card]:
         if count > self.deck.remaining_cards():
@@ -33,6 +88,12 @@ class Player:
             return []
         drawn_cards = self.deck.draw(count=count)
         self.hand.extend(drawn_cards)
+        for card in drawn_cards:
+            card.location = CardLocation.HAND
+        if self.state_listeners:
+            for card in drawn_cards:
+                self.notify(StateRegion.DECK, None, card, False)
+                self.notify(StateRegion.HAND, None, card, True)
         return drawn_cards
     
     def summon_monster(self, card_index: int, position: MonsterPosition, tributes: List[int] = None) -> bool:
@@ -51,15 +112,20 @@ class Player:
                 self.send_to_graveyard(monster_card)
         
         self.hand.pop(card_index)
+        self.notify(StateRegion.HAND, None, card, False)
         placed_zone = self.field.place_monster(card, position)
         if placed_zone == -1:
             self.hand.insert(card_index, card)
+            self.notify(StateRegion.HAND, None, card, True)
             return False
             
         card.summoned_this_turn = True
         return True
     
     def set_spell_trap(self, card_index: int) -> bool:
+        return self.play_spell_trap(card_index, SpellTrapPosition.FACE_DOWN)
+    
+    def play_spell_trap(self, card_index: int, position: SpellTrapPosition) -> bool:
         if card_index >= len(self.hand):
             return False
             
@@ -69,15 +135,19 @@ class Player:
             
         if card.is_spell() and card.spell_type.name == "FIELD":
             self.hand.pop(card_index)
-            if not self.field.place_field_spell(card, SpellTrapPosition.FACE_DOWN):
+            self.notify(StateRegion.HAND, None, card, False)
+            if not self.field.place_field_spell(card, position):
                 self.hand.insert(card_index, card)
+                self.notify(StateRegion.HAND, None, card, True)
                 return False
             return True
             
         self.hand.pop(card_index)
-        placed_zone = self.field.place_spell_trap(card, SpellTrapPosition.FACE_DOWN)
+        self.notify(StateRegion.HAND, None, card, False)
+        placed_zone = self.field.place_spell_trap(card, position)
         if placed_zone == -1:
             self.hand.insert(card_index, card)
+            self.notify(StateRegion.HAND, None, card, True)
             return False
             
         return True
@@ -92,34 +162,98 @@ class Player:
             
         card.set_position(SpellTrapPosition.FACE_UP)
         card.effect_activated_this_turn = True
+        self.notify(StateRegion.SPELL_TRAP_ZONE, zone_index, card, None)
         
         return True
     
     def send_to_graveyard(self, card: Card) -> None:
         if card.location == CardLocation.HAND:
             self.hand.remove(card)
+            self.notify(StateRegion.HAND, None, card, False)
         elif card.location == CardLocation.FIELD:
             self.field.remove_card(card)
             
         self.graveyard.append(card)
         card.location = CardLocation.GRAVEYARD
+        self.notify(StateRegion.GRAVEYARD, len(self.graveyard) - 1, card, True)
     
     def banish_card(self, card: Card) -> None:
         if card.location == CardLocation.HAND:
             self.hand.remove(card)
+            self.notify(StateRegion.HAND, None, card, False)
         elif card.location == CardLocation.FIELD:
             self.field.remove_card(card)
         elif card.location == CardLocation.GRAVEYARD:
             self.graveyard.remove(card)
+            self.notify(StateRegion.GRAVEYARD, None, card, False)
             
         self.banished.append(card)
         card.location = CardLocation.BANISHED
+        self.notify(StateRegion.BANISHED, len(self.banished) - 1, card, True)
+    
+    def return_to_hand(self, card: Card) -> None:
+        if card.location == CardLocation.FIELD:
+            self.field.remove_card(card)
+        elif card.location == CardLocation.GRAVEYARD:
+            self.graveyard.remove(card)
+            self.notify(StateRegion.GRAVEYARD, None, card, False)
+        else:
+            return
+        
+        card.position = None
+        self.hand.append(card)
+        card.location = CardLocation.HAND
+        self.notify(StateRegion.HAND, None, card, True)
     
     def reset_turn_state(self) -> None:
         self.normal_summon_used = False
         self.can_conduct_battle_phase = True
         self.field.reset_turn_state()
     
+    def snapshot(self) -> tuple:
+        return (
+            self._life_points, self.has_lost, self.normal_summon_used, self.can_conduct_battle_phase,
+            tuple(self.hand), tuple(self.graveyard), tuple(self.banished), tuple(self.extra_deck),
+            self.field.get_state(), self.deck.get_state(),
+            tuple(card.get_state() for card in self.cards),
+        )
+    
+    def restore(self, snapshot: tuple) -> None:
+        (
+            self._life_points, self.has_lost, self.normal_summon_used, self.can_conduct_battle_phase,
+            hand, graveyard, banished, extra_deck, field_state, deck_state, card_states,
+        ) = snapshot
+        self.hand = list(hand)
+        self.graveyard = list(graveyard)
+        self.banished = list(banished)
+        self.extra_deck = list(extra_deck)
+        self.field.set_state(field_state)
+        self.deck.set_state(deck_state)
+        for card, state in zip(self.cards, card_states):
+            card.set_state(state)
+    
+    def clone(self, card_map: Dict[Card, Card]) -> "Player":
+        """
+        Copy this player for a cloned game.
+
+        `card_map` maps every card in the game to its copy; the copies owned
+        by this player are re-owned by the clone. Listeners are not copied.
+        """
+        player = Player.__new__(Player)
+        player.__dict__.update(self.__dict__)
+        player.state_listeners = []
+        player.available_actions = set()
+        player.cards = [card_map[card] for card in self.cards]
+        for card in player.cards:
+            card.owner = player
+        player.hand = [card_map[card] for card in self.hand]
+        player.graveyard = [card_map[card] for card in self.graveyard]
+        player.banished = [card_map[card] for card in self.banished]
+        player.extra_deck = [card_map[card] for card in self.extra_deck]
+        player.deck = self.deck.clone(card_map)
+        player.field = self.field.clone(player, card_map)
+        return player
+    
     def get_available_actions(self) -> Set[str]:
         self.available_actions.clear()
         return self.available_actions
@@ -128,7 +262,7 @@ class Player:
         return {
             "name": self.name,
             "life_points": self.life_points,
-            "deck_count": len(self.deck.main_deck),
+            "deck_count": self.deck.remaining_cards(),
             "hand": [card.to_dict() for card in self.hand],
             "field": self.field.to_dict(),
             "graveyard": [card.to_dict() for card in self.graveyard],
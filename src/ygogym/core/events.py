@@ -0,0 +1,147 @@
+from collections import deque
+from typing import Dict, List
+
+from ygogym.core.constants import CardLocation, GameEvent, SpellTrapPosition, StateRegion
+from ygogym.core.effects import Effect
+
+# Locations a card can trigger effects from, by the state region reporting its moves.
+REGION_LOCATIONS = {
+    StateRegion.HAND: CardLocation.HAND,
+    StateRegion.MONSTER_ZONE: CardLocation.FIELD,
+    StateRegion.SPELL_TRAP_ZONE: CardLocation.FIELD,
+    StateRegion.FIELD_SPELL_ZONE: CardLocation.FIELD,
+    StateRegion.GRAVEYARD: CardLocation.GRAVEYARD,
+    StateRegion.BANISHED: CardLocation.BANISHED,
+}
+SINGLE_EVENTS = tuple(GameEvent)
+
+
+class Event:
+    """Something that happened in a game: its type, the card involved and the player it happened to."""
+
+    __slots__ = ("type", "card", "player")
+
+    def __init__(self, type: GameEvent, card=None, player=None):
+        self.type = type
+        self.card = card
+        self.player = player
+
+    def __repr__(self) -> str:
+        return f"Event({self.type!r}, card={self.card!r})"
+
+
+class ChainLink:
+    __slots__ = ("card", "effect", "player", "trigger")
+
+    def __init__(self, card, effect: Effect, player, trigger: Event):
+        self.card = card
+        self.effect = effect
+        self.player = player
+        self.trigger = trigger
+
+
+class EventBus:
+    """
+    Dispatches game events to the cards that can react to them.
+
+    Cards subscribe to the events their effects trigger on when they enter a
+    location the effect works from (hand, field, graveyard or banished pile)
+    and unsubscribe when they leave, driven by the game's state notifications.
+    Finding who can respond to an event is then a dictionary lookup.
+
+    Emitted events are queued and handled at safe points by `process`: every
+    effect that triggers on an event becomes a chain link, the turn player's
+    first, and the chain resolves last in, first out. Events raised while a
+    chain resolves are handled once it has finished.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self._subscribers: Dict[GameEvent, Dict[object, None]] = {event: {} for event in SINGLE_EVENTS}
+        self._pending: deque = deque()
+        self._processing = False
+        self.chain: List[ChainLink] = []
+        game.add_state_listener(self._on_state_change)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        for subscribers in self._subscribers.values():
+            subscribers.clear()
+        for player in self.game.players:
+            field = player.field
+            for cards in (player.hand, field.monster_zones, field.spell_trap_zones, [field.field_spell], player.graveyard, player.banished):
+                for card in cards:
+                    if card is not None and card.trigger_mask:
+                        self.subscribe(card, card.location)
+
+    def subscribe(self, card, location: CardLocation) -> None:
+        for effect in card.effects:
+            if location in effect.locations:
+                for event in SINGLE_EVENTS:
+                    if effect.event & event:
+                        self._subscribers[event][card] = None
+
+    def unsubscribe(self, card) -> None:
+        for event in SINGLE_EVENTS:
+            if card.trigger_mask & event:
+                self._subscribers[event].pop(card, None)
+
+    def responders(self, event: GameEvent) -> List:
+        """Cards currently in a location from which they can react to `event`."""
+        return list(self._subscribers[event])
+
+    def _on_state_change(self, player, region, index, card, entered) -> None:
+        if region is None:
+            self._pending.clear()
+            self.rebuild()
+            return
+        if card is None or entered is None:
+            return
+        if card.trigger_mask:
+            location = REGION_LOCATIONS.get(region)
+            if location is not None:
+                if entered:
+                    self.subscribe(card, location)
+                else:
+                    self.unsubscribe(card)
+        if entered and region == StateRegion.GRAVEYARD:
+            self.emit(Event(GameEvent.SENT_TO_GRAVEYARD, card, player))
+
+    def emit(self, event: Event) -> None:
+        # Nothing is queued for events no card is listening for.
+        if self._subscribers[event.type]:
+            self._pending.append(event)
+
+    def process(self) -> None:
+        """Build and resolve a chain for every pending event, including events raised while resolving."""
+        if self._processing:
+            return
+        self._processing = True
+        try:
+            while self._pending:
+                event = self._pending.popleft()
+                self._build_chain(event)
+                while self.chain:
+                    self.game.resolve_chain_link(self.chain.pop())
+        finally:
+            self._processing = False
+
+    def _build_chain(self, event: Event) -> None:
+        game = self.game
+        turn_player = game.current_player
+        candidates = sorted(self._subscribers[event.type], key=lambda card: card.owner is not turn_player)
+        for card in candidates:
+            for effect in card.effects:
+                if not effect.event & event.type or card.location not in effect.locations:
+                    continue
+                if effect.activates_card and not self._can_activate(card):
+                    continue
+                if effect.applies(game, card.owner, card, event) and game.wants_to_activate(card, effect, event):
+                    if effect.activates_card:
+                        card.owner.activate_spell_trap(card.owner.field.spell_trap_zones.index(card))
+                    self.chain.append(ChainLink(card, effect, card.owner, event))
+
+    @staticmethod
+    def _can_activate(card) -> bool:
+        # Set Traps respond from the field, but not on the turn they were Set.
+        return card.position == SpellTrapPosition.FACE_DOWN and not card.set_this_turn
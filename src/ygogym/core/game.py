@@ -1,11 +1,32 @@
-from typing import List, Optional, Tuple, Dict, Any
+import time
+from typing import List, Optional, Tuple, Dict, Any, Callable
 
-from ygogym.core.constants import Phase, Action, CardLocation, MonsterPosition, SpellTrapPosition
-from ygogym.core.entities.player import Player
+import numpy as np
+
+from ygogym.core.actions import (
+    MAIN_PHASES, can_activate_set_trap, can_attack_with, can_be_normal_summoned,
+    can_change_position, can_flip_summon, tributes_required
+)
+from ygogym.core import battle
+from ygogym.core.battle import BattleOutcomes
+from ygogym.core.constants import (
+    Phase, Action, CardType, CardLocation, GameEvent, MonsterPosition, SpellTrapPosition, SpellType, TrapType, StateRegion
+)
+from ygogym.core.entities.player import Player, StateListener
+from ygogym.core.events import Event, EventBus
 from ygogym.core.entities.deck import Deck
+from ygogym.core.packed_state import pack_game, unpack_game
+from ygogym.core.phases import PhaseMachine
+from ygogym.core.profiling import ACTION_KEYS, PHASE_KEYS, Profiler
+from ygogym.core.zobrist import ZobristHash
+
+LINGERING_SPELL_TYPES = (SpellType.CONTINUOUS, SpellType.FIELD, SpellType.EQUIP)
+LINGERING_TRAP_TYPES = (TrapType.CONTINUOUS,)
 
 class Game:
-    def __init__(self, player1_deck: Deck, player2_deck: Deck, starting_player: int = 0):
+    def __init__(self, player1_deck: Deck, player2_deck: Deck, starting_player: int = 0, rng: Optional[np.random.Generator] = None):
+        # All randomness in the game is drawn from this generator, so a seeded one makes games reproducible.
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.player1 = Player(player1_deck, name="Player 1")
         self.player2 = Player(player2_deck, name="Player 2")
         self.players = [self.player1, self.player2]
@@ -16,6 +37,16 @@ class Game:
         self.current_phase = None
         self.game_over = False
         self.winner = None
+        self.state_listeners: List[StateListener] = []
+        self._zobrist: Optional[ZobristHash] = None
+        self.events = EventBus(self)
+        # Phase transitions, with their hooks and skip rules; clones share it.
+        self.phases = PhaseMachine()
+        # Called as response_policy(game, card, effect, event) to decide whether to activate a Set card
+        # in response to an event; every possible response is activated when unset.
+        self.response_policy: Optional[Callable[..., bool]] = None
+        # Records where rules time goes when set, see `ygogym.core.profiling`; clones share it.
+        self.profiler: Optional[Profiler] = None
         
     @property
     def current_player(self) -> Player:
@@ -25,39 +56,122 @@ class Game:
     def opponent(self) -> Player:
         return self.players[self.opponent_idx]
     
+    def add_state_listener(self, listener: StateListener) -> None:
+        """
+        Subscribe to changes of the game state.
+
+        Player and field changes are reported with the player they belong to;
+        phase and turn changes are reported as `StateRegion.PHASE` with no player.
+        """
+        self.state_listeners.append(listener)
+        for player in self.players:
+            player.state_listeners.append(listener)
+    
+    def remove_state_listener(self, listener: StateListener) -> None:
+        self.state_listeners.remove(listener)
+        for player in self.players:
+            player.state_listeners.remove(listener)
+    
+    def reset(self, starting_player: int = 0, rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Return to the state of a freshly built game, reusing every object.
+
+        The game keeps drawing from its current generator unless `rng` is
+        given. Listeners stay attached and are told that the whole state changed.
+        """
+        if rng is not None:
+            self.rng = rng
+        for player in self.players:
+            player.reset()
+        self.current_player_idx = starting_player
+        self.opponent_idx = 1 - starting_player
+        self.turn_count = 0
+        self.current_phase = None
+        self.game_over = False
+        self.winner = None
+        self._notify_restored()
+    
+    def track_zobrist(self, verify: bool = False) -> ZobristHash:
+        """Start maintaining `zobrist_key` incrementally; `verify` checks it against a full recompute on every read."""
+        if self._zobrist is None:
+            self._zobrist = ZobristHash(self, verify=verify)
+        self._zobrist.verify = verify
+        return self._zobrist
+    
+    @property
+    def zobrist_key(self) -> int:
+        """64-bit Zobrist key of the current state, tracked from the first read on."""
+        if self._zobrist is None:
+            self.track_zobrist()
+        return self._zobrist.key
+    
+    def _notify_phase(self) -> None:
+        for listener in self.state_listeners:
+            listener(None, StateRegion.PHASE, None, None, None)
+    
+    def _notify_restored(self) -> None:
+        for listener in self.state_listeners:
+            listener(None, None, None, None, None)
+    
+    def clone(self) -> "Game":
+        """
+        Copy the game for search or rollouts.
+
+        Card templates are shared and only per-game card state is copied, which
+        is much cheaper than `copy.deepcopy`. The clone gets its own generator
+        in the same state. Listeners are not copied.
+        """
+        card_map = {card: card.copy() for player in self.players for card in player.cards}
+        game = Game.__new__(Game)
+        game.__dict__.update(self.__dict__)
+        game.player1 = self.player1.clone(card_map)
+        game.player2 = self.player2.clone(card_map)
+        game.players = [game.player1, game.player2]
+        game.winner = game.players[self.players.index(self.winner)] if self.winner is not None else None
+        game.state_listeners = []
+        game._zobrist = None
+        game.events = EventBus(game)
+        bit_generator = type(self.rng.bit_generator)()
+        bit_generator.state = self.rng.bit_generator.state
+        game.rng = np.random.Generator(bit_generator)
+        return game
+    
+    def snapshot(self) -> tuple:
+        """Capture the game state, including the generator's, so it can later be rolled back in place with `restore`."""
+        return (
+            self.current_player_idx, self.opponent_idx, self.turn_count, self.current_phase,
+            self.game_over, self.winner, self.player1.snapshot(), self.player2.snapshot(),
+            self.rng.bit_generator.state,
+        )
+    
+    def restore(self, snapshot: tuple) -> None:
+        """Roll back to a snapshot taken from this game; listeners are told the whole state changed."""
+        (
+            self.current_player_idx, self.opponent_idx, self.turn_count, self.current_phase,
+            self.game_over, self.winner, player1_snapshot, player2_snapshot, rng_state,
+        ) = snapshot
+        self.rng.bit_generator.state = rng_state
+        self.player1.restore(player1_snapshot)
+        self.player2.restore(player2_snapshot)
+        self._notify_restored()
+    
+    def to_bytes(self) -> bytes:
+        """Compact fixed-layout encoding of the state, see `ygogym.core.packed_state`."""
+        return pack_game(self)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Game":
+        return unpack_game(data)
+    
     def start_game(self):
-        # Draw 6 cards for the current player and 5 for the opponent.
-        for i in range(len(self.players)):
-            if i == self.current_player_idx:
-                self.current_player.draw(6)
-            else:
-                self.opponent.draw(5)
-        
-        self.current_phase = Phase.DRAW_PHASE
+        for player in self.players:
+            player.deck.shuffle(self.rng)
+            player.draw(5)
         self.turn_count = 1
+        self.phases.enter(self, Phase.DRAW_PHASE)
         
     def next_phase(self) -> Phase:
-        phase_order = [
-            Phase.DRAW_PHASE,
-            Phase.STANDBY_PHASE,
-            Phase.MAIN_PHASE_1,
-            Phase.BATTLE_PHASE,
-            Phase.MAIN_PHASE_2,
-            Phase.END_PHASE
-        ]
-        
-        current_idx = phase_order.index(self.current_phase)
-        next_idx = (current_idx + 1) % len(phase_order)
-        
-        if next_idx == 0:
-            self.end_turn()
-            
-        self.current_phase = phase_order[next_idx]
-        
-        if self.current_phase == Phase.DRAW_PHASE:
-            self.current_player.draw()
-        
-        return self.current_phase
+        return self.phases.advance(self)
     
     def end_turn(self):
         self.current_player.reset_turn_state()
@@ -65,8 +179,228 @@ class Game:
         self.opponent_idx = 1 - self.current_player_idx
         self.turn_count += 1
         
+    def advance_to_main_phase(self) -> Phase:
+        """Move through the draw and standby phases to the current turn's first main phase."""
+        return self.phases.advance_to(self, Phase.MAIN_PHASE_1)
+    
+    def fast_forward(self, has_actions: Optional[Callable[..., bool]] = None) -> Phase:
+        """Pass every phase in which the turn player has nothing to decide, see `PhaseMachine.fast_forward`."""
+        return self.phases.fast_forward(self, has_actions)
+    
     def execute_action(self, action_type: Action, params: Dict[str, Any] = None) -> bool:
-        pass
+        if self.profiler is None:
+            return self._execute_action(action_type, params)
+        phase = self.current_phase
+        start = time.perf_counter()
+        result = self.profiler.call(ACTION_KEYS[action_type], self._execute_action, action_type, params)
+        self.profiler.add(PHASE_KEYS[phase], time.perf_counter() - start)
+        return result
+    
+    def _execute_action(self, action_type: Action, params: Optional[Dict[str, Any]]) -> bool:
+        handler = self._action_handlers.get(action_type)
+        if handler is None or self.game_over:
+            return False
+        result = handler(self, **(params or {}))
+        self.events.process()
+        self.check_game_over()
+        return result
+    
+    def _in_main_phase(self) -> bool:
+        return self.current_phase in MAIN_PHASES
+    
+    def _normal_summon(self, hand_index: int, position: MonsterPosition) -> bool:
+        return self._summon(hand_index, position, ())
+    
+    def _tribute_summon(self, hand_index: int, tributes: Tuple[int, ...], position: MonsterPosition) -> bool:
+        return self._summon(hand_index, position, tributes)
+    
+    def _summon(self, hand_index: int, position: MonsterPosition, tributes: Tuple[int, ...]) -> bool:
+        player = self.current_player
+        if not self._in_main_phase() or player.normal_summon_used or hand_index >= len(player.hand):
+            return False
+        card = player.hand[hand_index]
+        if not can_be_normal_summoned(card) or tributes_required(card) != len(tributes):
+            return False
+        if any(player.field.get_card_from_monster_zone(zone) is None for zone in tributes):
+            return False
+        
+        if not player.summon_monster(hand_index, position, list(tributes)):
+            return False
+        player.normal_summon_used = True
+        self.events.emit(Event(GameEvent.SUMMON, card, player))
+        return True
+    
+    def _flip_summon(self, zone_index: int) -> bool:
+        player = self.current_player
+        card = player.field.get_card_from_monster_zone(zone_index)
+        if not self._in_main_phase() or not can_flip_summon(card):
+            return False
+        card.set_position(MonsterPosition.FACE_UP_ATTACK)
+        player.notify_card(card)
+        self.trigger_effects(card, GameEvent.FLIP)
+        self.events.emit(Event(GameEvent.SUMMON, card, player))
+        return True
+    
+    def _change_position(self, zone_index: int) -> bool:
+        player = self.current_player
+        card = player.field.get_card_from_monster_zone(zone_index)
+        if not self._in_main_phase() or not can_change_position(card):
+            return False
+        if card.position == MonsterPosition.FACE_UP_ATTACK:
+            card.set_position(MonsterPosition.FACE_UP_DEFENSE)
+        else:
+            card.set_position(MonsterPosition.FACE_UP_ATTACK)
+        player.notify_card(card)
+        return True
+    
+    def _set_spell_trap(self, hand_index: int, card_type: CardType) -> bool:
+        player = self.current_player
+        if not self._in_main_phase() or hand_index >= len(player.hand):
+            return False
+        card = player.hand[hand_index]
+        if card.card_type != card_type:
+            return False
+        if card.is_spell() and card.spell_type == SpellType.FIELD and player.field.field_spell is not None:
+            player.send_to_graveyard(player.field.field_spell)
+        if not player.set_spell_trap(hand_index):
+            return False
+        card.set_this_turn = True
+        return True
+    
+    def _set_spell(self, hand_index: int) -> bool:
+        return self._set_spell_trap(hand_index, CardType.SPELL)
+    
+    def _set_trap(self, hand_index: int) -> bool:
+        return self._set_spell_trap(hand_index, CardType.TRAP)
+    
+    def _activate_spell(self, hand_index: Optional[int] = None, zone_index: Optional[int] = None, field_spell: bool = False) -> bool:
+        player = self.current_player
+        if not self._in_main_phase():
+            return False
+        
+        if hand_index is not None:
+            if hand_index >= len(player.hand) or not player.hand[hand_index].is_spell():
+                return False
+            card = player.hand[hand_index]
+            if card.spell_type == SpellType.FIELD and player.field.field_spell is not None:
+                player.send_to_graveyard(player.field.field_spell)
+            if not player.play_spell_trap(hand_index, SpellTrapPosition.FACE_UP):
+                return False
+        else:
+            card = player.field.field_spell if field_spell else player.field.get_card_from_spell_trap_zone(zone_index)
+            if card is None or not card.is_spell() or card.position != SpellTrapPosition.FACE_DOWN:
+                return False
+            card.set_position(SpellTrapPosition.FACE_UP)
+            player.notify_card(card)
+        
+        card.effect_activated_this_turn = True
+        self._resolve_spell_trap(player, card)
+        return True
+    
+    def _activate_trap(self, zone_index: int) -> bool:
+        player = self.current_player
+        card = player.field.get_card_from_spell_trap_zone(zone_index)
+        if self.current_phase not in MAIN_PHASES + (Phase.BATTLE_PHASE,) or not can_activate_set_trap(card):
+            return False
+        if not player.activate_spell_trap(zone_index):
+            return False
+        self._resolve_spell_trap(player, card)
+        return True
+    
+    def _resolve_spell_trap(self, player: Player, card) -> None:
+        self.trigger_effects(card, GameEvent.ACTIVATE)
+        self._finish_activation(player, card)
+    
+    def _finish_activation(self, player: Player, card) -> None:
+        # Cards that do not stay on the field go to the graveyard once resolved.
+        lingering = card.spell_type in LINGERING_SPELL_TYPES or card.trap_type in LINGERING_TRAP_TYPES
+        if not lingering and card.location == CardLocation.FIELD:
+            player.send_to_graveyard(card)
+    
+    def _attack(self, zone_index: int, target_index: Optional[int] = None) -> bool:
+        player, opponent = self.current_player, self.opponent
+        attacker = player.field.get_card_from_monster_zone(zone_index)
+        if self.current_phase != Phase.BATTLE_PHASE or not can_attack_with(attacker):
+            return False
+        if target_index is None:
+            if any(card is not None for card in opponent.field.monster_zones):
+                return False
+            target = None
+        else:
+            target = opponent.field.get_card_from_monster_zone(target_index)
+            if target is None:
+                return False
+        battle.attack(self, player, attacker, target)
+        return True
+    
+    def attack_outcomes(self) -> BattleOutcomes:
+        """Outcomes of every attack the player to act could declare, see `ygogym.core.battle.battle_outcomes`."""
+        return battle.attack_outcomes([self])[0]
+    
+    def _next_phase(self) -> bool:
+        if self.current_phase == Phase.MAIN_PHASE_1:
+            if self.phases.skips(self, Phase.BATTLE_PHASE):
+                return False
+        elif self.current_phase != Phase.BATTLE_PHASE:
+            return False
+        self.next_phase()
+        return True
+    
+    def _end_turn(self) -> bool:
+        if self.current_phase not in MAIN_PHASES + (Phase.BATTLE_PHASE,):
+            return False
+        self.phases.advance_to(self, Phase.MAIN_PHASE_1, next_turn=True)
+        return True
+    
+    _action_handlers = {
+        Action.NORMAL_SUMMON: _normal_summon,
+        Action.TRIBUTE_SUMMON: _tribute_summon,
+        Action.FLIP_SUMMON: _flip_summon,
+        Action.CHANGE_MONSTER_POSITION: _change_position,
+        Action.SET_SPELL: _set_spell,
+        Action.SET_TRAP: _set_trap,
+        Action.ACTIVATE_SPELL: _activate_spell,
+        Action.ACTIVATE_TRAP: _activate_trap,
+        Action.ATTACK: _attack,
+        Action.NEXT_PHASE: _next_phase,
+        Action.END_TURN: _end_turn,
+    }
+    
+    def trigger_effects(self, card, event: GameEvent, trigger=None) -> None:
+        """Resolve the effects of `card` that trigger on `event`, for the player who controls it."""
+        if not card.trigger_mask & event:
+            return
+        player = card.owner
+        for effect in card.effects:
+            if effect.event & event and effect.applies(self, player, card, trigger):
+                self._run_effect(effect, player, card, trigger)
+    
+    def wants_to_activate(self, card, effect, event) -> bool:
+        if not effect.activates_card or self.response_policy is None:
+            return True
+        return self.response_policy(self, card, effect, event)
+    
+    def resolve_chain_link(self, link) -> None:
+        card, effect = link.card, link.effect
+        if effect.activates_card:
+            # A Set card flips face-up as it is chained, and is negated if it left the field before resolving.
+            if card.location != CardLocation.FIELD:
+                return
+            self._run_effect(effect, link.player, card, link.trigger)
+            self._finish_activation(link.player, card)
+        else:
+            self._run_effect(effect, link.player, card, link.trigger)
+    
+    def _run_effect(self, effect, player: Player, card, trigger) -> None:
+        if self.profiler is None:
+            effect.operation(self, player, card, trigger)
+        else:
+            self.profiler.call(f"effect/{card.name}", effect.operation, self, player, card, trigger)
+    
+    def destroy(self, card) -> None:
+        owner = card.owner
+        owner.send_to_graveyard(card)
+        self.events.emit(Event(GameEvent.DESTROY, card, owner))
     
     def check_game_over(self) -> bool:
         if self.player1.has_lost:
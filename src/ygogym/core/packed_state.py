@@ -0,0 +1,216 @@
+import struct
+
+from ygogym.core.constants import FIELD_SIZE, CardLocation, MonsterPosition, Phase, SpellTrapPosition
+from ygogym.core.database import CardDatabase
+from ygogym.core.entities.card import Card
+from ygogym.core.entities.deck import Deck
+
+PACKED_STATE_VERSION = 1
+
+# version, current player, turn, phase, game over, winner (-1 for none)
+GAME_HEADER = struct.Struct("<BBHBBb")
+# life points, player flags, number of cards owned, then the length of each list in PLAYER_LISTS
+PLAYER_HEADER = struct.Struct("<iBB6B")
+# card index, attack, defense and level modifiers of a card with non-zero modifiers
+MODIFIER_ENTRY = struct.Struct("<Bhhh")
+
+# Lists of a player's cards, stored as indices into `Player.cards` in this order.
+PLAYER_LISTS = (
+    lambda player: player.deck.main_deck,
+    lambda player: player.deck.extra_deck,
+    lambda player: player.hand,
+    lambda player: player.graveyard,
+    lambda player: player.banished,
+    lambda player: player.extra_deck,
+)
+
+PLAYER_FLAGS = ("has_lost", "normal_summon_used", "can_conduct_battle_phase")
+CARD_FLAGS = (
+    "can_attack", "can_change_position", "can_activate_effect",
+    "summoned_this_turn", "position_changed_this_turn", "effect_activated_this_turn", "set_this_turn",
+)
+
+# Per-card state word: bits 0-1 position, bits 2-4 location, bits 5-11 CARD_FLAGS.
+LOCATION_SHIFT = 2
+FLAGS_SHIFT = 5
+
+EMPTY_ZONE = 0xFF
+ZONE_COUNT = 2 * FIELD_SIZE + 1
+
+PHASES = list(Phase)
+LOCATIONS = list(CardLocation)
+MONSTER_POSITIONS = list(MonsterPosition)
+SPELL_TRAP_POSITIONS = list(SpellTrapPosition)
+
+
+def _codes(*member_lists) -> dict:
+    codes = {None: 0}
+    for members in member_lists:
+        codes.update({member: i + 1 for i, member in enumerate(members)})
+    return codes
+
+
+# Monster and spell/trap positions share codes; the card type tells them apart when unpacking.
+POSITION_CODES = _codes(MONSTER_POSITIONS, SPELL_TRAP_POSITIONS)
+LOCATION_CODES = _codes(LOCATIONS)
+PHASE_CODES = _codes(PHASES)
+
+
+def _member(members: list, code: int):
+    return None if code == 0 else members[code - 1]
+
+
+def _pack_flags(obj, names) -> int:
+    bits = 0
+    for bit, name in enumerate(names):
+        if getattr(obj, name):
+            bits |= 1 << bit
+    return bits
+
+
+def _unpack_flags(obj, names, bits: int) -> None:
+    for bit, name in enumerate(names):
+        setattr(obj, name, bool(bits >> bit & 1))
+
+
+def _pack_player(player) -> bytes:
+    cards = player.cards
+    if len(cards) > EMPTY_ZONE:
+        raise ValueError(f"Cannot pack a player with more than {EMPTY_ZONE} cards")
+    slots = {card: i for i, card in enumerate(cards)}
+
+    rows = []
+    states = []
+    modifiers = []
+    for i, card in enumerate(cards):
+        if card.template.index < 0:
+            raise ValueError(f"Card {card.id} is not in the card database and cannot be packed")
+        if card._counters:
+            raise ValueError(f"Card {card.id} holds counters, which the packed encoding does not store")
+        rows.append(card.template.index)
+        # Spelled out rather than looping over CARD_FLAGS, this is the hot path of packing.
+        states.append(
+            POSITION_CODES[card.position]
+            | LOCATION_CODES[card.location] << LOCATION_SHIFT
+            | (
+                card.can_attack
+                | card.can_change_position << 1
+                | card.can_activate_effect << 2
+                | card.summoned_this_turn << 3
+                | card.position_changed_this_turn << 4
+                | card.effect_activated_this_turn << 5
+                | card.set_this_turn << 6
+            ) << FLAGS_SHIFT
+        )
+        if card.attack_modifier or card.defense_modifier or card.level_modifier:
+            modifiers.append(MODIFIER_ENTRY.pack(i, card.attack_modifier, card.defense_modifier, card.level_modifier))
+
+    lists = [[slots[card] for card in get_list(player)] for get_list in PLAYER_LISTS]
+    field = player.field
+    zones = [
+        EMPTY_ZONE if card is None else slots[card]
+        for card in field.monster_zones + field.spell_trap_zones + [field.field_spell]
+    ]
+    indices = [index for cards_in_list in lists for index in cards_in_list] + zones
+
+    return b"".join((
+        PLAYER_HEADER.pack(player.life_points, _pack_flags(player, PLAYER_FLAGS), len(cards), *map(len, lists)),
+        struct.pack(f"<{len(cards)}H", *rows),
+        struct.pack(f"<{len(cards)}H", *states),
+        bytes(indices),
+        bytes((len(modifiers),)),
+        *modifiers,
+    ))
+
+
+def _unpack_player(player, data: bytes, offset: int) -> int:
+    life_points, flags, card_count, *list_lengths = PLAYER_HEADER.unpack_from(data, offset)
+    offset += PLAYER_HEADER.size
+    rows = struct.unpack_from(f"<{card_count}H", data, offset)
+    offset += 2 * card_count
+    states = struct.unpack_from(f"<{card_count}H", data, offset)
+    offset += 2 * card_count
+
+    database = CardDatabase.get()
+    cards = []
+    for row, state in zip(rows, states):
+        card = Card(database.template_at(row))
+        card.owner = player
+        positions = MONSTER_POSITIONS if card.is_monster() else SPELL_TRAP_POSITIONS
+        card.position = _member(positions, state & 0b11)
+        card.location = _member(LOCATIONS, state >> LOCATION_SHIFT & 0b111)
+        _unpack_flags(card, CARD_FLAGS, state >> FLAGS_SHIFT)
+        cards.append(card)
+
+    lists = []
+    for length in list_lengths:
+        lists.append([cards[i] for i in data[offset:offset + length]])
+        offset += length
+    zones = [None if i == EMPTY_ZONE else cards[i] for i in data[offset:offset + ZONE_COUNT]]
+    offset += ZONE_COUNT
+
+    modifier_count = data[offset]
+    offset += 1
+    for _ in range(modifier_count):
+        i, attack, defense, level = MODIFIER_ENTRY.unpack_from(data, offset)
+        offset += MODIFIER_ENTRY.size
+        cards[i].attack_modifier, cards[i].defense_modifier, cards[i].level_modifier = attack, defense, level
+
+    main_deck, extra_deck, player.hand, player.graveyard, player.banished, player.extra_deck = lists
+    player.cards = cards
+    # Cards that already left the main deck go above the top pointer, so Player.reset finds them again.
+    in_deck = set(main_deck + extra_deck)
+    drawn = [card for card in cards if card not in in_deck]
+    player.deck = Deck.from_cards(drawn + main_deck, extra_deck)
+    player.deck.top = len(drawn)
+    player.field.monster_zones = zones[:FIELD_SIZE]
+    player.field.spell_trap_zones = zones[FIELD_SIZE:2 * FIELD_SIZE]
+    player.field.field_spell = zones[-1]
+    player._life_points = life_points
+    _unpack_flags(player, PLAYER_FLAGS, flags)
+    return offset
+
+
+def pack_game(game) -> bytes:
+    """
+    Pack the game state into a compact byte string.
+
+    Cards are stored as uint16 card database rows with one 16-bit word of
+    position, location and turn flags each; hands, piles and zones are byte
+    indices into the owner's cards. The layout only depends on the two decks,
+    so equal states give equal bytes and the result can be used directly as a
+    transposition table key or stored in a replay buffer.
+    """
+    winner = -1 if game.winner is None else game.players.index(game.winner)
+    return b"".join((
+        GAME_HEADER.pack(
+            PACKED_STATE_VERSION, game.current_player_idx, game.turn_count,
+            PHASE_CODES[game.current_phase], game.game_over, winner,
+        ),
+        _pack_player(game.player1),
+        _pack_player(game.player2),
+    ))
+
+
+def unpack_game(data: bytes):
+    """Rebuild a game from `pack_game` output. The new game has no listeners attached."""
+    from ygogym.core.game import Game
+
+    version, current_player_idx, turn_count, phase, game_over, winner = GAME_HEADER.unpack_from(data, 0)
+    if version != PACKED_STATE_VERSION:
+        raise ValueError(f"Unsupported packed game state version {version}")
+
+    game = Game(Deck.from_cards([]), Deck.from_cards([]), starting_player=current_player_idx)
+    offset = GAME_HEADER.size
+    for player in game.players:
+        offset = _unpack_player(player, data, offset)
+    if offset != len(data):
+        raise ValueError(f"Packed game state has {len(data) - offset} trailing bytes")
+
+    game.turn_count = turn_count
+    game.current_phase = _member(PHASES, phase)
+    game.game_over = bool(game_over)
+    game.winner = None if winner < 0 else game.players[winner]
+    # The lists were replaced without notifications, so listeners such as the event bus resync here.
+    game._notify_restored()
+    return game
@@ -0,0 +1,120 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ygogym.core.actions import can_enter_battle_phase
+from ygogym.core.constants import GameEvent, Phase
+from ygogym.core.events import Event
+from ygogym.core.profiling import ENTER_KEYS
+
+PHASE_ORDER = (
+    Phase.DRAW_PHASE,
+    Phase.STANDBY_PHASE,
+    Phase.MAIN_PHASE_1,
+    Phase.BATTLE_PHASE,
+    Phase.MAIN_PHASE_2,
+    Phase.END_PHASE,
+)
+# phase -> (phase that follows it, whether moving on passes the turn)
+TRANSITIONS: Dict[Phase, Tuple[Phase, bool]] = {
+    phase: (PHASE_ORDER[(i + 1) % len(PHASE_ORDER)], i + 1 == len(PHASE_ORDER))
+    for i, phase in enumerate(PHASE_ORDER)
+}
+# Phases in which the turn player makes decisions; the others pass without input.
+DECISION_PHASES = frozenset((Phase.MAIN_PHASE_1, Phase.BATTLE_PHASE, Phase.MAIN_PHASE_2))
+
+# Called as hook(game) and rule(game)
+PhaseHook = Callable[..., None]
+SkipRule = Callable[..., bool]
+
+
+def _draw_for_turn(game) -> None:
+    # The player going first does not draw on the first turn.
+    if game.turn_count > 1:
+        game.current_player.draw()
+
+
+def _no_battle_phase(game) -> bool:
+    # No Battle Phase on the first turn, or when an effect has taken it away.
+    return not can_enter_battle_phase(game)
+
+
+class PhaseMachine:
+    """
+    Moves a game through its phases and turns.
+
+    Transitions come from the precomputed `TRANSITIONS` table. Each phase
+    has enter and exit hooks, run as the phase begins and ends, and skip
+    rules: a phase any of whose rules holds is passed over entirely, without
+    hooks or notifications. The defaults draw a card on entering the Draw
+    Phase (except on the first turn) and skip the Battle Phase when it
+    cannot be conducted. The phase and turn themselves live on the game, so
+    one machine can drive any number of games.
+    """
+
+    __slots__ = ("enter_hooks", "exit_hooks", "skip_rules")
+
+    def __init__(self):
+        self.enter_hooks: Dict[Phase, List[PhaseHook]] = {phase: [] for phase in PHASE_ORDER}
+        self.exit_hooks: Dict[Phase, List[PhaseHook]] = {phase: [] for phase in PHASE_ORDER}
+        self.skip_rules: Dict[Phase, List[SkipRule]] = {phase: [] for phase in PHASE_ORDER}
+        self.enter_hooks[Phase.DRAW_PHASE].append(_draw_for_turn)
+        self.skip_rules[Phase.BATTLE_PHASE].append(_no_battle_phase)
+
+    def skips(self, game, phase: Phase) -> bool:
+        rules = self.skip_rules[phase]
+        return bool(rules) and any(rule(game) for rule in rules)
+
+    def enter(self, game, phase: Phase) -> None:
+        """Make `phase` the current phase, run its enter hooks and let cards react to the change."""
+        if game.profiler is not None:
+            start = time.perf_counter()
+            self._enter(game, phase)
+            game.profiler.add(ENTER_KEYS[phase], time.perf_counter() - start)
+        else:
+            self._enter(game, phase)
+
+    def _enter(self, game, phase: Phase) -> None:
+        game.current_phase = phase
+        game._notify_phase()
+        for hook in self.enter_hooks[phase]:
+            hook(game)
+        game.events.emit(Event(GameEvent.PHASE_CHANGE, player=game.current_player))
+        game.events.process()
+
+    def advance(self, game) -> Phase:
+        """Leave the current phase for the next one that is not skipped, passing the turn after the End Phase."""
+        for hook in self.exit_hooks[game.current_phase]:
+            hook(game)
+        phase, ends_turn = TRANSITIONS[game.current_phase]
+        if ends_turn:
+            game.end_turn()
+        while self.skips(game, phase):
+            phase, ends_turn = TRANSITIONS[phase]
+            if ends_turn:
+                game.end_turn()
+        self.enter(game, phase)
+        return phase
+
+    def advance_to(self, game, phase: Phase, next_turn: bool = False) -> Phase:
+        """Advance until `phase` is reached, of the next turn if `next_turn` is set, or the game is over."""
+        turn = game.turn_count
+        while not game.check_game_over():
+            if game.current_phase == phase and (not next_turn or game.turn_count != turn):
+                break
+            self.advance(game)
+        return game.current_phase
+
+    def fast_forward(self, game, has_actions: Optional[Callable[..., bool]] = None) -> Phase:
+        """
+        Advance through every phase in which the turn player has nothing to decide.
+
+        Phases outside `DECISION_PHASES` always pass. With `has_actions`,
+        called as has_actions(game), decision phases in which it returns
+        False pass too, such as a Battle Phase without an attack or a main
+        phase in which ending it is the only option.
+        """
+        while not game.check_game_over():
+            if game.current_phase in DECISION_PHASES and (has_actions is None or has_actions(game)):
+                break
+            self.advance(game)
+        return game.current_phase
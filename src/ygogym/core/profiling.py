@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ygogym.core.constants import Action, Phase
+
+# Per key: calls, seconds, allocation samples, then the summed net bytes, peak bytes and net blocks of those samples.
+CALLS, SECONDS, SAMPLES, NET_BYTES, PEAK_BYTES, NET_BLOCKS = range(6)
+
+ACTION_KEYS = {action: f"action/{action.name}" for action in Action}
+PHASE_KEYS = {phase: f"phase/{phase.name}" for phase in Phase}
+PHASE_KEYS[None] = "phase/NONE"
+ENTER_KEYS = {phase: f"enter/{phase.name}" for phase in Phase}
+
+SUMMARY_DTYPE = np.dtype([
+    ("key", "U64"),
+    ("calls", np.int64),
+    ("seconds", np.float64),
+    ("mean_us", np.float64),
+    ("samples", np.int64),
+    ("mean_net_bytes", np.float64),
+    ("mean_peak_bytes", np.float64),
+    ("mean_net_blocks", np.float64),
+])
+
+
+class Profiler:
+    """
+    Wall time and call counts of the engine's hot paths, by key.
+
+    Attach one with `Game.profiler` or `YGOEnv.set_profiler`; when none is
+    attached the instrumented paths cost a single attribute check. Keys are
+    "env/reset", "env/step", "env/encode" and "env/mask" for env methods,
+    "action/<Action>" for `Game.execute_action`, "phase/<Phase>" for the
+    actions taken in each phase, "enter/<Phase>" for entering a phase (draw,
+    hooks and the effects it sets off) and "effect/<card name>" for effect
+    handlers. Times are inclusive: "env/step" contains the action it
+    executes, and an END_TURN in Main Phase 1 counts towards
+    "phase/MAIN_PHASE_1" as well as the "enter/..." of the phases it passes.
+
+    With `trace_allocations`, tracemalloc runs and every `sample_every`-th
+    outermost call of each key records its net and peak traced bytes and
+    its net change in allocated blocks. Tracing slows everything down, so
+    only enable it to find out where memory goes.
+    """
+
+    def __init__(self, trace_allocations: bool = False, sample_every: int = 100):
+        self.trace_allocations = trace_allocations
+        self.sample_every = sample_every
+        self.stats: Dict[str, List[float]] = {}
+        self._depth = 0
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _entry(self, key: str) -> List[float]:
+        entry = self.stats.get(key)
+        if entry is None:
+            entry = self.stats[key] = [0, 0.0, 0, 0, 0, 0]
+        return entry
+
+    def add(self, key: str, seconds: float, calls: int = 1) -> None:
+        entry = self._entry(key)
+        entry[CALLS] += calls
+        entry[SECONDS] += seconds
+
+    def call(self, key: str, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs), recording it under `key`."""
+        entry = self._entry(key)
+        sample = self.trace_allocations and self._depth == 0 and entry[CALLS] % self.sample_every == 0
+        if sample:
+            tracemalloc.reset_peak()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            start_blocks = sys.getallocatedblocks()
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            entry[SECONDS] += time.perf_counter() - start
+            entry[CALLS] += 1
+            self._depth -= 1
+            if sample:
+                current, peak = tracemalloc.get_traced_memory()
+                entry[SAMPLES] += 1
+                entry[NET_BYTES] += current - start_bytes
+                entry[PEAK_BYTES] += peak - start_bytes
+                entry[NET_BLOCKS] += sys.getallocatedblocks() - start_blocks
+
+    def clear(self) -> None:
+        self.stats.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Totals and means per key, slowest first."""
+        return {str(row["key"]): {name: row[name].item() for name in SUMMARY_DTYPE.names[1:]} for row in self.as_array()}
+
+    def as_array(self) -> np.ndarray:
+        """The summary as a structured array with fields of SUMMARY_DTYPE, slowest first."""
+        rows = []
+        for key, entry in self.stats.items():
+            calls, seconds, samples = entry[CALLS], entry[SECONDS], entry[SAMPLES]
+            per_sample = 1.0 / samples if samples else 0.0
+            rows.append((
+                key, calls, seconds, seconds / calls * 1e6 if calls else 0.0, samples,
+                entry[NET_BYTES] * per_sample, entry[PEAK_BYTES] * per_sample, entry[NET_BLOCKS] * per_sample,
+            ))
+        table = np.array(rows, dtype=SUMMARY_DTYPE)
+        return table[np.argsort(-table["seconds"], kind="stable")]
+
+    def report(self, limit: Optional[int] = None) -> str:
+        lines = [f"{'key':<40} {'calls':>10} {'total s':>10} {'mean us':>10}"]
+        for row in self.as_array()[:limit]:
+            lines.append(f"{row['key']:<40} {row['calls']:>10} {row['seconds']:>10.3f} {row['mean_us']:>10.1f}")
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """Write the raw counters as JSON, e.g. one file per worker process; see `load`."""
+        with open(path, "w") as f:
+            json.dump({"pid": os.getpid(), "stats": self.stats}, f)
+
+    @classmethod
+    def load(cls, paths: Iterable[str]) -> "Profiler":
+        """Merge the counters dumped by several profilers, e.g. all workers of a run."""
+        merged = cls()
+        for path in paths:
+            with open(path) as f:
+                stats = json.load(f)["stats"]
+            for key, values in stats.items():
+                entry = merged._entry(key)
+                for i, value in enumerate(values):
+                    entry[i] += value
+        return merged
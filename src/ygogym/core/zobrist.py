@@ -0,0 +1,156 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ygogym.core.constants import FIELD_SIZE, StateRegion
+from ygogym.core.database import CardDatabase
+from ygogym.core.packed_state import PHASE_CODES, POSITION_CODES
+
+ZOBRIST_SEED = 20240601
+MASK64 = (1 << 64) - 1
+
+# Zone slots are hashed by their content: (player, slot, card row, position) has its own key.
+ZONE_SLOTS = 2 * FIELD_SIZE + 1
+ZONE_OFFSETS = {
+    StateRegion.MONSTER_ZONE: 0,
+    StateRegion.SPELL_TRAP_ZONE: FIELD_SIZE,
+    StateRegion.FIELD_SPELL_ZONE: 2 * FIELD_SIZE,
+}
+POSITION_COUNT = 1 + max(POSITION_CODES.values())
+
+# Piles are hashed as multisets: the n-th copy of a card in a pile mixes n into the pile's key for that card.
+PILE_REGIONS = (StateRegion.HAND, StateRegion.GRAVEYARD, StateRegion.BANISHED, StateRegion.DECK)
+PILE_INDEX = {region: i for i, region in enumerate(PILE_REGIONS)}
+
+
+def _mix(x: int) -> int:
+    # splitmix64 finalizer
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+@lru_cache(maxsize=None)
+def zobrist_tables(rows: int, seed: int = ZOBRIST_SEED) -> Tuple[List[int], List[int], List[int]]:
+    """Random keys for zone contents, pile contents and the two players' LP and turn state."""
+    rng = np.random.default_rng(seed)
+    def draw(size: int) -> List[int]:
+        return rng.integers(0, 1 << 64, size=size, dtype=np.uint64).tolist()
+    return draw(2 * ZONE_SLOTS * rows * POSITION_COUNT), draw(2 * len(PILE_REGIONS) * rows), draw(4)
+
+
+class ZobristHash:
+    """
+    64-bit Zobrist key of a game, kept up to date from state notifications.
+
+    Each change to a zone, pile, LP total or the phase updates the key in
+    O(1). The key covers which card is in which zone and position, the
+    contents of each hand, deck, graveyard and banished pile (regardless of
+    order), both LP totals, the phase, the turn and the player to move.
+    Per-turn flags are not part of it; use `Game.to_bytes` when two states
+    must match exactly.
+
+    With `verify` set, reading `key` checks it against a from-scratch
+    recomputation.
+    """
+
+    def __init__(self, game=None, seed: int = ZOBRIST_SEED, verify: bool = False):
+        self.seed = seed
+        self.verify = verify
+        self.rows = len(CardDatabase.get())
+        self.zone_keys, self.pile_keys, self.state_keys = zobrist_tables(self.rows, seed)
+        self._game = None
+        self.attach(game)
+
+    def attach(self, game) -> None:
+        """Track `game` from now on; pass None to stop tracking."""
+        if self._game is not None:
+            self._game.remove_state_listener(self._on_state_change)
+        self._game = game
+        if game is not None:
+            game.add_state_listener(self._on_state_change)
+            self._rebuild()
+
+    @property
+    def key(self) -> int:
+        if self.verify:
+            expected = self._scan(self._game)[0]
+            if expected != self._key:
+                raise AssertionError(f"Incremental Zobrist key {self._key:#018x} differs from a full recompute {expected:#018x}")
+        return self._key
+
+    def _rebuild(self) -> None:
+        self._key, self._slots, self._counts, self._life_points, self._phase = self._scan(self._game)
+
+    def _scan(self, game) -> tuple:
+        key = 0
+        slots = [0] * (2 * ZONE_SLOTS)
+        counts: Dict[Tuple[int, int, int], int] = {}
+        life_points = [0, 0]
+        for player_idx, player in enumerate(game.players):
+            field = player.field
+            for slot, card in enumerate(field.monster_zones + field.spell_trap_zones + [field.field_spell]):
+                slots[player_idx * ZONE_SLOTS + slot] = self._slot_key(player_idx, slot, card)
+                key ^= slots[player_idx * ZONE_SLOTS + slot]
+            for region, cards in zip(PILE_REGIONS, (player.hand, player.graveyard, player.banished, player.deck.main_deck)):
+                for card in cards:
+                    key ^= self._pile_key(counts, player_idx, PILE_INDEX[region], card.template.index, True)
+            life_points[player_idx] = self._life_points_key(player_idx, player.life_points)
+            key ^= life_points[player_idx]
+        phase = self._phase_key(game)
+        return key ^ phase, slots, counts, life_points, phase
+
+    def _slot_key(self, player_idx: int, slot: int, card) -> int:
+        if card is None:
+            return 0
+        row = card.template.index
+        return self.zone_keys[((player_idx * ZONE_SLOTS + slot) * self.rows + row) * POSITION_COUNT + POSITION_CODES[card.position]]
+
+    def _pile_key(self, counts: dict, player_idx: int, pile: int, row: int, entered: bool) -> int:
+        count_key = (player_idx, pile, row)
+        count = counts.get(count_key, 0)
+        if not entered:
+            count -= 1
+        counts[count_key] = count + 1 if entered else count
+        return _mix(self.pile_keys[(player_idx * len(PILE_REGIONS) + pile) * self.rows + row] ^ count)
+
+    def _life_points_key(self, player_idx: int, life_points: int) -> int:
+        return _mix(self.state_keys[player_idx] ^ (life_points & MASK64))
+
+    def _phase_key(self, game) -> int:
+        phase = PHASE_CODES[game.current_phase] | game.current_player_idx << 3 | game.turn_count << 4
+        return _mix(self.state_keys[2] ^ phase)
+
+    def _on_state_change(self, player, region, index, card, entered) -> None:
+        if region is None:
+            self._rebuild()
+            return
+        if region == StateRegion.PHASE:
+            phase = self._phase_key(self._game)
+            self._key ^= self._phase ^ phase
+            self._phase = phase
+            return
+
+        player_idx = 0 if player is self._game.players[0] else 1
+        if region in ZONE_OFFSETS:
+            # Notifications arrive after the change, so the slot is rehashed from its current content.
+            slot = ZONE_OFFSETS[region] + index
+            field = player.field
+            if region == StateRegion.MONSTER_ZONE:
+                current = field.monster_zones[index]
+            elif region == StateRegion.SPELL_TRAP_ZONE:
+                current = field.spell_trap_zones[index]
+            else:
+                current = field.field_spell
+            slot_key = self._slot_key(player_idx, slot, current)
+            self._key ^= self._slots[player_idx * ZONE_SLOTS + slot] ^ slot_key
+            self._slots[player_idx * ZONE_SLOTS + slot] = slot_key
+        elif region in PILE_INDEX:
+            if entered is not None:
+                self._key ^= self._pile_key(self._counts, player_idx, PILE_INDEX[region], card.template.index, entered)
+        elif region == StateRegion.LIFE_POINTS:
+            life_points = self._life_points_key(player_idx, player.life_points)
+            self._key ^= self._life_points[player_idx] ^ life_points
+            self._life_points[player_idx] = life_points
@@ -3,130 +3,168 @@ import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 from gym import spaces
 
+from ygogym.core.actions import NUM_ACTIONS, LegalActionGenerator, decode_action
 from ygogym.core.game import Game
 from ygogym.core.entities.deck import Deck
+from ygogym.core.profiling import Profiler
 from ygogym.core.constants import Action, Phase, MonsterPosition, SpellTrapPosition
+from ygogym.observation import ObservationEncoder, OBSERVATION_SIZE, CARD_FEATURES
+from ygogym.rendering import ImageRenderer, render_text
 
 class YGOEnv(gym.Env):
-    metadata = {'render.modes': ['human']}
+    """
+    Single game environment.
+
+    Observations and rewards are from the point of view of the player whose
+    turn it is when they are returned, so one env can be used for self-play.
+    """
+
+    metadata = {'render_modes': ['human', 'ansi', 'rgb_array'], 'render_fps': 4}
     
-    def __init__(self, agent_deck_path: str, opponent_deck_path: str):
+    def __init__(
+        self, agent_deck_path: str, opponent_deck_path: str, fast_forward: bool = False, render_mode: Optional[str] = None
+    ):
         super(YGOEnv, self).__init__()
+        if render_mode is not None and render_mode not in self.metadata['render_modes']:
+            raise ValueError(f"Unsupported render mode: {render_mode}, expected one of {self.metadata['render_modes']}")
+        # 'human' prints the board after every reset and step; the other modes return frames from render().
+        self.render_mode = render_mode
         
+        self.agent_deck_path = agent_deck_path
+        self.opponent_deck_path = opponent_deck_path
         self.agent_deck = Deck.from_deck_list(agent_deck_path)
         self.opponent_deck = Deck.from_deck_list(opponent_deck_path)
         self.game = None
+        # Pass phases in which the player to act has no choice but to move on, instead of returning them as steps.
+        self.fast_forward = fast_forward
+        # A `TrajectoryWriter` receiving every step, and the id its rows are recorded under.
+        self.recorder = None
+        self.episode_id = 0
+        self.profiler = None
+        # Built on the first rgb_array frame
+        self.image_renderer = None
         
-        self.action_space = spaces.Discrete(1)
+        self.action_space = spaces.Discrete(NUM_ACTIONS)
         
-        self.observation_space = spaces.Dict({})
+        self.observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(OBSERVATION_SIZE,), dtype=np.float32)
         
-    def reset(self):
-        self.game = Game(self.agent_deck, self.opponent_deck)
-        self.game.start_game()
-        return self._get_observation()
+        self.encoder = ObservationEncoder()
+        self.action_generator = LegalActionGenerator()
+        self._card_features = np.zeros(CARD_FEATURES, dtype=np.float32)
     
-    def step(self, action: int) -> Tuple[Dict, float, bool, Dict]:
-        pass
+    def bind_buffers(self, observation: np.ndarray, action_mask: np.ndarray) -> None:
+        """Write observations and action masks into caller-owned arrays, e.g. rows of a batch."""
+        self.encoder.bind(observation)
+        self.action_generator.bind(action_mask)
+        
+    def set_profiler(self, profiler: Optional[Profiler]) -> None:
+        """Record env and rules timings into `profiler` from now on, see `ygogym.core.profiling`; None stops."""
+        self.profiler = profiler
+        if self.game is not None:
+            self.game.profiler = profiler
     
-    def render(self, mode='human'):
-        if mode == 'human':
-            game_state = self.game.to_dict()
-            print(f"Turn {game_state['turn_count']}, Phase: {game_state['current_phase']}")
-            print(f"Current Player: {self.game.current_player.name}")
-            
-            print(f"\nPlayer 2 (LP: {self.game.player2.life_points}) - Hand: {len(self.game.player2.hand)} - Deck: {self.game.player2.deck.remaining_cards()}")
-            
-            if self.game.player2.hand:
-                print("\nHand:")
-                print("┌" + "───────────────┬" * (len(self.game.player2.hand) - 1) + "───────────────┐")
-                self._print_card_row(self.game.player2.hand)
-                print("└" + "───────────────┴" * (len(self.game.player2.hand) - 1) + "───────────────┘")
-
-            self._print_field_zone("Field Spell", self.game.player2.field.field_spell)
-            print("┌───────────────┬───────────────┬───────────────┬───────────────┬───────────────┐")
-            self._print_card_row(self.game.player2.field.spell_trap_zones)
-            print("├───────────────┼───────────────┼───────────────┼───────────────┼───────────────┤")
-            self._print_card_row(self.game.player2.field.monster_zones)
-            print("└───────────────┴───────────────┴───────────────┴───────────────┴───────────────┘")
-            
-            # Center field
-            print("\n" + "─" * 90 + "\n")
-            
-            print("┌───────────────┬───────────────┬───────────────┬───────────────┬───────────────┐")
-            self._print_card_row(self.game.player1.field.monster_zones)
-            print("├───────────────┼───────────────┼───────────────┼───────────────┼───────────────┤")
-            self._print_card_row(self.game.player1.field.spell_trap_zones)
-            print("└───────────────┴───────────────┴───────────────┴───────────────┴───────────────┘")
-            self._print_field_zone("Field Spell", self.game.player1.field.field_spell)
-            
-            print(f"\nPlayer 1 (LP: {self.game.player1.life_points}) - Hand: {len(self.game.player1.hand)} - Deck: {self.game.player1.deck.remaining_cards()}")
-            
-            if self.game.player1.hand:
-                print("\nHand:")
-                print("┌" + "───────────────┬" * (len(self.game.player1.hand) - 1) + "───────────────┐")
-                self._print_card_row(self.game.player1.hand)
-                print("└" + "───────────────┴" * (len(self.game.player1.hand) - 1) + "───────────────┘")
+    def reset(self, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None, starting_player: int = 0):
+        """Start a new game; `starting_player` may also be given as options["starting_player"]."""
+        if options is not None:
+            starting_player = options.get("starting_player", starting_player)
+        if self.profiler is not None:
+            return self.profiler.call("env/reset", self._reset, seed, starting_player)
+        return self._reset(seed, starting_player)
+    
+    def _reset(self, seed: Optional[int], starting_player: int):
+        # Seeds self.np_random, which the game draws all its randomness from.
+        super().reset(seed=seed)
+        
+        # The game is built once and reset in place for later episodes.
+        if self.game is None:
+            self.game = Game(self.agent_deck, self.opponent_deck, starting_player=starting_player, rng=self.np_random)
+            self.game.profiler = self.profiler
+            self.encoder.attach(self.game)
+            self.action_generator.attach(self.game)
+        else:
+            self.game.reset(starting_player=starting_player, rng=self.np_random)
+        self.game.start_game()
+        self._advance()
+        if self.recorder is not None:
+            self.episode_id = self.recorder.new_episode()
+        if self.render_mode == 'human':
+            self.render()
+        return self._get_observation(), {"current_player": self.game.current_player_idx}
     
-    def _print_card_row(self, cards):
-        top_row = []
-        bottom_row = []
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        if self.profiler is not None:
+            return self.profiler.call("env/step", self._step, action)
+        return self._step(action)
+    
+    def _step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        acting_player = self.game.current_player
+        acting_idx = self.game.current_player_idx
+        if self.recorder is not None:
+            # The observation and mask the action was chosen from are overwritten by the step.
+            observation = self.encoder.out.copy()
+            mask = self.action_mask().copy()
+        valid = False
+        if self.action_mask()[action]:
+            action_type, params = self._map_action(action)
+            valid = self.game.execute_action(action_type, params)
+            if self.fast_forward:
+                self._advance()
         
-        for card in cards:
-            if card:
-                if len(card.name) <= 13:
-                    top_row.append(f"│ {'':<13} ")
-                    bottom_row.append(f"│ {card.name:^13} ")
-                else:
-                    # Split longer names across two rows
-                    name_parts = card.name.split()
-                    top_part = ""
-                    bottom_part = ""
-                    
-                    for part in name_parts:
-                        if len(top_part) + len(part) + 1 <= 13 and not bottom_part:
-                            if top_part:
-                                top_part += " " + part
-                            else:
-                                top_part = part
-                        else:
-                            if bottom_part:
-                                bottom_part += " " + part
-                            else:
-                                bottom_part = part
-                    
-                    # If bottom part is too long, truncate it
-                    if len(bottom_part) > 13:
-                        bottom_part = bottom_part[:10] + "..."
-                    
-                    top_row.append(f"│ {top_part:^13} ")
-                    bottom_row.append(f"│ {bottom_part:^13} ")
-            else:
-                top_row.append(f"│ {'':<13} ")
-                bottom_row.append(f"│ {'':<13} ")
+        reward = 0.0
+        terminated = self.game.check_game_over()
+        if terminated:
+            reward = 1.0 if self.game.winner is acting_player else -1.0
+        if self.recorder is not None:
+            self.recorder.append(observation, mask, action, reward, terminated, acting_idx, self.episode_id)
         
-        print("".join(top_row) + "│")
-        print("".join(bottom_row) + "│")
+        info = {"valid_action": valid, "current_player": self.game.current_player_idx}
+        if self.render_mode == 'human':
+            self.render()
+        # Games always end by a win or loss; callers that cap episode length truncate themselves.
+        return self._get_observation(), reward, terminated, False, info
     
-    def _print_field_zone(self, label, card):
-        print("┌───────────────┐")
-        if card:
-            name = card.name if len(card.name) <= 13 else card.name[:10] + "..."
-            print(f"│ {name:^13} │ <- {label}")
+    def _advance(self) -> None:
+        if self.fast_forward:
+            self.game.fast_forward(self.action_generator.has_actions)
         else:
-            print(f"│ {'':<13} │ <- {label}")
-        print("└───────────────┘")
+            self.game.advance_to_main_phase()
+    
+    def action_mask(self) -> np.ndarray:
+        if self.profiler is not None:
+            return self.profiler.call("env/mask", self.action_generator.mask)
+        return self.action_generator.mask()
+    
+    def render(self, mode: Optional[str] = None):
+        """Render in `render_mode`; `mode` overrides it for one call, as the pre-0.26 gym API passed it."""
+        if mode is None:
+            mode = self.render_mode
+        if mode is None:
+            gym.logger.warn("render() called without a render_mode; pass render_mode to YGOEnv to render frames.")
+            return None
+        if mode == 'rgb_array':
+            if self.image_renderer is None:
+                self.image_renderer = ImageRenderer()
+            return self.image_renderer.render(self.game)
+        if mode not in ('human', 'ansi'):
+            raise ValueError(f"Unsupported render mode: {mode}, expected one of {self.metadata['render_modes']}")
+        frame = render_text(self.game)
+        if mode == 'ansi':
+            return frame
+        print(frame)
     
-    def _get_observation(self) -> Dict:
-        return None
+    def _get_observation(self) -> np.ndarray:
+        if self.profiler is not None:
+            return self.profiler.call("env/encode", self.encoder.encode, self.game)
+        return self.encoder.encode(self.game)
     
     def _encode_card(self, card, is_opponent=False) -> np.ndarray:
-        return None
+        hidden = is_opponent and card.position in (None, MonsterPosition.FACE_DOWN_DEFENSE, SpellTrapPosition.FACE_DOWN)
+        return self.encoder.encode_card(card, self._card_features, hidden=hidden)
     
     def _map_action(self, action_idx: int) -> Tuple[Optional[Action], Dict[str, Any]]:
-        return None, {}
+        return decode_action(action_idx)
     
 if __name__ == "__main__":
-    env = YGOEnv(agent_deck_path="data/test_deck.txt", opponent_deck_path="data/test_deck.txt")
+    # Prints the board after the reset.
+    env = YGOEnv(agent_deck_path="data/test_deck.txt", opponent_deck_path="data/test_deck.txt", render_mode='human')
     env.reset()
-    env.render()
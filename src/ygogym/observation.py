@@ -0,0 +1,297 @@
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from ygogym.core.card_store import ENUM_COLUMNS, ENUM_MEMBERS
+from ygogym.core.constants import (
+    Phase, CardType, MonsterPosition, SpellTrapPosition, StateRegion,
+    FIELD_SIZE, HAND_SLOTS, STARTING_LP, MAX_DECK_SIZE, MAX_EXTRA_DECK_SIZE
+)
+from ygogym.core.database import CardDatabase
+
+PHASES = list(Phase)
+
+# Static features: one-hot of every enum column in the card store, then scaled level, attack and defense.
+STAT_SCALES = [("level", 12.0), ("attack", 5000.0), ("defense", 5000.0)]
+CARD_STATIC_FEATURES = sum(len(ENUM_MEMBERS[name]) - 1 for name, _ in ENUM_COLUMNS) + len(STAT_SCALES)
+
+# Per-slot state written in front of the static features.
+POSITIONS = list(MonsterPosition) + list(SpellTrapPosition)
+POSITION_COLUMNS = {position: 2 + i for i, position in enumerate(POSITIONS)}
+PRESENT, HIDDEN = 0, 1
+CURRENT_ATTACK = 2 + len(POSITIONS)
+CURRENT_DEFENSE = CURRENT_ATTACK + 1
+SUMMONED_THIS_TURN = CURRENT_ATTACK + 2
+CAN_ATTACK = CURRENT_ATTACK + 3
+CARD_STATE_FEATURES = CAN_ATTACK + 1
+CARD_FEATURES = CARD_STATE_FEATURES + CARD_STATIC_FEATURES
+
+# Card slots of one player: hand, monster zones, spell/trap zones and the field spell zone.
+HAND_OFFSET = 0
+MONSTER_OFFSET = HAND_OFFSET + HAND_SLOTS
+SPELL_TRAP_OFFSET = MONSTER_OFFSET + FIELD_SIZE
+FIELD_SPELL_OFFSET = SPELL_TRAP_OFFSET + FIELD_SIZE
+PLAYER_SLOTS = FIELD_SPELL_OFFSET + 1
+CARD_SLOTS = 2 * PLAYER_SLOTS
+
+# Per player: life points, hand, deck and extra deck sizes, normal summon used, then
+# total/monster/spell/trap counts for the graveyard and for banished cards.
+PILE_TYPES = [CardType.MONSTER, CardType.SPELL, CardType.TRAP]
+PLAYER_FEATURES = 5 + 2 * (1 + len(PILE_TYPES))
+GLOBAL_FEATURES = 2 * PLAYER_FEATURES + len(PHASES) + 1
+
+CARDS_SIZE = CARD_SLOTS * CARD_FEATURES
+OBSERVATION_SIZE = CARDS_SIZE + GLOBAL_FEATURES
+
+PILE_SCALE = 10.0
+TURN_SCALE = 100.0
+
+FACE_DOWN_POSITIONS = (MonsterPosition.FACE_DOWN_DEFENSE, SpellTrapPosition.FACE_DOWN)
+SLOT_REGIONS = (StateRegion.HAND, StateRegion.MONSTER_ZONE, StateRegion.SPELL_TRAP_ZONE, StateRegion.FIELD_SPELL_ZONE)
+PILE_REGIONS = (StateRegion.GRAVEYARD, StateRegion.BANISHED)
+
+
+@lru_cache(maxsize=None)
+def card_feature_table(database: CardDatabase) -> np.ndarray:
+    """
+    Static feature vectors for every card in the database, one row per store row.
+
+    The extra last row is all zeros, so a template index of -1 (a card built by
+    hand, or an empty slot) selects a blank vector.
+    """
+    columns = database.store.columns
+    count = len(database.store)
+    table = np.zeros((count + 1, CARD_STATIC_FEATURES), dtype=np.float32)
+    rows = np.arange(count)
+
+    offset = 0
+    for name, _ in ENUM_COLUMNS:
+        codes = columns[name].astype(np.int64)
+        present = codes > 0
+        table[rows[present], offset + codes[present] - 1] = 1.0
+        offset += len(ENUM_MEMBERS[name]) - 1
+
+    for name, scale in STAT_SCALES:
+        values = columns[name].astype(np.float32)
+        table[:count, offset] = np.where(values >= 0, values / scale, 0.0)
+        offset += 1
+
+    return table
+
+
+class ObservationEncoder:
+    """
+    Encodes a `Game` into a fixed-size float32 vector.
+
+    The vector holds `CARD_SLOTS` card slots of `CARD_FEATURES` values (the
+    observing player's hand, monster, spell/trap and field spell zones, then
+    the opponent's), followed by `GLOBAL_FEATURES` values of counts, phase and
+    turn. Cards the observer cannot see, such as the opponent's hand or
+    face-down cards, only expose whether the slot is occupied and, on the
+    field, the card's position.
+
+    Once attached to a game, the encoder listens for state changes and keeps
+    one cached encoding per player, re-encoding only the card slots that
+    changed since that player's last observation. With `verify` set, every
+    incremental result is checked against a full re-encode.
+
+    The output buffer is reused for every call, so the hot path allocates
+    nothing; callers that keep observations must copy them.
+    """
+
+    def __init__(self, out: Optional[np.ndarray] = None, verify: bool = False):
+        self.card_features = card_feature_table(CardDatabase.get())
+        self.verify = verify
+        self.bind(out if out is not None else np.zeros(OBSERVATION_SIZE, dtype=np.float32))
+
+        self._game = None
+        self._caches = [np.zeros(OBSERVATION_SIZE, dtype=np.float32) for _ in range(2)]
+        self._cache_views = [self._views(cache) for cache in self._caches]
+        self._stale = [True, True]
+        self._dirty = [set(), set()]
+        self._pile_counts = np.zeros((2, 2, 1 + len(PILE_TYPES)), dtype=np.float32)
+        self._piles_stale = [True, True]
+
+    def bind(self, out: np.ndarray) -> None:
+        self.out = out
+        self._out_views = self._views(out)
+
+    @staticmethod
+    def _views(out: np.ndarray) -> tuple:
+        cards = out[:CARDS_SIZE].reshape(CARD_SLOTS, CARD_FEATURES)
+        rows = np.full(CARD_SLOTS, -1, dtype=np.int64)
+        return cards[:, :CARD_STATE_FEATURES], cards[:, CARD_STATE_FEATURES:], out[CARDS_SIZE:], rows
+
+    def attach(self, game) -> None:
+        """Track `game` incrementally from now on; pass None to stop tracking."""
+        if self._game is not None:
+            self._game.remove_state_listener(self._on_state_change)
+        self._game = game
+        if game is not None:
+            game.add_state_listener(self._on_state_change)
+        self._stale = [True, True]
+        self._piles_stale = [True, True]
+
+    def _on_state_change(self, player, region, index, card, entered) -> None:
+        if region is None:
+            self._stale = [True, True]
+            self._piles_stale = [True, True]
+            return
+        if player is None:
+            # Phase and turn live in the global section, which is rewritten on every call.
+            return
+        player_idx = 0 if player is self._game.players[0] else 1
+        if region in PILE_REGIONS:
+            self._piles_stale[player_idx] = True
+        elif region in SLOT_REGIONS:
+            key = (player_idx, region, index)
+            self._dirty[0].add(key)
+            self._dirty[1].add(key)
+
+    def encode(self, game, perspective: Optional[int] = None) -> np.ndarray:
+        if perspective is None:
+            perspective = game.current_player_idx
+
+        if game is not self._game:
+            self._encode_cards(game, perspective, self._out_views)
+            self._encode_global(game, perspective, self._out_views[2])
+            return self.out
+
+        views = self._cache_views[perspective]
+        dirty = self._dirty[perspective]
+        if self._stale[perspective]:
+            self._encode_cards(game, perspective, views)
+            self._stale[perspective] = False
+        else:
+            for player_idx, region, index in dirty:
+                self._encode_region(game, perspective, player_idx, region, index, views)
+        dirty.clear()
+        self._encode_global(game, perspective, views[2])
+
+        np.copyto(self.out, self._caches[perspective])
+        if self.verify:
+            self._verify(game, perspective)
+        return self.out
+
+    def _verify(self, game, perspective: int) -> None:
+        expected = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        views = self._views(expected)
+        self._encode_cards(game, perspective, views)
+        self._encode_global(game, perspective, views[2])
+        mismatched = np.flatnonzero(expected != self.out)
+        if len(mismatched):
+            slots = sorted({int(i) // CARD_FEATURES for i in mismatched if i < CARDS_SIZE})
+            raise AssertionError(f"Incremental observation differs from a full encode at card slots {slots} "
+                                 f"and {int(np.sum(mismatched >= CARDS_SIZE))} global features")
+
+    def _encode_cards(self, game, perspective: int, views: tuple) -> None:
+        state, static, _, rows = views
+        state.fill(0.0)
+        rows.fill(-1)
+        for side in range(2):
+            player = game.players[perspective if side == 0 else 1 - perspective]
+            base = side * PLAYER_SLOTS
+            is_opponent = side == 1
+
+            for i, card in enumerate(player.hand[:HAND_SLOTS]):
+                self._encode_slot(base + HAND_OFFSET + i, card, is_opponent, views)
+            field = player.field
+            for i in range(FIELD_SIZE):
+                if field.monster_zones[i] is not None:
+                    self._encode_field_slot(base + MONSTER_OFFSET + i, field.monster_zones[i], is_opponent, views)
+                if field.spell_trap_zones[i] is not None:
+                    self._encode_field_slot(base + SPELL_TRAP_OFFSET + i, field.spell_trap_zones[i], is_opponent, views)
+            if field.field_spell is not None:
+                self._encode_field_slot(base + FIELD_SPELL_OFFSET, field.field_spell, is_opponent, views)
+
+        np.take(self.card_features, rows, axis=0, out=static, mode='wrap')
+
+    def _encode_region(self, game, perspective: int, player_idx: int, region, index: Optional[int], views: tuple) -> None:
+        state, static, _, rows = views
+        side = 0 if player_idx == perspective else 1
+        base = side * PLAYER_SLOTS
+        is_opponent = side == 1
+        player = game.players[player_idx]
+
+        if region == StateRegion.HAND:
+            first = base + HAND_OFFSET
+            state[first:first + HAND_SLOTS].fill(0.0)
+            rows[first:first + HAND_SLOTS] = -1
+            for i, card in enumerate(player.hand[:HAND_SLOTS]):
+                self._encode_slot(first + i, card, is_opponent, views)
+            np.take(self.card_features, rows[first:first + HAND_SLOTS], axis=0, out=static[first:first + HAND_SLOTS], mode='wrap')
+            return
+
+        if region == StateRegion.MONSTER_ZONE:
+            slot, card = base + MONSTER_OFFSET + index, player.field.monster_zones[index]
+        elif region == StateRegion.SPELL_TRAP_ZONE:
+            slot, card = base + SPELL_TRAP_OFFSET + index, player.field.spell_trap_zones[index]
+        else:
+            slot, card = base + FIELD_SPELL_OFFSET, player.field.field_spell
+        state[slot].fill(0.0)
+        rows[slot] = -1
+        if card is not None:
+            self._encode_field_slot(slot, card, is_opponent, views)
+        static[slot] = self.card_features[rows[slot]]
+
+    def _encode_global(self, game, perspective: int, g: np.ndarray) -> None:
+        g.fill(0.0)
+        for side in range(2):
+            player_idx = perspective if side == 0 else 1 - perspective
+            player = game.players[player_idx]
+            offset = side * PLAYER_FEATURES
+            g[offset] = player.life_points / STARTING_LP
+            g[offset + 1] = len(player.hand) / HAND_SLOTS
+            g[offset + 2] = player.deck.remaining_cards() / MAX_DECK_SIZE
+            g[offset + 3] = len(player.extra_deck) / MAX_EXTRA_DECK_SIZE
+            g[offset + 4] = player.normal_summon_used
+            offset += 5
+
+            counts = self._pile_counts[player_idx]
+            if game is not self._game or self._piles_stale[player_idx]:
+                counts.fill(0.0)
+                for pile_idx, pile in enumerate((player.graveyard, player.banished)):
+                    counts[pile_idx, 0] = len(pile)
+                    for card in pile:
+                        counts[pile_idx, 1 + PILE_TYPES.index(card.card_type)] += 1
+                if game is self._game:
+                    self._piles_stale[player_idx] = False
+            g[offset:offset + counts.size] = counts.ravel()
+            g[offset:offset + counts.size] /= PILE_SCALE
+
+        offset = 2 * PLAYER_FEATURES
+        if game.current_phase is not None:
+            g[offset + PHASES.index(game.current_phase)] = 1.0
+        g[offset + len(PHASES)] = game.turn_count / TURN_SCALE
+
+    def encode_card(self, card, out: np.ndarray, hidden: bool = False) -> np.ndarray:
+        """Encode a single card into `out`, which must hold `CARD_FEATURES` values."""
+        out.fill(0.0)
+        self._write_state(out[:CARD_STATE_FEATURES], card, hidden)
+        if not hidden:
+            out[CARD_STATE_FEATURES:] = self.card_features[card.template.index]
+        return out
+
+    def _encode_field_slot(self, slot: int, card, is_opponent: bool, views: tuple) -> None:
+        hidden = is_opponent and card.position in FACE_DOWN_POSITIONS
+        self._encode_slot(slot, card, hidden, views)
+
+    def _encode_slot(self, slot: int, card, hidden: bool, views: tuple) -> None:
+        self._write_state(views[0][slot], card, hidden)
+        if not hidden:
+            views[3][slot] = card.template.index
+
+    @staticmethod
+    def _write_state(state: np.ndarray, card, hidden: bool) -> None:
+        state[PRESENT] = 1.0
+        if card.position is not None:
+            state[POSITION_COLUMNS[card.position]] = 1.0
+        if hidden:
+            state[HIDDEN] = 1.0
+            return
+        if card.attack is not None:
+            state[CURRENT_ATTACK] = card.current_attack / 5000.0
+            state[CURRENT_DEFENSE] = card.current_defense / 5000.0
+        state[SUMMONED_THIS_TURN] = card.summoned_this_turn
+        state[CAN_ATTACK] = card.can_attack
@@ -0,0 +1,306 @@
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ygogym.core.constants import (
+    CardType, MonsterPosition, MonsterType, Phase, SpellTrapPosition, FIELD_SIZE, HAND_SLOTS
+)
+
+# Text frames: every card cell holds a name in up to two lines of NAME_WIDTH characters.
+NAME_WIDTH = 13
+CELL = "─" * (NAME_WIDTH + 2)
+EMPTY_CELL = f"│ {'':<{NAME_WIDTH}} "
+FIELD_BORDER = "┌" + "┬".join([CELL] * FIELD_SIZE) + "┐"
+FIELD_DIVIDER = "├" + "┼".join([CELL] * FIELD_SIZE) + "┤"
+FIELD_BOTTOM = "└" + "┴".join([CELL] * FIELD_SIZE) + "┘"
+CENTER_LINE = "\n" + "─" * 90 + "\n"
+
+
+@lru_cache(maxsize=None)
+def name_cells(name: str) -> Tuple[str, str]:
+    """The top and bottom line of a card cell showing `name`, wrapped onto two lines if it is too long."""
+    if len(name) <= NAME_WIDTH:
+        return EMPTY_CELL, f"│ {name:^{NAME_WIDTH}} "
+    top, bottom = "", ""
+    for part in name.split():
+        if len(top) + len(part) + 1 <= NAME_WIDTH and not bottom:
+            top = f"{top} {part}" if top else part
+        else:
+            bottom = f"{bottom} {part}" if bottom else part
+    if len(bottom) > NAME_WIDTH:
+        bottom = bottom[:NAME_WIDTH - 3] + "..."
+    return f"│ {top:^{NAME_WIDTH}} ", f"│ {bottom:^{NAME_WIDTH}} "
+
+
+@lru_cache(maxsize=None)
+def field_zone_lines(name: Optional[str], label: str) -> str:
+    if name is not None and len(name) > NAME_WIDTH:
+        name = name[:NAME_WIDTH - 3] + "..."
+    return f"┌{CELL}┐\n│ {name or '':^{NAME_WIDTH}} │ <- {label}\n└{CELL}┘"
+
+
+@lru_cache(maxsize=None)
+def hand_borders(count: int) -> Tuple[str, str]:
+    return "┌" + "┬".join([CELL] * count) + "┐", "└" + "┴".join([CELL] * count) + "┘"
+
+
+def card_row(cards: Sequence) -> str:
+    top, bottom = [], []
+    for card in cards:
+        if card:
+            cells = name_cells(card.name)
+            top.append(cells[0])
+            bottom.append(cells[1])
+        else:
+            top.append(EMPTY_CELL)
+            bottom.append(EMPTY_CELL)
+    return "".join(top) + "│\n" + "".join(bottom) + "│"
+
+
+def render_text(game) -> str:
+    """
+    The board as one string: the second player's hand and field at the top,
+    the first player's at the bottom.
+
+    The frame is assembled in a list and joined once, and card name layouts
+    are cached across frames, so rendering costs little beyond the string
+    formatting of the counters.
+    """
+    player1, player2 = game.player1, game.player2
+    phase = game.current_phase.value if game.current_phase else None
+    lines: List[str] = [
+        f"Turn {game.turn_count}, Phase: {phase}",
+        f"Current Player: {game.current_player.name}",
+        f"\nPlayer 2 (LP: {player2.life_points}) - Hand: {len(player2.hand)} - Deck: {player2.deck.remaining_cards()}",
+    ]
+    if player2.hand:
+        lines += ["\nHand:", *_hand_lines(player2.hand)]
+    lines += [
+        field_zone_lines(_name(player2.field.field_spell), "Field Spell"),
+        FIELD_BORDER,
+        card_row(player2.field.spell_trap_zones),
+        FIELD_DIVIDER,
+        card_row(player2.field.monster_zones),
+        FIELD_BOTTOM,
+        CENTER_LINE,
+        FIELD_BORDER,
+        card_row(player1.field.monster_zones),
+        FIELD_DIVIDER,
+        card_row(player1.field.spell_trap_zones),
+        FIELD_BOTTOM,
+        field_zone_lines(_name(player1.field.field_spell), "Field Spell"),
+        f"\nPlayer 1 (LP: {player1.life_points}) - Hand: {len(player1.hand)} - Deck: {player1.deck.remaining_cards()}",
+    ]
+    if player1.hand:
+        lines += ["\nHand:", *_hand_lines(player1.hand)]
+    return "\n".join(lines)
+
+
+def _name(card) -> Optional[str]:
+    return card.name if card else None
+
+
+def _hand_lines(hand: Sequence) -> Tuple[str, str, str]:
+    top, bottom = hand_borders(len(hand))
+    return top, card_row(hand), bottom
+
+
+# Images: one slot per card, hands on the outside, then spell/trap zones (field spell zone first), then monster zones.
+# The field is centered under the wider hand rows.
+TILE_WIDTH, TILE_HEIGHT = 24, 32
+SLOT = 32
+PITCH = SLOT + 4
+MARGIN = 4
+STATUS_HEIGHT = 28
+IMAGE_WIDTH = MARGIN + max(HAND_SLOTS, FIELD_SIZE + 1) * PITCH
+IMAGE_HEIGHT = MARGIN + 6 * PITCH + STATUS_HEIGHT
+FIELD_LEFT = MARGIN + (max(HAND_SLOTS, FIELD_SIZE + 1) - (FIELD_SIZE + 1)) * PITCH // 2
+
+BACKGROUND = (24, 64, 44)
+SLOT_OUTLINE = (60, 100, 80)
+BORDER = (235, 235, 235)
+CARD_BACK = (120, 72, 36)
+TEXT = (20, 20, 20)
+HIGHLIGHT = (250, 210, 60)
+DIM = (90, 110, 100)
+MONSTER_COLORS = {
+    MonsterType.NORMAL: (215, 180, 90),
+    MonsterType.EFFECT: (210, 120, 60),
+    MonsterType.FUSION: (150, 100, 180),
+}
+CARD_COLORS = {CardType.SPELL: (40, 150, 130), CardType.TRAP: (175, 70, 130)}
+PHASES = list(Phase)
+
+# 3x5 bitmaps of the digits, one string of rows per digit.
+DIGIT_ROWS = (
+    "111101101101111", "010110010010111", "111001111100111", "111001111001111", "101101111001001",
+    "111100111001111", "111100111101111", "111001001010010", "111101111101111", "111101111001111",
+)
+DIGITS = np.array([[int(bit) for bit in rows] for rows in DIGIT_ROWS], dtype=bool).reshape(10, 5, 3)
+
+
+@lru_cache(maxsize=None)
+def digit_glyphs(scale: int) -> np.ndarray:
+    return DIGITS.repeat(scale, axis=1).repeat(scale, axis=2)
+
+
+def draw_number(image: np.ndarray, x: int, y: int, value: int, color: Tuple[int, int, int], scale: int = 1) -> None:
+    """Draw the digits of `value` with their top left corner at (x, y)."""
+    glyphs = digit_glyphs(scale)
+    height, width = glyphs.shape[1:]
+    for i, digit in enumerate(str(max(0, int(value)))):
+        left = x + i * 4 * scale
+        region = image[y:y + height, left:left + width]
+        region[glyphs[int(digit), :region.shape[0], :region.shape[1]]] = color
+
+
+@lru_cache(maxsize=4096)
+def number_sprite(value: int, color: Tuple[int, int, int], scale: int) -> np.ndarray:
+    """`value` drawn on the board background, to be pasted whole."""
+    digits = len(str(max(0, int(value))))
+    sprite = np.empty((5 * scale, (4 * digits - 1) * scale, 3), dtype=np.uint8)
+    sprite[:] = BACKGROUND
+    draw_number(sprite, 0, 0, value, color, scale)
+    sprite.flags.writeable = False
+    return sprite
+
+
+@lru_cache(maxsize=None)
+def phase_sprite(phase: Optional[Phase]) -> np.ndarray:
+    """One pip per phase on the board background, the current one highlighted."""
+    sprite = np.empty((8, len(PHASES) * 10 - 2, 3), dtype=np.uint8)
+    sprite[:] = BACKGROUND
+    for i, other in enumerate(PHASES):
+        sprite[:, i * 10:i * 10 + 8] = HIGHLIGHT if other == phase else DIM
+    sprite.flags.writeable = False
+    return sprite
+
+
+def _tile(color: Tuple[int, int, int], stripe: Tuple[int, int, int], defense: bool) -> np.ndarray:
+    # Defense position cards lie sideways, with the stripe down their left edge.
+    height, width = (TILE_WIDTH, TILE_HEIGHT) if defense else (TILE_HEIGHT, TILE_WIDTH)
+    tile = np.empty((height, width, 3), dtype=np.uint8)
+    tile[:] = BORDER
+    tile[1:-1, 1:-1] = color
+    if defense:
+        tile[2:-2, 2:6] = stripe
+    else:
+        tile[2:6, 2:-2] = stripe
+    return tile
+
+
+@lru_cache(maxsize=None)
+def card_back_tile(defense: bool) -> np.ndarray:
+    tile = _tile(CARD_BACK, CARD_BACK, defense)
+    center_y, center_x = tile.shape[0] // 2, tile.shape[1] // 2
+    tile[center_y - 4:center_y + 4, center_x - 4:center_x + 4] = HIGHLIGHT
+    tile.flags.writeable = False
+    return tile
+
+
+@lru_cache(maxsize=4096)
+def card_tile(name: str, card_type: CardType, monster_type: Optional[MonsterType], attack: Optional[int],
+              defense: Optional[int], defense_position: bool) -> np.ndarray:
+    """
+    A face-up card: coloured by card type, with a stripe coloured from the
+    card name to tell cards apart, and a monster's attack above its defense.
+    """
+    if card_type == CardType.MONSTER:
+        color = MONSTER_COLORS.get(monster_type, MONSTER_COLORS[MonsterType.EFFECT])
+    else:
+        color = CARD_COLORS[card_type]
+    crc = zlib.crc32(name.encode("utf-8"))
+    tile = _tile(color, (crc & 0xFF, (crc >> 8) & 0xFF, (crc >> 16) & 0xFF), defense_position)
+    x = 9 if defense_position else 3
+    if attack is not None:
+        draw_number(tile, x, tile.shape[0] - 14, attack, TEXT)
+    if defense is not None:
+        draw_number(tile, x, tile.shape[0] - 7, defense, TEXT)
+    tile.flags.writeable = False
+    return tile
+
+
+def tile_for(card) -> np.ndarray:
+    position = card.position
+    defense = position in (MonsterPosition.FACE_UP_DEFENSE, MonsterPosition.FACE_DOWN_DEFENSE)
+    if position in (MonsterPosition.FACE_DOWN_DEFENSE, SpellTrapPosition.FACE_DOWN):
+        return card_back_tile(defense)
+    if card.card_type == CardType.MONSTER:
+        return card_tile(card.name, card.card_type, card.monster_type, card.current_attack, card.current_defense, defense)
+    return card_tile(card.name, card.card_type, None, None, None, False)
+
+
+class ImageRenderer:
+    """
+    Renders the board as an RGB array, e.g. for recording evaluation videos.
+
+    The empty board is drawn once; a frame is a copy of it with a
+    pre-rasterized tile pasted into each occupied slot. Tiles are cached by
+    everything they show, so steady-state frames draw no new tiles. Hands
+    show at most `HAND_SLOTS` cards; both are shown face up, as in the text
+    view. The strip between the fields holds each player's life points (yellow for
+    the player to act), the turn and the current phase.
+    """
+
+    __slots__ = ("background", "slots")
+
+    def __init__(self):
+        # (player index, region) -> top left corner of each slot in that region
+        self.slots: Dict[Tuple[int, str], List[Tuple[int, int]]] = {}
+        rows = {
+            (1, "hand"): 0, (1, "spell_trap"): 1, (1, "monster"): 2,
+            (0, "monster"): 3, (0, "spell_trap"): 4, (0, "hand"): 5,
+        }
+        for (player, region), row in rows.items():
+            y = MARGIN + row * PITCH + (STATUS_HEIGHT if player == 0 else 0)
+            if region == "hand":
+                self.slots[(player, region)] = [(MARGIN + column * PITCH, y) for column in range(HAND_SLOTS)]
+                continue
+            self.slots[(player, region)] = [(FIELD_LEFT + column * PITCH, y) for column in range(1, FIELD_SIZE + 1)]
+            if region == "spell_trap":
+                self.slots[(player, "field_spell")] = [(FIELD_LEFT, y)]
+
+        self.background = np.empty((IMAGE_HEIGHT, IMAGE_WIDTH, 3), dtype=np.uint8)
+        self.background[:] = BACKGROUND
+        for (player, region), corners in self.slots.items():
+            if region == "hand":
+                continue
+            for x, y in corners:
+                self.background[y:y + SLOT, x:x + SLOT] = SLOT_OUTLINE
+                self.background[y + 1:y + SLOT - 1, x + 1:x + SLOT - 1] = BACKGROUND
+
+    def render(self, game) -> np.ndarray:
+        frame = self.background.copy()
+        for index, player in enumerate((game.player1, game.player2)):
+            field = player.field
+            self._paste_row(frame, self.slots[(index, "hand")], player.hand[:HAND_SLOTS])
+            self._paste_row(frame, self.slots[(index, "monster")], field.monster_zones)
+            self._paste_row(frame, self.slots[(index, "spell_trap")], field.spell_trap_zones)
+            self._paste_row(frame, self.slots[(index, "field_spell")], (field.field_spell,))
+        self._draw_status(frame, game)
+        return frame
+
+    @staticmethod
+    def _paste_row(frame: np.ndarray, corners: List[Tuple[int, int]], cards: Sequence) -> None:
+        for (x, y), card in zip(corners, cards):
+            if card is None:
+                continue
+            tile = tile_for(card)
+            # Center the tile in its square slot, whichever way it is turned.
+            top, left = y + (SLOT - tile.shape[0]) // 2, x + (SLOT - tile.shape[1]) // 2
+            frame[top:top + tile.shape[0], left:left + tile.shape[1]] = tile
+
+    @staticmethod
+    def _draw_status(frame: np.ndarray, game) -> None:
+        top = MARGIN + 3 * PITCH
+        sprites = [
+            (MARGIN, top + 3 + index * 12, number_sprite(player.life_points, HIGHLIGHT if player is game.current_player else BORDER, 2))
+            for index, player in enumerate((game.player2, game.player1))
+        ]
+        sprites.append((IMAGE_WIDTH // 2 - 12, top + 9, number_sprite(game.turn_count, BORDER, 2)))
+        phases = phase_sprite(game.current_phase)
+        sprites.append((IMAGE_WIDTH - MARGIN - phases.shape[1], top + 10, phases))
+        for x, y, sprite in sprites:
+            frame[y:y + sprite.shape[0], x:x + sprite.shape[1]] = sprite
@@ -0,0 +1,388 @@
+import argparse
+import importlib
+import json
+import multiprocessing as mp
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from ygogym.core.actions import ACTION_OFFSETS, ACTION_TABLE, NUM_ACTIONS, decode_action
+from ygogym.core.battle import battle_outcomes, monster_arrays
+from ygogym.core.constants import Action, FIELD_SIZE, MonsterPosition, Phase
+from ygogym.core.profiling import Profiler
+from ygogym.env import YGOEnv
+from ygogym.observation import FACE_DOWN_POSITIONS, OBSERVATION_SIZE
+from ygogym.trajectories import TrajectoryWriter
+
+DECK_PATH = "data/test_deck.txt"
+# Games still running after this many steps are stopped and counted as draws.
+MAX_STEPS = 2000
+
+
+class Policy:
+    """
+    Picks one action for each of a batch of games.
+
+    Called as policy(observations, action_masks, games) with one row per game
+    and returns an array of action indices. Every game in a batch is waiting
+    for the same player seat, so a neural policy gets full batches.
+    """
+
+    def seed(self, seed: Optional[int]) -> None:
+        pass
+
+    def __call__(self, observations: np.ndarray, action_masks: np.ndarray, games: Sequence) -> np.ndarray:
+        raise NotImplementedError
+
+
+class RandomPolicy(Policy):
+    """Uniformly random legal actions."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+
+    def seed(self, seed: Optional[int]) -> None:
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, observations, action_masks, games) -> np.ndarray:
+        scores = self.rng.random(action_masks.shape)
+        return np.where(action_masks, scores, -1.0).argmax(axis=1)
+
+
+# Action types in the order the default script tries them.
+DEFAULT_SCRIPT = (
+    Action.ACTIVATE_SPELL, Action.TRIBUTE_SUMMON, Action.NORMAL_SUMMON, Action.FLIP_SUMMON,
+    Action.SET_TRAP, Action.ATTACK, Action.NEXT_PHASE, Action.END_TURN,
+)
+
+
+class ScriptedPolicy(Policy):
+    """Plays the first legal action of the earliest action type in `script`; types not listed are never played."""
+
+    def __init__(self, script: Sequence[Action] = DEFAULT_SCRIPT):
+        rank = {action: i for i, action in enumerate(script)}
+        self.ranks = np.array([rank.get(action, len(script)) for action, _ in ACTION_TABLE], dtype=np.int32)
+        self.unlisted = len(script)
+
+    def __call__(self, observations, action_masks, games) -> np.ndarray:
+        ranks = np.where(action_masks, self.ranks, self.unlisted + 1)
+        actions = ranks.argmin(axis=1)
+        # Fall back to any legal action when only unlisted ones remain.
+        stuck = ranks[np.arange(len(actions)), actions] >= self.unlisted
+        if stuck.any():
+            actions[stuck] = action_masks[stuck].argmax(axis=1)
+        return actions
+
+
+# LP-equivalent of destroying a monster when scoring attacks.
+DESTROY_VALUE = 1000.0
+# DEF assumed for face-down monsters, whose stats the observation hides.
+UNKNOWN_DEFENSE = 1500
+# Base scores of the greedy heuristic; summons and attacks add their stats in thousands.
+GREEDY_SCORES = {
+    Action.ACTIVATE_SPELL: 3.0,
+    Action.NORMAL_SUMMON: 2.0,
+    Action.TRIBUTE_SUMMON: 2.0,
+    Action.FLIP_SUMMON: 2.0,
+    Action.SET_TRAP: 1.5,
+    Action.ACTIVATE_TRAP: 1.0,
+    Action.SET_SPELL: 0.25,
+    Action.CHANGE_MONSTER_POSITION: 0.0,
+    Action.ATTACK: 4.0,
+    Action.NEXT_PHASE: 1.0,
+    Action.END_TURN: 0.0,
+}
+ATTACK_COUNT = FIELD_SIZE * (FIELD_SIZE + 1)
+
+
+class GreedyPolicy(Policy):
+    """
+    One-ply heuristic: activate Spells, summon the strongest monster, make
+    every attack that gains more than it loses, then move on.
+
+    Attacks are scored for the whole batch at once from the batched battle
+    outcomes; everything else from the card the action plays. Face-down
+    targets are scored with `unknown_defense` in place of their DEF, so the
+    policy sees no more of the opponent than the observation does.
+    """
+
+    def __init__(self, unknown_defense: int = UNKNOWN_DEFENSE):
+        self.unknown_defense = unknown_defense
+
+    def __call__(self, observations, action_masks, games) -> np.ndarray:
+        actions = np.empty(len(games), dtype=np.int64)
+        battle_rows = [i for i, game in enumerate(games) if game.current_phase == Phase.BATTLE_PHASE]
+        attack_values = {}
+        if battle_rows:
+            outcomes = self._attack_outcomes([games[i] for i in battle_rows])
+            values = (
+                outcomes.opponent_damage - outcomes.player_damage
+                + DESTROY_VALUE * (outcomes.target_destroyed.astype(np.float32) - outcomes.attacker_destroyed)
+            ).reshape(len(battle_rows), ATTACK_COUNT)
+            attack_values = dict(zip(battle_rows, values))
+
+        for i, game in enumerate(games):
+            legal = np.flatnonzero(action_masks[i])
+            scores = [self._score(game, index, attack_values.get(i)) for index in legal]
+            actions[i] = legal[int(np.argmax(scores))]
+        return actions
+
+    def _attack_outcomes(self, games: Sequence):
+        attack_points, _, _, _, ready = monster_arrays([game.current_player for game in games])
+        target_attack, target_defense, target_occupied, target_in_attack, _ = monster_arrays(
+            [game.opponent for game in games]
+        )
+        face_down = np.array(
+            [[card is not None and card.position in FACE_DOWN_POSITIONS for card in game.opponent.field.monster_zones]
+             for game in games],
+            dtype=bool,
+        )
+        target_defense[face_down] = self.unknown_defense
+        return battle_outcomes(attack_points, ready, target_attack, target_defense, target_occupied, target_in_attack)
+
+    @staticmethod
+    def _score(game, index: int, attack_values: Optional[np.ndarray]) -> float:
+        action, params = decode_action(index)
+        score = GREEDY_SCORES[action]
+        player = game.current_player
+        if action == Action.ATTACK:
+            value = attack_values[index - ACTION_OFFSETS["attack"]]
+            return score + value / 1000.0 if value > 0 else -1.0
+        if action in (Action.NORMAL_SUMMON, Action.TRIBUTE_SUMMON):
+            card = player.hand[params["hand_index"]]
+            attack, defense = card.current_attack or 0, card.current_defense or 0
+            # Attack Position for monsters that are better attacking, face-down otherwise.
+            if (params["position"] == MonsterPosition.FACE_UP_ATTACK) != (attack >= defense):
+                return -1.0
+            score += max(attack, defense) / 1000.0
+            for zone in params.get("tributes", ()):
+                score -= (player.field.monster_zones[zone].current_attack or 0) / 1000.0
+            return score
+        if action == Action.CHANGE_MONSTER_POSITION:
+            card = player.field.monster_zones[params["zone_index"]]
+            to_attack = card.position != MonsterPosition.FACE_UP_ATTACK
+            return 0.75 if to_attack == ((card.current_attack or 0) >= (card.current_defense or 0)) else -1.0
+        if action == Action.NEXT_PHASE and game.current_phase == Phase.BATTLE_PHASE:
+            return 0.5
+        return score
+
+
+class CallablePolicy(Policy):
+    """
+    Wraps fn(observations, action_masks), e.g. a neural network.
+
+    `fn` returns either action indices or one score per action, from which
+    the best legal action is taken.
+    """
+
+    def __init__(self, fn: Callable[[np.ndarray, np.ndarray], np.ndarray]):
+        self.fn = fn
+
+    def __call__(self, observations, action_masks, games) -> np.ndarray:
+        output = np.asarray(self.fn(observations, action_masks))
+        if output.ndim == 2:
+            return np.where(action_masks, output, -np.inf).argmax(axis=1)
+        return output.astype(np.int64)
+
+
+POLICIES: Dict[str, Callable[[], Policy]] = {
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy,
+    "scripted": ScriptedPolicy,
+}
+
+
+def load_policy(spec: str) -> Policy:
+    """A policy by name from POLICIES, or "module:attribute" naming a policy, a factory or a batched callable."""
+    if spec in POLICIES:
+        return POLICIES[spec]()
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown policy {spec!r}, expected one of {sorted(POLICIES)} or module:attribute")
+    target = getattr(importlib.import_module(module_name), attribute)
+    if isinstance(target, type) and issubclass(target, Policy):
+        return target()
+    return target if isinstance(target, Policy) else CallablePolicy(target)
+
+
+def play_games(
+    agent: Policy,
+    opponent: Policy,
+    games: range,
+    agent_deck_path: str = DECK_PATH,
+    opponent_deck_path: str = DECK_PATH,
+    num_envs: int = 64,
+    seed: int = 0,
+    fast_forward: bool = True,
+    max_steps: int = MAX_STEPS,
+    trajectory_dir: Optional[str] = None,
+    profile_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Play the games numbered `games` in this process, `num_envs` at a time.
+
+    The agent plays the first deck as player 0 and the opponent the second
+    deck as player 1; game `g` is seeded with `seed + g` and started by
+    player `g % 2`, so results do not depend on how games are split up.
+    Each step, the games waiting on the agent are batched into one policy
+    call and the games waiting on the opponent into another.
+    """
+    agent.seed(seed * 1_000_003 + games.start)
+    opponent.seed(seed * 1_000_003 + games.start + 1)
+    num_envs = max(1, min(num_envs, len(games)))
+    observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+    action_masks = np.zeros((num_envs, NUM_ACTIONS), dtype=bool)
+    envs = []
+    for i in range(num_envs):
+        env = YGOEnv(agent_deck_path, opponent_deck_path, fast_forward=fast_forward)
+        env.bind_buffers(observations[i], action_masks[i])
+        envs.append(env)
+    # Transitions are recorded under the game's number as episode id, in one shard series per worker.
+    writer = TrajectoryWriter(trajectory_dir, prefix=f"games-{games.start:08d}") if trajectory_dir else None
+    profiler = Profiler() if profile_dir else None
+    for env in envs:
+        env.recorder = writer
+        env.set_profiler(profiler)
+
+    pending = iter(games)
+    slot_games = [-1] * num_envs
+    slot_steps = [0] * num_envs
+    results = []
+
+    def start(slot: int) -> bool:
+        game_index = next(pending, None)
+        if game_index is None:
+            slot_games[slot] = -1
+            return False
+        envs[slot].reset(seed=seed + game_index, starting_player=game_index % 2)
+        envs[slot].episode_id = game_index
+        envs[slot].action_mask()
+        slot_games[slot] = game_index
+        slot_steps[slot] = 0
+        return True
+
+    active = [slot for slot in range(num_envs) if start(slot)]
+    policies = (agent, opponent)
+    actions = np.zeros(num_envs, dtype=np.int64)
+    steps = 0
+    started = time.perf_counter()
+    while active:
+        seats = [envs[slot].game.current_player_idx for slot in active]
+        for seat, policy in enumerate(policies):
+            rows = [slot for slot, slot_seat in zip(active, seats) if slot_seat == seat]
+            if rows:
+                actions[rows] = policy(observations[rows], action_masks[rows], [envs[slot].game for slot in rows])
+
+        still_active = []
+        for slot in active:
+            env = envs[slot]
+            _, _, terminated, truncated, _ = env.step(int(actions[slot]))
+            env.action_mask()
+            slot_steps[slot] += 1
+            steps += 1
+            truncated = truncated or (not terminated and slot_steps[slot] >= max_steps)
+            if terminated or truncated:
+                winner = env.game.players.index(env.game.winner) if terminated and env.game.winner is not None else -1
+                results.append((slot_games[slot], slot_games[slot] % 2, winner, slot_steps[slot]))
+                if start(slot):
+                    still_active.append(slot)
+            else:
+                still_active.append(slot)
+        active = still_active
+
+    if writer is not None:
+        writer.close()
+    if profiler is not None:
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump(os.path.join(profile_dir, f"profile-{games.start:08d}.json"))
+    return {"results": results, "steps": steps, "seconds": time.perf_counter() - started}
+
+
+def _play_shard(args: tuple) -> Dict[str, Any]:
+    agent_spec, opponent_spec, start, stop, kwargs = args
+    return play_games(load_policy(agent_spec), load_policy(opponent_spec), range(start, stop), **kwargs)
+
+
+def summarize(shards: Sequence[Dict[str, Any]], seconds: float) -> Dict[str, Any]:
+    results = np.array(sorted(result for shard in shards for result in shard["results"]), dtype=np.int64).reshape(-1, 4)
+    _, starting_players, winners, lengths = results.T
+    steps = sum(shard["steps"] for shard in shards)
+    count = max(len(results), 1)
+    going_first = starting_players == 0
+    return {
+        "games": len(results),
+        "agent_win_rate": float(np.sum(winners == 0) / count),
+        "opponent_win_rate": float(np.sum(winners == 1) / count),
+        "draw_rate": float(np.sum(winners < 0) / count),
+        "agent_win_rate_going_first": float(np.mean(winners[going_first] == 0)) if going_first.any() else None,
+        "agent_win_rate_going_second": float(np.mean(winners[~going_first] == 0)) if (~going_first).any() else None,
+        "mean_length": float(lengths.mean()) if len(results) else 0.0,
+        "median_length": float(np.median(lengths)) if len(results) else 0.0,
+        "max_length": int(lengths.max()) if len(results) else 0,
+        "steps": int(steps),
+        "seconds": seconds,
+        "steps_per_second": steps / seconds if seconds > 0 else 0.0,
+    }
+
+
+def run(
+    agent: str = "random",
+    opponent: str = "random",
+    num_games: int = 100,
+    num_workers: int = 1,
+    context: Optional[str] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Play `num_games` games split across `num_workers` processes and summarize them.
+
+    Policies are given by name or "module:attribute" (see `load_policy`) and
+    built inside each worker. Other keyword arguments go to `play_games`.
+    """
+    num_workers = max(1, min(num_workers, num_games))
+    bounds = np.linspace(0, num_games, num_workers + 1).astype(int)
+    shards = [(agent, opponent, int(start), int(stop), kwargs) for start, stop in zip(bounds[:-1], bounds[1:])]
+    started = time.perf_counter()
+    if num_workers == 1:
+        results = [_play_shard(shard) for shard in shards]
+    else:
+        with mp.get_context(context).Pool(num_workers) as pool:
+            results = pool.map(_play_shard, shards)
+    return summarize(results, time.perf_counter() - started)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Play games between two policies and report how they did.")
+    parser.add_argument("--agent", default="random", help=f"one of {sorted(POLICIES)} or module:attribute")
+    parser.add_argument("--opponent", default="random", help=f"one of {sorted(POLICIES)} or module:attribute")
+    parser.add_argument("--agent-deck", default=DECK_PATH)
+    parser.add_argument("--opponent-deck", default=DECK_PATH)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--envs", type=int, default=64, help="games played concurrently per worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, default=MAX_STEPS)
+    parser.add_argument("--no-fast-forward", action="store_true", help="return phases without choices as steps")
+    parser.add_argument("--trajectories", default=None, help="directory to write transitions to")
+    parser.add_argument("--profile", default=None, help="directory to write per-worker timings to, see ygogym.core.profiling")
+    args = parser.parse_args(argv)
+
+    summary = run(
+        args.agent, args.opponent, args.games, args.workers,
+        agent_deck_path=args.agent_deck,
+        opponent_deck_path=args.opponent_deck,
+        num_envs=args.envs,
+        seed=args.seed,
+        fast_forward=not args.no_fast_forward,
+        max_steps=args.max_steps,
+        trajectory_dir=args.trajectories,
+        profile_dir=args.profile,
+    )
+    print(json.dumps(summary, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main()
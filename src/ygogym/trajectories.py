@@ -0,0 +1,223 @@
+import os
+import queue
+import re
+import shutil
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ygogym.core.actions import NUM_ACTIONS
+from ygogym.observation import OBSERVATION_SIZE
+
+# Recorded fields: name -> (shape of one row, dtype)
+FIELDS: Dict[str, Tuple[tuple, np.dtype]] = {
+    "observations": ((OBSERVATION_SIZE,), np.dtype(np.float32)),
+    "action_masks": ((NUM_ACTIONS,), np.dtype(bool)),
+    "actions": ((), np.dtype(np.int16)),
+    "rewards": ((), np.dtype(np.float32)),
+    "dones": ((), np.dtype(bool)),
+    # Player who took the action; rewards are from their point of view.
+    "players": ((), np.dtype(np.int8)),
+    "episodes": ((), np.dtype(np.int64)),
+}
+SHARD_ROWS = 4096
+
+
+class TrajectoryWriter:
+    """
+    Streams transitions into append-only shards of per-field `.npy` files.
+
+    Rows are copied into a preallocated buffer of `shard_rows` rows. A full
+    buffer is handed to a background thread that writes it as the shard
+    directory `{prefix}-{index:06d}`, holding one `.npy` file per field,
+    while recording continues into the next buffer. At most `max_pending`
+    full buffers wait to be written; beyond that `append` blocks, so memory
+    stays bounded however much is recorded. Shards are written under a
+    temporary name and renamed once complete, so readers never see a
+    partial one. Opening a writer on a directory that already holds shards
+    continues their numbering, so later runs append to earlier ones; writers
+    recording into one directory at the same time need distinct prefixes.
+
+    Attach a writer to `YGOEnv.recorder` to record every step of that env;
+    several envs may share one writer.
+    """
+
+    def __init__(self, directory: str, prefix: str = "shard", shard_rows: int = SHARD_ROWS, max_pending: int = 2):
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_rows = shard_rows
+        os.makedirs(directory, exist_ok=True)
+        self.shards = self._next_shard()
+        self.rows = 0
+        self._episodes = 0
+        # One buffer being filled, up to `max_pending` queued for writing and one being written.
+        self._free: "queue.Queue[Dict[str, np.ndarray]]" = queue.Queue()
+        for _ in range(max_pending + 2):
+            self._free.put(self._allocate())
+        self._full: "queue.Queue[Optional[Tuple[int, Dict[str, np.ndarray], int]]]" = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._write_loop, name="trajectory-writer", daemon=True)
+        self._thread.start()
+        self._buffer = self._free.get()
+        self._filled = 0
+
+    def _next_shard(self) -> int:
+        # One past the highest shard of this prefix, counting partial ones left behind by an interrupted writer.
+        pattern = re.compile(rf"\.?{re.escape(self.prefix)}-(\d{{6,}})(\.partial)?")
+        indices = [int(match.group(1)) for match in map(pattern.fullmatch, os.listdir(self.directory)) if match]
+        return max(indices, default=-1) + 1
+
+    def _allocate(self) -> Dict[str, np.ndarray]:
+        return {name: np.empty((self.shard_rows,) + shape, dtype=dtype) for name, (shape, dtype) in FIELDS.items()}
+
+    def new_episode(self) -> int:
+        """An episode id not yet handed out by this writer."""
+        self._episodes += 1
+        return self._episodes - 1
+
+    def append(self, observation, action_mask, action: int, reward: float, done: bool, player: int, episode: int) -> None:
+        buffer, row = self._buffer, self._filled
+        buffer["observations"][row] = observation
+        buffer["action_masks"][row] = action_mask
+        buffer["actions"][row] = action
+        buffer["rewards"][row] = reward
+        buffer["dones"][row] = done
+        buffer["players"][row] = player
+        buffer["episodes"][row] = episode
+        self._filled += 1
+        self.rows += 1
+        if self._filled == self.shard_rows:
+            self._submit()
+
+    def flush(self) -> None:
+        """Write out buffered rows as a (possibly short) shard and wait until every shard is on disk."""
+        if self._filled:
+            self._submit()
+        self._full.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self.flush()
+            self._full.put(None)
+            self._thread.join()
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _submit(self) -> None:
+        self._raise_error()
+        self._full.put((self.shards, self._buffer, self._filled))
+        self.shards += 1
+        self._buffer = self._free.get()
+        self._filled = 0
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Writing a trajectory shard failed") from self._error
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._full.get()
+            try:
+                if item is None:
+                    return
+                index, buffer, rows = item
+                if self._error is None:
+                    self._write_shard(index, buffer, rows)
+                self._free.put(buffer)
+            except BaseException as error:
+                self._error = error
+                self._free.put(buffer)
+            finally:
+                self._full.task_done()
+
+    def _write_shard(self, index: int, buffer: Dict[str, np.ndarray], rows: int) -> None:
+        name = f"{self.prefix}-{index:06d}"
+        partial = os.path.join(self.directory, f".{name}.partial")
+        os.makedirs(partial, exist_ok=True)
+        try:
+            for field, array in buffer.items():
+                np.save(os.path.join(partial, f"{field}.npy"), array[:rows])
+            os.replace(partial, os.path.join(self.directory, name))
+        except BaseException:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise
+
+
+class TrajectoryReader:
+    """
+    Random access to the shards written by `TrajectoryWriter`s into `directory`.
+
+    Every field of every shard is memory-mapped, so only the rows that are
+    actually read are loaded. Rows are numbered across shards in name order;
+    `refresh` picks up shards written since the reader was opened.
+    """
+
+    def __init__(self, directory: str, fields: Optional[Sequence[str]] = None):
+        self.directory = directory
+        self.fields = list(fields) if fields is not None else list(FIELDS)
+        self.shards: List[Dict[str, np.ndarray]] = []
+        self._names: List[str] = []
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.refresh()
+
+    def refresh(self) -> None:
+        known = set(self._names)
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if name.startswith(".") or name in known or not os.path.isdir(path):
+                continue
+            self.shards.append({field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode="r") for field in self.fields})
+            self._names.append(name)
+        lengths = [len(shard[self.fields[0]]) for shard in self.shards]
+        self.offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getitem__(self, index) -> Dict[str, np.ndarray]:
+        """Rows at `index`, an int, slice or array of row numbers, gathered from their shards."""
+        if isinstance(index, slice):
+            index = np.arange(*index.indices(len(self)))
+        scalar = np.ndim(index) == 0
+        rows = np.atleast_1d(np.asarray(index, dtype=np.int64))
+        rows = np.where(rows < 0, rows + len(self), rows)
+        if len(rows) and (rows.min() < 0 or rows.max() >= len(self)):
+            raise IndexError(f"Row index out of range for {len(self)} rows")
+
+        batch = {
+            field: np.empty((len(rows),) + FIELDS[field][0], dtype=FIELDS[field][1])
+            for field in self.fields
+        }
+        shard_of = np.searchsorted(self.offsets, rows, side="right") - 1
+        # Reading each shard's rows in ascending order keeps memory-mapped access sequential.
+        order = np.lexsort((rows, shard_of))
+        boundaries = np.flatnonzero(np.diff(shard_of[order])) + 1
+        for group in np.split(order, boundaries):
+            if not len(group):
+                continue
+            shard = self.shards[shard_of[group[0]]]
+            local = rows[group] - self.offsets[shard_of[group[0]]]
+            for field in self.fields:
+                batch[field][group] = shard[field][local]
+        if scalar:
+            return {field: values[0] for field, values in batch.items()}
+        return batch
+
+    def sample(self, batch_size: int, rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """A minibatch of rows drawn uniformly with replacement."""
+        rng = rng if rng is not None else np.random.default_rng()
+        return self[rng.integers(0, len(self), size=batch_size)]
+
+    def batches(self, batch_size: int, rng: Optional[np.random.Generator] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """One pass over every row in minibatches, shuffled when `rng` is given."""
+        rows = np.arange(len(self))
+        if rng is not None:
+            rng.shuffle(rows)
+        for start in range(0, len(rows), batch_size):
+            yield self[rows[start:start + batch_size]]
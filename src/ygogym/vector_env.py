@@ -0,0 +1,90 @@
+import numpy as np
+from typing import Dict, List, Tuple, Any, Optional
+from gym import spaces
+
+from ygogym.env import YGOEnv
+
+class YGOVectorEnv:
+    """
+    Steps `num_envs` games in lockstep within one process.
+
+    Observations, action masks, rewards and terminated/truncated flags are
+    written into preallocated batch arrays that are returned on every call,
+    so callers should copy them if they need to keep a step's values.
+    Finished games are reset automatically; the final observation of an
+    episode is reported in that env's info under "terminal_observation".
+    """
+
+    def __init__(
+        self,
+        agent_deck_path: str,
+        opponent_deck_path: str,
+        num_envs: int,
+        fast_forward: bool = False,
+        render_mode: Optional[str] = None,
+    ):
+        self.num_envs = num_envs
+        self.render_mode = render_mode
+        self.envs = [YGOEnv(agent_deck_path, opponent_deck_path, fast_forward, render_mode) for _ in range(num_envs)]
+
+        self.single_observation_space = self.envs[0].observation_space
+        self.single_action_space = self.envs[0].action_space
+        self.observation_space = spaces.Box(
+            low=self.single_observation_space.low[None].repeat(num_envs, axis=0),
+            high=self.single_observation_space.high[None].repeat(num_envs, axis=0),
+            dtype=self.single_observation_space.dtype,
+        )
+        self.action_space = spaces.MultiDiscrete([self.single_action_space.n] * num_envs)
+
+        self.bind_buffers(
+            np.zeros(self.observation_space.shape, dtype=self.observation_space.dtype),
+            np.zeros((num_envs, self.single_action_space.n), dtype=bool),
+            np.zeros(num_envs, dtype=np.float32),
+            np.zeros(num_envs, dtype=bool),
+            np.zeros(num_envs, dtype=bool),
+        )
+
+    def bind_buffers(
+        self, observations: np.ndarray, action_masks: np.ndarray, rewards: np.ndarray, terminated: np.ndarray, truncated: np.ndarray
+    ) -> None:
+        """Write batch outputs into caller-owned arrays, e.g. views of shared memory."""
+        self.observations = observations
+        self.action_masks = action_masks
+        self.rewards = rewards
+        self.terminated = terminated
+        self.truncated = truncated
+        for i, env in enumerate(self.envs):
+            env.bind_buffers(observations[i], action_masks[i])
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """Reset every game; with a `seed`, env `i` is seeded with `seed + i`."""
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, info = env.reset(seed=None if seed is None else seed + i)
+            env.action_mask()
+            infos.append(info)
+        self.rewards[:] = 0
+        self.terminated[:] = False
+        self.truncated[:] = False
+        return self.observations, infos
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, reward, terminated, truncated, info = env.step(int(actions[i]))
+            if terminated or truncated:
+                info["terminal_observation"] = self.observations[i].copy()
+                env.reset()
+            env.action_mask()
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            infos.append(info)
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+    def render(self, index: int = 0, mode: Optional[str] = None):
+        return self.envs[index].render(mode=mode)
+
+    def close(self) -> None:
+        for env in self.envs:
+            env.close()
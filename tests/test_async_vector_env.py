@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from ygogym.async_vector_env import YGOAsyncVectorEnv
+from ygogym.vector_env import YGOVectorEnv
+
+DECK_PATH = "data/test_deck.txt"
+NUM_ENVS = 4
+
+
+def first_legal(action_masks: np.ndarray) -> np.ndarray:
+    return action_masks.argmax(axis=1)
+
+
+def last_legal(action_masks: np.ndarray) -> np.ndarray:
+    return action_masks.shape[1] - 1 - action_masks[:, ::-1].argmax(axis=1)
+
+
+def test_rejected_step_async_leaves_pending_step_intact():
+    expected = YGOVectorEnv(DECK_PATH, DECK_PATH, NUM_ENVS)
+    expected.reset(seed=0)
+    envs = YGOAsyncVectorEnv(DECK_PATH, DECK_PATH, NUM_ENVS, num_workers=2)
+    try:
+        envs.reset_async(seed=0)
+        with pytest.raises(RuntimeError):
+            envs.step_async(np.zeros(NUM_ENVS, dtype=np.int64))
+        envs.reset_wait()
+        np.testing.assert_array_equal(envs.action_masks, expected.action_masks)
+
+        for _ in range(5):
+            actions = first_legal(envs.action_masks)
+            envs.step_async(actions)
+            # Actions that differ from the pending ones wherever there is a choice.
+            with pytest.raises(RuntimeError):
+                envs.step_async(last_legal(envs.action_masks))
+            np.testing.assert_array_equal(envs.actions, actions)
+            observations, rewards, terminated, truncated, _ = envs.step_wait()
+
+            expected_results = expected.step(actions)
+            for result, expected_result in zip((observations, rewards, terminated, truncated), expected_results):
+                np.testing.assert_array_equal(result, expected_result)
+            np.testing.assert_array_equal(envs.action_masks, expected.action_masks)
+    finally:
+        envs.close()
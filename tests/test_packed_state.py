@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from ygogym.core.actions import ACTION_OFFSETS
+from ygogym.core.constants import MAX_EXTRA_DECK_SIZE, MonsterPosition, SpellTrapPosition
+from ygogym.core.database import CardDatabase
+from ygogym.core.game import Game
+from ygogym.env import YGOEnv
+
+DECK_PATH = "data/test_deck.txt"
+FACE_DOWN = (MonsterPosition.FACE_DOWN_DEFENSE, SpellTrapPosition.FACE_DOWN)
+
+
+def assert_round_trip(game: Game) -> None:
+    data = game.to_bytes()
+    restored = Game.from_bytes(data)
+    assert restored.to_dict() == game.to_dict()
+    assert restored.to_bytes() == data
+
+
+def random_action(env: YGOEnv, rng: np.random.Generator) -> int:
+    return int(rng.choice(np.flatnonzero(env.action_mask())))
+
+
+def pass_action(env: YGOEnv, rng: np.random.Generator) -> int:
+    # The last legal action is ending the turn or, when that is not allowed yet, moving to the next phase.
+    return int(np.flatnonzero(env.action_mask())[-1])
+
+
+def play(env: YGOEnv, choose, rng: np.random.Generator, max_steps: int = 2000):
+    """Check the round trip at the start and after every step of one game."""
+    assert_round_trip(env.game)
+    for _ in range(max_steps):
+        _, _, terminated, truncated, _ = env.step(choose(env, rng))
+        assert_round_trip(env.game)
+        yield env.game
+        if terminated or truncated:
+            return
+    pytest.fail(f"Game did not end within {max_steps} steps")
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_round_trip_every_step_of_random_games(seed):
+    env = YGOEnv(DECK_PATH, DECK_PATH)
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    face_down = graveyard = False
+    for game in play(env, random_action, rng):
+        cards = [card for player in game.players for card in player.cards]
+        face_down |= any(card.position in FACE_DOWN for card in cards)
+        graveyard |= any(player.graveyard for player in game.players)
+    assert env.game.game_over
+    # The seeds are chosen so these games reach the states the packing has to get right.
+    assert face_down and graveyard
+
+
+def test_round_trip_with_full_extra_deck(tmp_path):
+    database = CardDatabase.get()
+    fusions = [str(card_id) for card_id in database.store.ids() if database.is_extra_deck_card(str(card_id))]
+    extra_ids = (fusions * MAX_EXTRA_DECK_SIZE)[:MAX_EXTRA_DECK_SIZE]
+    with open(DECK_PATH) as f:
+        main_ids = [line.strip() for line in f if line.strip()]
+    deck_path = tmp_path / "extra_deck.txt"
+    deck_path.write_text("\n".join(main_ids + ["!extra"] + extra_ids) + "\n")
+
+    env = YGOEnv(str(deck_path), str(deck_path))
+    env.reset(seed=3)
+    assert all(len(player.deck.extra_deck) == MAX_EXTRA_DECK_SIZE for player in env.game.players)
+    for _ in play(env, random_action, np.random.default_rng(3)):
+        pass
+
+
+def test_round_trip_of_game_ended_by_deck_out():
+    env = YGOEnv(DECK_PATH, DECK_PATH)
+    env.reset(seed=0)
+    for game in play(env, pass_action, np.random.default_rng(0)):
+        pass
+    game = env.game
+    loser = game.players[1 - game.players.index(game.winner)]
+    assert game.game_over
+    assert loser.deck.remaining_cards() == 0 and loser.life_points > 0
+    assert Game.from_bytes(game.to_bytes()).winner.name == game.winner.name
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from ygogym.env import YGOEnv
+
+DECK_PATH = "data/test_deck.txt"
+
+
+def test_render_dispatches_on_render_mode(capsys):
+    env = YGOEnv(DECK_PATH, DECK_PATH, render_mode="ansi")
+    env.reset(seed=0)
+    frame = env.render()
+    assert isinstance(frame, str) and frame
+    # `mode` still overrides the env's render mode for one call.
+    image = env.render(mode="rgb_array")
+    assert isinstance(image, np.ndarray) and image.ndim == 3 and image.dtype == np.uint8
+    assert capsys.readouterr().out == ""
+
+
+def test_human_mode_prints_on_reset_and_step(capsys):
+    env = YGOEnv(DECK_PATH, DECK_PATH, render_mode="human")
+    env.reset(seed=0)
+    first = capsys.readouterr().out
+    assert first
+    env.step(int(np.flatnonzero(env.action_mask())[-1]))
+    assert capsys.readouterr().out
+    assert env.render() is None
+
+
+def test_no_render_mode_renders_nothing():
+    env = YGOEnv(DECK_PATH, DECK_PATH)
+    env.reset(seed=0)
+    assert env.render() is None
+
+
+def test_unknown_render_mode():
+    with pytest.raises(ValueError):
+        YGOEnv(DECK_PATH, DECK_PATH, render_mode="video")
+    env = YGOEnv(DECK_PATH, DECK_PATH)
+    with pytest.raises(ValueError):
+        env.render(mode="video")
@@ -0,0 +1,158 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from scrape_cards import CardCache, CardFetcher, scrape_card_infos  # noqa: E402
+
+CARD_IDS = [str(card_id) for card_id in range(4000, 4040)]
+
+
+class CardHandler(BaseHTTPRequestHandler):
+    """Serves /data/card/<id> from `server.cards`, with an ETag per card version and scripted 503s."""
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        card_id = self.path.rsplit("/", 1)[-1]
+        with server.lock:
+            server.requests.append((time.monotonic(), card_id, self.headers.get("If-None-Match")))
+            failing = server.failures.get(card_id, 0)
+            if failing:
+                server.failures[card_id] = failing - 1
+        if failing:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        card = server.cards.get(card_id)
+        if card is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = f'"{card_id}-{card["version"]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = json.dumps(card).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CardHandler)
+    server.cards = {card_id: {"cardId": int(card_id), "name": f"Card {card_id}", "version": 1} for card_id in CARD_IDS}
+    server.failures = {}
+    server.requests = []
+    server.lock = threading.Lock()
+    server.base_url = f"http://127.0.0.1:{server.server_port}/data/"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def requested(server, card_id: str) -> list:
+    return [request for request in server.requests if request[1] == card_id]
+
+
+def write_ids(tmp_path, card_ids) -> str:
+    path = tmp_path / "card_ids.txt"
+    path.write_text("".join(f"{card_id}\n" for card_id in card_ids))
+    return str(path)
+
+
+def test_retries_after_503(server, tmp_path):
+    server.failures["4000"] = 2
+    fetcher = CardFetcher(server.base_url, CardCache(str(tmp_path / "cache")), rate=100, backoff=0.0)
+    entry = fetcher.fetch("4000")
+    assert entry["data"] == server.cards["4000"]
+    assert len(requested(server, "4000")) == 3
+
+
+def test_gives_up_after_retries(server, tmp_path):
+    server.failures["4000"] = 10
+    cache = CardCache(str(tmp_path / "cache"))
+    fetcher = CardFetcher(server.base_url, cache, rate=100, retries=2, backoff=0.0)
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch("4000")
+    assert len(requested(server, "4000")) == 3
+    assert cache.get("4000") is None
+
+
+def test_revalidation_serves_unchanged_cards_from_cache(server, tmp_path):
+    cache = CardCache(str(tmp_path / "cache"))
+    fetcher = CardFetcher(server.base_url, cache, rate=100)
+    first = fetcher.fetch("4000")
+    # Cached cards are not requested again unless revalidated.
+    assert fetcher.fetch("4000") == first
+    assert len(requested(server, "4000")) == 1
+
+    assert fetcher.fetch("4000", revalidate=True) == first
+    assert requested(server, "4000")[-1][2] == '"4000-1"'
+    assert cache.get("4000") == first
+
+    server.cards["4000"] = dict(server.cards["4000"], version=2)
+    changed = fetcher.fetch("4000", revalidate=True)
+    assert changed["data"]["version"] == 2
+    assert changed["etag"] == '"4000-2"'
+    assert cache.get("4000") == changed
+
+
+def test_resumes_from_checkpoint(server, tmp_path):
+    ids_path = write_ids(tmp_path, CARD_IDS)
+    output_path = str(tmp_path / "card_infos.json")
+    cache_dir = str(tmp_path / "cache")
+    # The first run is cut short on the last cards: the server fails them past every retry.
+    lost = CARD_IDS[-5:]
+    server.failures.update({card_id: 100 for card_id in lost})
+    errors = scrape_card_infos(server.base_url, ids_path, output_path, cache_dir, workers=4, rate=1000, checkpoint_every=10)
+    assert sorted(errors) == lost
+    # What was fetched is in the output, and in the cache the next run resumes from.
+    with open(output_path) as f:
+        assert json.load(f) == [server.cards[card_id] for card_id in CARD_IDS[:-5]]
+
+    server.failures.clear()
+    server.requests.clear()
+    errors = scrape_card_infos(server.base_url, ids_path, output_path, cache_dir, workers=4, rate=1000)
+    assert errors == {}
+    assert sorted({request[1] for request in server.requests}) == lost
+    with open(output_path) as f:
+        assert json.load(f) == [server.cards[card_id] for card_id in CARD_IDS]
+
+
+def test_respects_rate_limit(server, tmp_path):
+    # Half the cards fit in the first burst; the rest have to wait for the bucket to refill.
+    rate = len(CARD_IDS) / 2
+    ids_path = write_ids(tmp_path, CARD_IDS)
+    scrape_card_infos(
+        server.base_url, ids_path, str(tmp_path / "card_infos.json"), str(tmp_path / "cache"), workers=8, rate=rate
+    )
+    times = sorted(request[0] for request in server.requests)
+    assert len(times) == len(CARD_IDS)
+    # However the workers interleave, no span holds more requests than the bucket allows: a full burst plus the refill.
+    capacity = rate
+    assert times[-1] - times[0] >= 0.9 * (len(times) - capacity) / rate
+    for first in range(len(times)):
+        for last in range(first, len(times)):
+            assert last - first + 1 <= capacity + rate * (times[last] - times[first]) + 1
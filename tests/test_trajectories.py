@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+
+from ygogym.core.actions import NUM_ACTIONS
+from ygogym.observation import OBSERVATION_SIZE
+from ygogym.trajectories import TrajectoryReader, TrajectoryWriter
+
+SHARD_ROWS = 16
+
+
+def record(writer: TrajectoryWriter, start: int, count: int) -> None:
+    # Row `i` is recognisable by its action and observation.
+    for i in range(start, start + count):
+        observation = np.full(OBSERVATION_SIZE, i, dtype=np.float32)
+        mask = np.zeros(NUM_ACTIONS, dtype=bool)
+        mask[i % NUM_ACTIONS] = True
+        writer.append(observation, mask, i, 0.0, False, i % 2, 0)
+
+
+def test_writers_append_to_existing_shards(tmp_path):
+    directory = str(tmp_path)
+    with TrajectoryWriter(directory, shard_rows=SHARD_ROWS) as writer:
+        record(writer, 0, 40)
+    # A second run on the same directory continues the shard numbering instead of replacing shard-000000.
+    with TrajectoryWriter(directory, shard_rows=SHARD_ROWS) as writer:
+        assert writer.shards == 3
+        record(writer, 40, 25)
+
+    assert not [name for name in os.listdir(directory) if name.endswith(".partial")]
+    reader = TrajectoryReader(directory)
+    assert len(reader) == 65
+    rows = reader[:]
+    np.testing.assert_array_equal(rows["actions"], np.arange(65))
+    np.testing.assert_array_equal(rows["observations"][:, 0], np.arange(65))
+    assert rows["action_masks"][np.arange(65), np.arange(65) % NUM_ACTIONS].all()
+
+
+def test_reader_refresh_picks_up_later_writers(tmp_path):
+    directory = str(tmp_path)
+    with TrajectoryWriter(directory, shard_rows=SHARD_ROWS) as writer:
+        record(writer, 0, 10)
+    reader = TrajectoryReader(directory)
+    with TrajectoryWriter(directory, shard_rows=SHARD_ROWS) as writer:
+        record(writer, 10, 10)
+    assert len(reader) == 10
+    reader.refresh()
+    np.testing.assert_array_equal(reader[:]["actions"], np.arange(20))